@@ -0,0 +1,9 @@
+"""Entry point of the bot, ``python -m app``.
+
+Render worker processes skip re-importing a ``__main__`` module of a
+package, so they don't build a second bot the way ``app/main.py`` would.
+"""
+
+from app.main import run_bot
+
+run_bot()
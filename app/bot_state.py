@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any, Protocol, cast, runtime_checkable
@@ -12,6 +13,7 @@ from sonolink.models import AutoPlaySettings, CacheSettings, InactivitySettings
 
 from app.config.colors import COLOR_GREEN, COLOR_RED
 from app.data.bot_data import NodeCacheEntry
+from app.metrics import LAVALINK_OPERATION_DURATION
 
 
 @runtime_checkable
@@ -151,7 +153,8 @@ class BotState:
         """
         try:
             logging.info(f"[Sonolink] Attempting to connect to node: {node.uri}")
-            await asyncio.wait_for(node.connect(), timeout=3)
+            with LAVALINK_OPERATION_DURATION.time("connect"):
+                await asyncio.wait_for(node.connect(), timeout=3)
             # Some fucking nodes secretly don't respond,
             # I've played these games before!!!
             if not await self.node_health_check(node):
@@ -343,6 +346,7 @@ class BotState:
 
         # Set switching to True for guild
         switching_map[guild_id] = True
+        started = time.perf_counter()
         excluded_nodes: set[str] = set()
         _node: sonolink.Node | None = cast(sonolink.Node | None, player.node)
         if _node:
@@ -471,3 +475,6 @@ class BotState:
                     )
                 )
             switching_map[guild_id] = False
+            LAVALINK_OPERATION_DURATION.observe(
+                time.perf_counter() - started, "failover"
+            )
@@ -0,0 +1,152 @@
+"""Run blocking cloudscraper requests on a dedicated, bounded thread pool.
+
+``CloudScraper`` sessions are plain ``requests`` sessions and aren't safe to
+share between threads, and a Cloudflare challenge can block for a long time.
+The gateway keeps its own small pool so a hung challenge never takes threads
+from the default executor used by ``asyncio.to_thread``. Each worker thread
+has its own session, and the challenge cookies they earn are shared through
+a common jar so only the first request has to solve a challenge.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import cloudscraper
+import requests
+from requests.cookies import RequestsCookieJar
+
+from app.config.scraping import CLOUDSCRAPER_TIMEOUT, CLOUDSCRAPER_WORKERS
+from app.metrics import CLOUDSCRAPER_REQUEST_DURATION
+
+
+@dataclass(slots=True)
+class CloudscraperStats:
+    """Counters of the requests made through a :class:`CloudscraperGateway`."""
+
+    requests: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    total_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.requests if self.requests else 0.0
+
+
+class CloudscraperGateway:
+    """Makes cloudscraper GET requests without blocking the event loop.
+
+    Parameters
+    ----------
+    max_workers: int
+        Number of worker threads, which is also the maximum number of
+        requests in flight. Requests beyond that are rejected, not queued.
+    timeout: float
+        Time in seconds after which a request is abandoned.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = CLOUDSCRAPER_WORKERS,
+        timeout: float = CLOUDSCRAPER_TIMEOUT,
+    ) -> None:
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="cloudscraper"
+        )
+        self._local = threading.local()
+        self._cookies = RequestsCookieJar()
+        self._cookies_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = CloudscraperStats()
+
+    async def get(self, url: str) -> requests.Response | None:
+        """Make a GET request through cloudscraper.
+
+        Parameters
+        ----------
+        url: str
+            The URL to request.
+
+        Returns
+        -------
+        requests.Response | None
+            The response, or None if the request failed, timed out or was
+            rejected because all workers are busy.
+        """
+        with self._stats_lock:
+            busy = self.stats.in_flight >= self._max_workers
+            if busy:
+                self.stats.rejected += 1
+            else:
+                self.stats.requests += 1
+                self.stats.in_flight += 1
+        if busy:
+            CLOUDSCRAPER_REQUEST_DURATION.observe(0.0, "rejected")
+            logging.warning(f"[Cloudscraper] All workers are busy, skipping {url}")
+            return None
+
+        start = time.perf_counter()
+        outcome = "success"
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._get, url)
+        try:
+            # The session timeout applies per socket operation, this bounds
+            # the whole request including challenge solving.
+            return await asyncio.wait_for(future, timeout=self._timeout)
+        except TimeoutError:
+            outcome = "timeout"
+            logging.warning(f"[Cloudscraper] Request timed out: {url}")
+        except Exception as exc:
+            # Besides requests and Cloudflare errors, cloudscraper raises
+            # plain exceptions, none of which should stop the scraper loop
+            outcome = "failure"
+            logging.warning(
+                f"[Cloudscraper] Request failed ({type(exc).__name__}): {exc}"
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                if outcome == "timeout":
+                    self.stats.timeouts += 1
+                elif outcome == "failure":
+                    self.stats.failures += 1
+                self.stats.total_time += elapsed
+            CLOUDSCRAPER_REQUEST_DURATION.observe(elapsed, outcome)
+        return None
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, abandoning requests still running."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _session(self) -> cloudscraper.CloudScraper:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = cloudscraper.create_scraper()  # pyright: ignore[reportUnknownMemberType]
+            self._local.session = session
+        return session
+
+    def _get(self, url: str) -> requests.Response:
+        # The worker keeps its slot until the request really finishes, even
+        # if the caller already gave up waiting for it.
+        try:
+            session = self._session()
+            with self._cookies_lock:
+                session.cookies.update(self._cookies)
+            try:
+                response = session.get(url, timeout=self._timeout)
+                response.raise_for_status()
+                return response
+            finally:
+                with self._cookies_lock:
+                    self._cookies.update(session.cookies)
+        finally:
+            with self._stats_lock:
+                self.stats.in_flight -= 1
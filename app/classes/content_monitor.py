@@ -3,19 +3,22 @@ import datetime
 import logging
 import re
 
-import cloudscraper
 import discord
 import httpx
-import requests
-import unidecode
 from bs4 import BeautifulSoup, Tag
-from deep_translator import GoogleTranslator
 
+from app.classes.cloudscraper_gateway import CloudscraperGateway
+from app.classes.game3rb_extractor import (
+    Game3rbPage,
+    WatchedGames,
+    parse_game_page,
+    parse_listing,
+)
+from app.classes.translation_service import TranslationService
 from app.config.mongo import DB_CACHE, DB_LISTS
 from app.config.scraping import (
     ALIENWAREARENA_MAX_RESULTS,
     ALIENWAREARENA_TO_REMOVE,
-    GAME3RB_TO_REMOVE,
     ICON_GAME3RB,
     ICON_ONLINEFIX,
     ONLINEFIX_MAX_RESULTS,
@@ -24,7 +27,18 @@ from app.config.scraping import (
     SITE_URL_ONLINEFIX,
 )
 from app.data.bot_data import BotConfigManager
-from app.utils import make_http_request, strip_text
+from app.data.seen_set import SeenSet
+from app.response_handler import send
+from app.utils import (
+    NOT_MODIFIED,
+    BodyHashCache,
+    HostLimiter,
+    HttpValidatorCache,
+    make_http_request,
+    strip_text,
+)
+
+ONLINEFIX_VERSION_PATTERN = re.compile(r"version\s*(\d+(\.\d+)*)")
 
 
 def get_onlinefix_messages(chat_log: str) -> list:
@@ -38,41 +52,56 @@ def get_onlinefix_messages(chat_log: str) -> list:
     return chat_element.find_all("li", class_="lc_chat_li lc_chat_li_foto")
 
 
-def apply_build_token(
-    full_title: str,
-    game_title: list[str],
-) -> tuple[list[str], str, bool]:
-    """Extract build token from game title and return cleaned title with version."""
-    pattern = r"Build ([0-9A-Za-z._-]+)"
-    match = re.search(pattern, full_title)
-    if not match:
-        return game_title, "", True
-
-    build_token = match.group(1)
-    version = f" got updated to build {build_token}"
-    lower_token = build_token.lower()
-    removed = False
-
-    for i, part in enumerate(game_title):
-        if part.lower() == "build":
-            game_title.pop(i)
-            removed = True
-            break
-
-    for i, part in enumerate(game_title):
-        if part.lower() == lower_token:
-            game_title.pop(i)
-            removed = True
-            break
-
-    if not removed:
-        logging.warning(
-            "[Game3rb] Broken name - %s",
-            full_title,
-        )
-        return game_title, version, False
+def parse_onlinefix_article(article_html: str) -> tuple[str, str] | None:
+    """Get the image and the Russian description of an Online-Fix article."""
+    soup = BeautifulSoup(article_html, "html.parser")
+    head_tag = soup.find("head")
 
-    return game_title, version, True
+    meta_tag = head_tag.find("meta", attrs={"property": "og:image"})
+    img_url = meta_tag.get("content")
+    article_description = soup.find("article")
+    if not isinstance(article_description, Tag):
+        logging.warning("[Online-Fix] Article tag not found")
+        return None
+
+    description_element = article_description.find("div", class_="edited-block right")
+    description: str = description_element.text if description_element else ""
+    return img_url, description
+
+
+def make_onlinefix_embed(
+    url: str, game_title: str, img_url: str, description: str
+) -> discord.Embed:
+    """Build the embed announcing an Online-Fix update.
+
+    Parameters
+    ----------
+    url: str
+        The article URL.
+    game_title: str
+        The game name.
+    img_url: str
+        The article image.
+    description: str
+        The translated article description.
+    """
+    description = description.replace(". ", "\n")
+    version_pattern = ONLINEFIX_VERSION_PATTERN.findall(description)
+    version: str = f" v{version_pattern[0][0]}" if version_pattern else ""
+
+    embed = discord.Embed(
+        title=game_title + version,
+        url=url,
+        description=description,
+        color=discord.Color.blue(),
+        timestamp=datetime.datetime.now(datetime.timezone.utc),
+    )
+    embed.set_footer(
+        text="online-fix.me",
+        icon_url=ICON_ONLINEFIX,
+    )
+    embed.set_thumbnail(url=img_url)
+    return embed
 
 
 class ContentMonitor:
@@ -97,204 +126,137 @@ class ContentMonitor:
         self,
         config_manager: BotConfigManager,
         session: httpx.AsyncClient,
-        cloudscraper_session: cloudscraper.CloudScraper,
+        cloudscraper_gateway: CloudscraperGateway,
+        translator: TranslationService,
         game_updates_channel: discord.TextChannel,
         free_stuff_channel: discord.TextChannel,
         user_kexo: discord.User = None,
     ) -> None:
         self._config_manager = config_manager
         self._session = session
-        self._cloudscraper_session = cloudscraper_session
+        self._cloudscraper_gateway = cloudscraper_gateway
+        self._translator = translator
         self._game_updates_channel = game_updates_channel
         self._free_stuff_channel = free_stuff_channel
         self._user_kexo = user_kexo
+        self._host_limiter = HostLimiter()
+        self._validators = HttpValidatorCache()
+        # Lists the validators of each URL were committed with
+        self._validated_lists: dict[str, list[str]] = {}
+        self._body_hashes = BodyHashCache()
 
     async def alienware_arena(self) -> None:
         """Checks for free games from Alienware Arena."""
         alienwarearena_cache, to_filter = await self._load_alienware_cache()
+        self._check_validated_list(SITE_URL_ALIENWAREARENA, to_filter)
         json_data = await make_http_request(
-            self._session, SITE_URL_ALIENWAREARENA, get_json=True
+            self._session,
+            SITE_URL_ALIENWAREARENA,
+            get_json=True,
+            validators=self._validators,
         )
-        if not json_data:
+        if not json_data or json_data is NOT_MODIFIED:
             return
         await self._send_alienware_arena_embed(
             json_data, alienwarearena_cache, to_filter
         )
+        self._validators.commit(SITE_URL_ALIENWAREARENA)
 
     async def game3rb(self) -> None:
         """Check for selected games from Game3rb."""
-        game3rb_cache = await self._config_manager.get("game3rb_cache", DB_CACHE)
-        game3rb_cache_copy = game3rb_cache.copy()
-
-        game_list = await self._config_manager.get("games", DB_LISTS)
-        game_list = "\n".join(game_list)
-
-        source = await make_http_request(self._session, SITE_URL_GAME3RB)
-        if not source:
-            return
-
-        game_info = []
-
-        soup = BeautifulSoup(source.text, "html.parser")
-        article = soup.find("article")
+        game3rb_cache = await self._config_manager.get_seen_set(
+            "game3rb_cache", DB_CACHE, history_key="game3rb_history"
+        )
+        games = await self._config_manager.get("games", DB_LISTS)
+        self._check_validated_list(SITE_URL_GAME3RB, games)
+        watched = WatchedGames(games)
 
-        if not article:
+        source = await make_http_request(
+            self._session, SITE_URL_GAME3RB, validators=self._validators
+        )
+        if not source or source is NOT_MODIFIED:
             return
 
-        for sticky in article.select("article.sticky.hentry"):
-            sticky.decompose()
-
-        for _ in range(16):
-            line = article.find("a", {"title": True})
-
-            if not line:
-                break
-
-            game_title = line.get("title")
-            full_title = game_title
-            game_url = line.get("href")
-
-            game_title: list = strip_text(game_title, GAME3RB_TO_REMOVE).split()
-            version = ""
-            regex = re.compile(r"v\d+(\.\d+)*")
-
-            if regex.match(game_title[-1]):
-                version = f" got updated to {game_title[-1]}"
-                game_title.pop()
-            else:
-                game_title, version, ok = apply_build_token(
-                    full_title,
-                    game_title,
-                )
-                if not ok:
-                    article = article.find_next("article")
-                    continue
-
-            game_title = " ".join(game_title)
-            carts = set()
-            if game_title.lower() not in game_list.lower():
-                article = article.find_next("article")
-                continue
-
-            for cart in article.find_all(id="cart"):
-                if not cart:
-                    break
-                carts.add(cart.text)
-
-            cache_key = f"{game_url}|{version}" if version else game_url
-
-            # Check if this URL+version combo is already cached
-            if cache_key in game3rb_cache_copy:
-                article = article.find_next("article")
-                continue
-
-            game_info.append(
-                {
-                    "title": game_title,
-                    "version": version,
-                    "url": game_url,
-                    "cache_key": cache_key,
-                    "image": article.find("img", {"class": "entry-image"})["src"],
-                    "timestamp": article.find("time")["datetime"],
-                    "carts": carts,
-                }
-            )
-            article = article.find_next("article")
-
+        game_info = [
+            game
+            for game in parse_listing(source.text, watched)
+            if game.cache_key not in game3rb_cache
+        ]
         if not game_info:
+            self._validators.commit(SITE_URL_GAME3RB)
             return
 
-        for game in game_info:
-            game3rb_cache.pop(0)
-            game3rb_cache.append(game["cache_key"])
-
-            description = []
-            source = await make_http_request(
-                self._session,
-                game["url"],
-            )
-            if not source:
-                logging.warning(f"[Game3rb] Broken link - {game['url']}")
+        pages = await asyncio.gather(
+            *(self._fetch_game3rb_page(game.url) for game in game_info)
+        )
+        for game, page in zip(game_info, pages):
+            game3rb_cache.add(game.cache_key)
+            if not page:
                 continue
-            soup = BeautifulSoup(source.text, "html.parser")
-
-            torrent_url = soup.find("a", {"class": "torrent"})
-            if torrent_url:
-                description.append(f"[Torrent link]({torrent_url['href']})")
-            direct_url = soup.find("a", {"class": "direct"})
-            if direct_url:
-                description.append(f"[Direct link]({direct_url['href']})")
-
-            if "Fix already included" in str(
-                soup
-            ) or "Crack online already added" in str(soup):
-                description.append("_Fix already included_")
-            else:
-                crack_url = soup.find("a", {"class": "online"})
-                if crack_url:
-                    description.append(f"[Crack link]({crack_url['href']})")
-                else:
-                    crack_url = soup.find("a", {"class": "crack"})
-                    if crack_url:
-                        description.append(f"[Crack link]({crack_url['href']})")
-
-            game_update_url, game_update_name = [], []
-            update_pattern = (
-                r">Update (.*?)</strong>.*?<a\s+"
-                r'id="download-link"\s+class="update"\s+href="(.*?)"'
-            )
-            for match in re.finditer(update_pattern, source.text, re.DOTALL):
-                update_name = re.sub(r"<.*?>", "", match.group(1)).strip()
-                game_update_name.append(unidecode.unidecode(update_name))
-                game_update_url.append(unidecode.unidecode(match.group(2).strip()))
 
             embed = discord.Embed(
-                title=game["title"] + game["version"],
-                url=game["url"],
-                timestamp=datetime.datetime.fromisoformat(game["timestamp"]),
+                title=game.title + game.version,
+                url=game.url,
+                timestamp=datetime.datetime.fromisoformat(game.timestamp),
             )
-            embed.add_field(name="Download links:", value="\n".join(description))
-            if game_update_name:
+            embed.add_field(name="Download links:", value="\n".join(page.links))
+            if page.updates:
                 game_update = "\n".join(
-                    f"{i + 1}. [{game_update_name[i]}]({game_update_url[i]})"
-                    for i in range(len(game_update_url))
+                    f"{i}. [{name}]({url})"
+                    for i, (name, url) in enumerate(page.updates, start=1)
                 )
                 embed.add_field(name="Update links:", value=game_update, inline=False)
             embed.set_footer(
-                text=", ".join(sorted(game["carts"])),
+                text=", ".join(sorted(game.carts)),
                 icon_url=ICON_GAME3RB,
             )
-            embed.set_image(url=game["image"])
-            await self._game_updates_channel.send(embed=embed)
+            embed.set_image(url=game.image)
+            await send(self._game_updates_channel, embed=embed, queued=True)
 
         await self._config_manager.save("game3rb_cache", DB_CACHE)
+        self._validators.commit(SITE_URL_GAME3RB)
+
+    def _check_validated_list(self, url: str, values: list[str]) -> None:
+        # A page processed with another watch list may hold new matches
+        if self._validated_lists.get(url) != values:
+            self._validators.invalidate(url)
+            self._validated_lists[url] = list(values)
+
+    async def _fetch_game3rb_page(self, url: str) -> Game3rbPage | None:
+        async with self._host_limiter(url):
+            source = await make_http_request(self._session, url)
+        if not source:
+            logging.warning(f"[Game3rb] Broken link - {url}")
+            return None
+        return await asyncio.to_thread(parse_game_page, source.text)
 
     async def online_fix(self) -> None:
         """Checks for selected games from Online-Fix."""
         onlinefix_cache, games = await self._load_onlinefix_cache()
-        try:
-            chat_log = await asyncio.to_thread(
-                self._cloudscraper_session.get,
-                SITE_URL_ONLINEFIX,
-            )
-        except requests.exceptions.RequestException as exc:
-            logging.warning(f"[Online-Fix] Request failed: {exc}")
-            return
-
+        chat_log = await self._cloudscraper_gateway.get(SITE_URL_ONLINEFIX)
         if not chat_log:
             return
-        chat_messages = get_onlinefix_messages(chat_log.text)
-        await self._process_onlinefix_messages(chat_messages, onlinefix_cache, games)
+        # The chat page doesn't support conditional requests
+        if self._body_hashes.unchanged("online_fix", chat_log.content):
+            return
+        processed = False
+        try:
+            chat_messages = get_onlinefix_messages(chat_log.text)
+            processed = await self._process_onlinefix_messages(
+                chat_messages, onlinefix_cache, games
+            )
+        finally:
+            # Retry the same chat next time instead of losing its updates
+            if not processed:
+                self._body_hashes.invalidate("online_fix")
 
     async def _send_alienware_arena_embed(
-        self, json_data: dict, alienwarearena_cache: list, to_filter: list
+        self, json_data: dict, alienwarearena_cache: SeenSet, to_filter: list
     ) -> None:
-        alienwarearena_cache_copy = alienwarearena_cache.copy()
-
         for giveaway in json_data["data"][:ALIENWAREARENA_MAX_RESULTS]:
             url = "https://eu.alienwarearena.com" + giveaway["url"]
 
-            if url in alienwarearena_cache_copy:
+            if url in alienwarearena_cache:
                 break
 
             title = giveaway["title"]
@@ -305,8 +267,7 @@ class ContentMonitor:
 
             title = strip_text(title, ALIENWAREARENA_TO_REMOVE)
 
-            alienwarearena_cache.pop(0)
-            alienwarearena_cache.append(url)
+            alienwarearena_cache.add(url)
 
             soup = BeautifulSoup(giveaway["description"], "html.parser")
             description = ""
@@ -321,55 +282,22 @@ class ContentMonitor:
                 url=url,
             )
             embed.set_image(url=giveaway["image"])
-            await self._free_stuff_channel.send(embed=embed)
+            await send(self._free_stuff_channel, embed=embed, queued=True)
 
-        if alienwarearena_cache != alienwarearena_cache_copy:
-            await self._config_manager.save("alienwarearena_cache", DB_CACHE)
+        await self._config_manager.save("alienwarearena_cache", DB_CACHE)
 
-    async def _send_onlinefix_embed(self, url: str, game_title: str) -> None:
-        onlinefix_article = await make_http_request(self._session, url)
+    async def _fetch_onlinefix_article(self, url: str) -> tuple[str, str] | None:
+        async with self._host_limiter(url):
+            onlinefix_article = await make_http_request(self._session, url)
         if not onlinefix_article:
-            return
-        soup = BeautifulSoup(onlinefix_article.text, "html.parser")
-        head_tag = soup.find("head")
-
-        meta_tag = head_tag.find("meta", attrs={"property": "og:image"})
-        img_url = meta_tag.get("content")
-        article_description = soup.find("article")
-        if not isinstance(article_description, Tag):
-            logging.warning("[Online-Fix] Article tag not found")
-            return
-
-        description_element = article_description.find(
-            "div", class_="edited-block right"
-        )
-        description: str = description_element.text if description_element else ""
-        description = GoogleTranslator(source="ru").translate(text=description)
-        description = description.replace(". ", "\n")
-
-        pattern = re.compile(r"version\s*(\d+(\.\d+)*)")
-        version_pattern = pattern.findall(description)
-        version: str = f" v{version_pattern[0][0]}" if version_pattern else ""
-
-        embed = discord.Embed(
-            title=game_title + version,
-            url=url,
-            description=description,
-            color=discord.Color.blue(),
-            timestamp=datetime.datetime.now(datetime.timezone.utc),
-        )
-        embed.set_footer(
-            text="online-fix.me",
-            icon_url=ICON_ONLINEFIX,
-        )
-        embed.set_thumbnail(url=img_url)
-        await self._game_updates_channel.send(embed=embed)
+            return None
+        return await asyncio.to_thread(parse_onlinefix_article, onlinefix_article.text)
 
     async def _process_onlinefix_messages(
-        self, messages: list, onlinefix_cache: list, games: list
-    ) -> None:
+        self, messages: list, onlinefix_cache: SeenSet, games: list
+    ) -> bool:
         limit = ONLINEFIX_MAX_RESULTS
-        to_upload = []
+        updates: list[tuple[str, str, str]] = []
         for message in messages:
             message_text = message.find("div", class_="lc_chat_li_text")
             message_id = message_text.get("id")
@@ -384,21 +312,42 @@ class ContentMonitor:
             if game_title not in games:
                 continue
 
-            to_upload.append(message_id)
+            # Older messages may still hold an article that failed to fetch
             if message_id in onlinefix_cache:
-                break
+                continue
 
-            await self._send_onlinefix_embed(url, game_title)
+            updates.append((message_id, url, game_title))
 
             limit -= 1
             if limit == 0:
                 break
 
-        if to_upload:
+        articles = await asyncio.gather(
+            *(self._fetch_onlinefix_article(url) for _, url, _ in updates)
+        )
+        found = [
+            (message_id, url, game_title, article)
+            for (message_id, url, game_title), article in zip(updates, articles)
+            if article
+        ]
+        descriptions = await self._translator.translate_many(
+            [description for _, _, _, (_, description) in found]
+        )
+        for (message_id, url, game_title, (img_url, _)), description in zip(
+            found, descriptions
+        ):
+            embed = make_onlinefix_embed(url, game_title, img_url, description)
+            await send(self._game_updates_channel, embed=embed, queued=True)
+            # Messages whose article failed stay out of the cache to be retried
+            onlinefix_cache.add(message_id)
+
+        if found:
             await self._config_manager.save("onlinefix_cache", DB_CACHE)
+        # False if an article couldn't be fetched
+        return len(found) == len(updates)
 
-    async def _load_alienware_cache(self) -> tuple[list[str], list[str]]:
-        alienwarearena_cache = await self._config_manager.get(
+    async def _load_alienware_cache(self) -> tuple[SeenSet, list[str]]:
+        alienwarearena_cache = await self._config_manager.get_seen_set(
             "alienwarearena_cache", DB_CACHE
         )
         to_filter = await self._config_manager.get(
@@ -406,8 +355,10 @@ class ContentMonitor:
         )
         return alienwarearena_cache, to_filter
 
-    async def _load_onlinefix_cache(self) -> tuple[list[str], list[str]]:
-        onlinefix_cache = await self._config_manager.get("onlinefix_cache", DB_CACHE)
+    async def _load_onlinefix_cache(self) -> tuple[SeenSet, list[str]]:
+        onlinefix_cache = await self._config_manager.get_seen_set(
+            "onlinefix_cache", DB_CACHE
+        )
         games = await self._config_manager.get("games", DB_LISTS)
         # Remove quotes due to online-fix.me not using quotes
         games = "\n".join(games).replace("'", "").split("\n")
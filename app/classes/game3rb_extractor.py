@@ -0,0 +1,258 @@
+"""Parsers for the Game3rb listing and game pages.
+
+The listing is parsed with lxml in a single pass over its articles. Titles
+are only cleaned up for articles that aren't sticky, and carts, image and
+timestamp are only extracted for watched games.
+"""
+
+import logging
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import lxml.html
+import unidecode
+from lxml.html import HtmlElement
+
+from app.config.scraping import GAME3RB_MAX_ARTICLES, GAME3RB_TO_REMOVE
+from app.utils import strip_text
+
+VERSION_PATTERN = re.compile(r"v\d+(\.\d+)*")
+BUILD_PATTERN = re.compile(r"Build ([0-9A-Za-z._-]+)")
+UPDATE_PATTERN = re.compile(
+    r">Update (.*?)</strong>.*?<a\s+"
+    r'id="download-link"\s+class="update"\s+href="(.*?)"',
+    re.DOTALL,
+)
+TAG_PATTERN = re.compile(r"<.*?>")
+FIX_INCLUDED_MARKERS = ("Fix already included", "Crack online already added")
+
+
+@dataclass(slots=True)
+class Game3rbArticle:
+    """A watched game found on the Game3rb listing."""
+
+    title: str
+    version: str
+    url: str
+    image: str
+    timestamp: str
+    carts: set[str] = field(default_factory=set)
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.url}|{self.version}" if self.version else self.url
+
+
+@dataclass(slots=True)
+class Game3rbPage:
+    """Download links found on a Game3rb game page."""
+
+    links: list[str] = field(default_factory=list)
+    updates: list[tuple[str, str]] = field(default_factory=list)
+
+
+class WatchedGames:
+    """Case-insensitive set of watched game titles.
+
+    Parameters
+    ----------
+    games: Iterable[str]
+        The watched game titles.
+    """
+
+    def __init__(self, games: Iterable[str]) -> None:
+        self._games = frozenset(normalize_title(game) for game in games)
+
+    def __contains__(self, title: str) -> bool:
+        return normalize_title(title) in self._games
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(title.casefold().split())
+
+
+def apply_build_token(
+    full_title: str,
+    game_title: list[str],
+) -> tuple[list[str], str, bool]:
+    """Extract build token from game title and return cleaned title with version."""
+    match = BUILD_PATTERN.search(full_title)
+    if not match:
+        return game_title, "", True
+
+    build_token = match.group(1)
+    version = f" got updated to build {build_token}"
+    lower_token = build_token.lower()
+    removed = False
+
+    for i, part in enumerate(game_title):
+        if part.lower() == "build":
+            game_title.pop(i)
+            removed = True
+            break
+
+    for i, part in enumerate(game_title):
+        if part.lower() == lower_token:
+            game_title.pop(i)
+            removed = True
+            break
+
+    if not removed:
+        logging.warning(
+            "[Game3rb] Broken name - %s",
+            full_title,
+        )
+        return game_title, version, False
+
+    return game_title, version, True
+
+
+def split_title(full_title: str) -> tuple[str, str] | None:
+    """Split a listing title into the game name and its version suffix.
+
+    Parameters
+    ----------
+    full_title: str
+        The raw title attribute of the article link.
+
+    Returns
+    -------
+    tuple[str, str] | None
+        The game name and the version text (empty if the title has none),
+        or None if the title couldn't be parsed.
+    """
+    game_title = strip_text(full_title, GAME3RB_TO_REMOVE).split()
+    if not game_title:
+        return None
+
+    if VERSION_PATTERN.match(game_title[-1]):
+        version = f" got updated to {game_title.pop()}"
+    else:
+        game_title, version, ok = apply_build_token(full_title, game_title)
+        if not ok:
+            return None
+    return " ".join(game_title), version
+
+
+def _is_sticky(article: HtmlElement) -> bool:
+    classes = article.get("class", "").split()
+    return "sticky" in classes and "hentry" in classes
+
+
+def _first_link_with_class(doc: HtmlElement, css_class: str) -> str | None:
+    links = doc.xpath(
+        f'//a[contains(concat(" ", normalize-space(@class), " "), " {css_class} ")]'
+        "/@href"
+    )
+    return links[0] if links else None
+
+
+def parse_listing(
+    html: str, watched: WatchedGames, limit: int = GAME3RB_MAX_ARTICLES
+) -> list[Game3rbArticle]:
+    """Find the watched games among the latest articles of the listing.
+
+    Parameters
+    ----------
+    html: str
+        The listing page source.
+    watched: WatchedGames
+        The watched game titles.
+    limit: int
+        Maximum number of non-sticky articles to look at.
+
+    Returns
+    -------
+    list[Game3rbArticle]
+        The watched games, in listing order.
+    """
+    doc = lxml.html.fromstring(html)
+    games = []
+    seen = 0
+    for article in doc.iter("article"):
+        if _is_sticky(article):
+            continue
+        if seen == limit:
+            break
+        seen += 1
+
+        link = article.find(".//a[@title]")
+        if link is None:
+            break
+
+        parsed = split_title(link.get("title"))
+        if not parsed:
+            continue
+        title, version = parsed
+        if title not in watched:
+            continue
+
+        image = article.xpath(
+            './/img[contains(concat(" ", normalize-space(@class), " "),'
+            ' " entry-image ")]/@src'
+        )
+        timestamp = article.xpath(".//time/@datetime")
+        if not image or not timestamp:
+            logging.warning(f"[Game3rb] Incomplete article - {link.get('href')}")
+            continue
+
+        games.append(
+            Game3rbArticle(
+                title=title,
+                version=version,
+                url=link.get("href"),
+                image=image[0],
+                timestamp=timestamp[0],
+                carts={
+                    cart.text_content() for cart in article.iterfind(".//*[@id='cart']")
+                },
+            )
+        )
+    return games
+
+
+def parse_game_page(html: str) -> Game3rbPage:
+    """Extract the download and update links of a game page.
+
+    Parameters
+    ----------
+    html: str
+        The game page source.
+
+    Returns
+    -------
+    Game3rbPage
+        The formatted download links and the (name, url) update links.
+    """
+    doc = lxml.html.fromstring(html)
+    page = Game3rbPage()
+
+    torrent_url = _first_link_with_class(doc, "torrent")
+    if torrent_url:
+        page.links.append(f"[Torrent link]({torrent_url})")
+    direct_url = _first_link_with_class(doc, "direct")
+    if direct_url:
+        page.links.append(f"[Direct link]({direct_url})")
+
+    if any(marker in html for marker in FIX_INCLUDED_MARKERS):
+        page.links.append("_Fix already included_")
+    else:
+        crack_url = _first_link_with_class(doc, "online") or _first_link_with_class(
+            doc, "crack"
+        )
+        if crack_url:
+            page.links.append(f"[Crack link]({crack_url})")
+
+    for match in UPDATE_PATTERN.finditer(html):
+        update_name = TAG_PATTERN.sub("", match.group(1)).strip()
+        page.updates.append(
+            (
+                unidecode.unidecode(update_name),
+                unidecode.unidecode(match.group(2).strip()),
+            )
+        )
+    return page
@@ -0,0 +1,175 @@
+"""Render SFD activity graphs in a dedicated worker process.
+
+Matplotlib rendering is CPU bound and holds the GIL for the whole render,
+so graphs are drawn in a ``ProcessPoolExecutor`` worker. The worker only
+receives plain lists and returns encoded PNG bytes.
+
+Matplotlib is slow to import and heavy in memory, so it is only imported
+by :mod:`app.classes.graph_worker`, which is preloaded by the forkserver
+the workers are forked from. This module must stay free of matplotlib
+imports.
+
+The bot must be started with ``python -m app``: a worker re-imports the
+``__main__`` module it was started from, and ``app/main.py`` builds the
+whole bot at import time.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import signal
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from app.config.sfd import (
+    GRAPH_RENDER_MAX_QUEUE,
+    GRAPH_RENDER_TIMEOUT,
+    GRAPH_RENDER_WORKERS,
+)
+
+
+def _load_worker() -> None:
+    """Process pool initializer, imports matplotlib once per worker."""
+    import app.classes.graph_worker  # noqa: F401
+
+
+def _run_with_deadline(
+    timeout: float, render_func: Callable[..., dict[str, bytes]], *args: Any
+) -> dict[str, bytes]:
+    """Run a render in the worker, killing the worker if it takes too long.
+
+    The timer starts when the worker picks the render up, so time spent
+    waiting for a free worker doesn't count. The default action of
+    ``SIGALRM`` ends the process even while matplotlib holds the GIL.
+    """
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return render_func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def render_day_graphs(
+    players: list[int], servers: list[int], labels_by_key: dict[str, list[str]]
+) -> dict[str, bytes]:
+    """Render the daily activity graph variants, runs inside the worker process.
+
+    See :func:`app.classes.graph_worker.render_day_graphs`.
+    """
+    from app.classes import graph_worker
+
+    return graph_worker.render_day_graphs(players, servers, labels_by_key)
+
+
+def render_week_graphs(
+    players: list[int], servers: list[int], labels_by_key: dict[str, list[str]]
+) -> dict[str, bytes]:
+    """Render the weekly activity graph variants, runs inside the worker process.
+
+    See :func:`app.classes.graph_worker.render_week_graphs`.
+    """
+    from app.classes import graph_worker
+
+    return graph_worker.render_week_graphs(players, servers, labels_by_key)
+
+
+class GraphRenderer:
+    """Runs graph render functions in a dedicated process pool.
+
+    The pool is created on first use and each worker imports matplotlib
+    when it starts, so the bot process never loads it. Renders that would
+    exceed the queue bound are rejected instead of piling up. Renders wait
+    for a free worker before they are submitted, and a worker whose render
+    exceeds the timeout kills itself, after which the pool is replaced.
+
+    Parameters
+    ----------
+    max_workers: int
+        Number of worker processes.
+    max_queue: int
+        Maximum number of renders running or waiting at once.
+    timeout: float
+        Maximum time in seconds a worker may spend on a single render.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = GRAPH_RENDER_WORKERS,
+        max_queue: int = GRAPH_RENDER_MAX_QUEUE,
+        timeout: float = GRAPH_RENDER_TIMEOUT,
+    ) -> None:
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._timeout = timeout
+        self._executor: ProcessPoolExecutor | None = None
+        self._pending = 0
+        # Renders waiting here don't count towards the worker's timeout
+        self._workers = asyncio.Semaphore(max_workers)
+
+    async def render(
+        self, render_func: Callable[..., dict[str, bytes]], *args: Any
+    ) -> dict[str, bytes] | None:
+        """Render graphs in the worker pool.
+
+        Parameters
+        ----------
+        render_func: Callable[..., dict[str, bytes]]
+            Module-level render function, e.g. :func:`render_day_graphs`.
+        *args:
+            Plain, picklable arguments for ``render_func``.
+
+        Returns
+        -------
+        dict[str, bytes] | None
+            The encoded PNG images, or ``None`` if the render was rejected,
+            timed out or the worker crashed.
+        """
+        if self._pending >= self._max_queue:
+            logging.warning(
+                f"[Graphs] Render queue is full ({self._pending}), "
+                f"skipping {render_func.__name__}."
+            )
+            return None
+
+        self._pending += 1
+        try:
+            async with self._workers:
+                executor = self._get_executor()
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    executor, _run_with_deadline, self._timeout, render_func, *args
+                )
+        except BrokenProcessPool:
+            logging.error(
+                f"[Graphs] Render worker died during {render_func.__name__} "
+                f"(crashed or exceeded {self._timeout}s), restarting render pool."
+            )
+            if self._executor is executor:
+                self.shutdown()
+        finally:
+            self._pending -= 1
+        return None
+
+    def shutdown(self) -> None:
+        """Shut down the process pool, a new one is created on next render."""
+        executor = self._executor
+        if executor is None:
+            return
+        self._executor = None
+        executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs threads (pymongo, discord.py) may
+            # copy locks held by those threads into the worker
+            context = multiprocessing.get_context("forkserver")
+            # Workers are forked from a server that already imported matplotlib
+            context.set_forkserver_preload(["app.classes.graph_worker"])
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=context,
+                initializer=_load_worker,
+            )
+        return self._executor
@@ -0,0 +1,198 @@
+"""Matplotlib drawing code for SFD activity graphs.
+
+This module imports matplotlib and applies the cyberpunk style at import
+time, so it is only imported inside the render worker process, never by
+the bot itself. Use :mod:`app.classes.graph_renderer` to render graphs.
+
+Timezone variants of a graph only differ in their x-tick labels, so the
+styled plot is rasterized once per dataset. Each variant then only draws
+its tick labels on a transparent canvas, which is composited over the
+shared plot layer before encoding.
+"""
+
+import gc
+import io
+
+import matplotlib
+import numpy as np
+
+from app.config.sfd import GRAPH_DPI
+
+matplotlib.use("agg")
+import matplotlib.pyplot as plt
+import mplcyberpunk
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+plt.style.use("cyberpunk")
+
+
+def generate_lines_and_effects(
+    x_positions: list[int], players: list[int], servers: list[int]
+) -> None:
+    plt.figure(figsize=(14, 7))
+    plt.plot(x_positions, players, color="cyan", label="Players")
+    plt.plot(x_positions, servers, color="magenta", label="Servers")
+    plt.legend(loc="upper center", fontsize=12, bbox_to_anchor=(0.5, 1.05), ncol=2)
+
+    mplcyberpunk.add_glow_effects()
+    mplcyberpunk.add_gradient_fill(alpha_gradientglow=0.5)
+    plt.tight_layout()
+    plt.grid(True)
+
+
+def _draw_rgba(fig: Figure) -> np.ndarray:
+    fig.canvas.draw()
+    return np.array(fig.canvas.buffer_rgba())  # pyright: ignore[reportAttributeAccessIssue]
+
+
+def _show_only_tick_labels(fig: Figure, ax: Axes) -> None:
+    """Hide every artist except the x-tick labels, on a transparent canvas."""
+    fig.patch.set_visible(False)
+    for artist in ax.get_children():
+        if artist is not ax.xaxis:
+            artist.set_visible(False)
+    for tick in ax.xaxis.get_major_ticks():
+        tick.tick1line.set_visible(False)
+        tick.tick2line.set_visible(False)
+        tick.gridline.set_visible(False)
+
+
+def _composite(base: np.ndarray, overlay: np.ndarray) -> np.ndarray:
+    """Alpha-composite an RGBA overlay over an opaque RGBA base.
+
+    Only the rows the overlay actually draws on (the tick label strip)
+    are blended, the rest of the base is copied as is.
+    """
+    image = base.copy()
+    rows = np.flatnonzero(overlay[..., 3].any(axis=1))
+    if rows.size == 0:
+        return image
+
+    band = slice(rows[0], rows[-1] + 1)
+    alpha = overlay[band, :, 3:4].astype(np.float32) / 255
+    rgb = overlay[band, :, :3] * alpha + base[band, :, :3] * (1 - alpha)
+    image[band, :, :3] = rgb.round().astype(np.uint8)
+    return image
+
+
+def _crop_to_bbox(image: np.ndarray, bbox: Bbox) -> np.ndarray:
+    """Crop a rendered canvas to a bounding box given in inches."""
+    height, width = image.shape[:2]
+    pad = plt.rcParams["savefig.pad_inches"]
+    x0 = max(0, int((bbox.x0 - pad) * GRAPH_DPI))
+    x1 = min(width, int((bbox.x1 + pad) * GRAPH_DPI))
+    y0 = max(0, int(height - (bbox.y1 + pad) * GRAPH_DPI))
+    y1 = min(height, int(height - (bbox.y0 - pad) * GRAPH_DPI))
+    return image[y0:y1, x0:x1]
+
+
+def _encode_png(image: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    plt.imsave(buffer, image, format="png", dpi=GRAPH_DPI)
+    return buffer.getvalue()
+
+
+def _render_variants(
+    players: list[int],
+    servers: list[int],
+    labels_by_key: dict[str, list[str]],
+    rotation: int = 0,
+    tight: bool = False,
+) -> dict[str, bytes]:
+    """Render one graph per label set, sharing a single rasterized plot layer.
+
+    Parameters
+    ----------
+    players: list[int]
+        Player counts, 10 samples per tick.
+    servers: list[int]
+        Server counts, 10 samples per tick.
+    labels_by_key: dict[str, list[str]]
+        X-tick labels for each variant, keyed by an arbitrary variant name.
+    rotation: int
+        Rotation of the x-tick labels in degrees.
+    tight: bool
+        Whether to crop each variant to its tight bounding box.
+
+    Returns
+    -------
+    dict[str, bytes]
+        The encoded PNG image for each key of ``labels_by_key``.
+    """
+    generate_lines_and_effects(list(range(len(players))), players, servers)
+    fig, ax = plt.gcf(), plt.gca()
+    fig.set_dpi(GRAPH_DPI)
+
+    # One time position per 10 samples
+    time_positions = [i * 10 + 5 for i in range(len(players) // 10)]
+    ax.set_xticks(time_positions, [""] * len(time_positions), rotation=rotation)
+    if tight:
+        plt.subplots_adjust(bottom=0.2)
+
+    base = _draw_rgba(fig)
+    base_bbox = fig.get_tightbbox()
+    _show_only_tick_labels(fig, ax)
+
+    images: dict[str, bytes] = {}
+    rendered: dict[tuple[str, ...], bytes] = {}
+    for key, labels in labels_by_key.items():
+        label_key = tuple(labels)
+        if label_key not in rendered:
+            ax.set_xticks(time_positions, labels, rotation=rotation)
+            _show_only_tick_labels(fig, ax)
+            image = _composite(base, _draw_rgba(fig))
+            if tight:
+                bbox = Bbox.union([base_bbox, fig.get_tightbbox()])
+                image = _crop_to_bbox(image, bbox)
+            rendered[label_key] = _encode_png(image)
+        images[key] = rendered[label_key]
+
+    plt.close(fig)
+    gc.collect()
+    return images
+
+
+def render_day_graphs(
+    players: list[int], servers: list[int], labels_by_key: dict[str, list[str]]
+) -> dict[str, bytes]:
+    """Render the daily activity graph variants.
+
+    Parameters
+    ----------
+    players: list[int]
+        Player counts, one sample every 6 minutes (240 samples).
+    servers: list[int]
+        Server counts, one sample every 6 minutes (240 samples).
+    labels_by_key: dict[str, list[str]]
+        One x-axis label per hour (24 labels) for each variant.
+
+    Returns
+    -------
+    dict[str, bytes]
+        The encoded PNG image for each variant.
+    """
+    return _render_variants(players, servers, labels_by_key)
+
+
+def render_week_graphs(
+    players: list[int], servers: list[int], labels_by_key: dict[str, list[str]]
+) -> dict[str, bytes]:
+    """Render the weekly activity graph variants.
+
+    Parameters
+    ----------
+    players: list[int]
+        Player averages, 10 samples per 6-hour period (280 samples).
+    servers: list[int]
+        Server averages, 10 samples per 6-hour period (280 samples).
+    labels_by_key: dict[str, list[str]]
+        One x-axis label per 6-hour period (28 labels) for each variant.
+
+    Returns
+    -------
+    dict[str, bytes]
+        The encoded PNG image for each variant.
+    """
+    return _render_variants(players, servers, labels_by_key, rotation=45, tight=True)
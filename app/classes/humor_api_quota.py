@@ -0,0 +1,145 @@
+"""Spread HumorAPI requests over the API keys by their remaining quota.
+
+Every HumorAPI response tells how many quota points the key has left in the
+``x-api-quota-left`` header. The manager remembers it per key, along with
+the average cost of a request, and always hands out the key with the most
+quota left. A key that can't afford another request isn't used until its
+quota resets, so no request is wasted on an exhausted key. The state is
+persisted by a hash of each key, never the key itself.
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from typing import Any, Optional
+
+import httpx
+
+from app.config.mongo import DB_CACHE
+from app.config.scraping import HUMORAPI_FAILURE_COOLDOWN
+from app.data.bot_data import BotConfigManager
+
+
+def token_key(token: str) -> str:
+    """Short hash identifying an API key in the stored state."""
+    return hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+
+
+@dataclass(slots=True)
+class HumorApiQuota:
+    """Known quota of an API key for the current day (UTC)."""
+
+    day: str
+    quota_left: float | None = None
+    # Running average of the points a request costs
+    request_cost: float = 1.0
+    # Unix time before which the key isn't used after a failed request
+    retry_at: float = 0.0
+
+    def can_afford(self) -> bool:
+        if time.time() < self.retry_at:
+            return False
+        return self.quota_left is None or self.quota_left >= self.request_cost
+
+
+class HumorApiQuotaManager:
+    """Hands out HumorAPI keys by remaining quota.
+
+    Parameters
+    ----------
+    tokens: list[str]
+        The HumorAPI keys.
+    config_manager: :class:`BotConfigManager`
+        Config manager the quota state is persisted with.
+    """
+
+    def __init__(self, tokens: list[str], config_manager: BotConfigManager) -> None:
+        self._tokens = list(tokens)
+        self._config_manager = config_manager
+        self._quotas: dict[str, HumorApiQuota] | None = None
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    async def acquire(self) -> Optional[str]:
+        """Get the key with the most quota left that can afford a request.
+
+        Returns
+        -------
+        str | None
+            The key, or None if every key is predicted to be exhausted.
+        """
+        quotas = await self._load()
+        candidates = [
+            token for token in self._tokens if quotas[token_key(token)].can_afford()
+        ]
+        if not candidates:
+            return None
+
+        def quota_left(token: str) -> float:
+            left = quotas[token_key(token)].quota_left
+            return float("inf") if left is None else left
+
+        return max(candidates, key=quota_left)
+
+    async def record(self, token: str, response: Optional[httpx.Response]) -> None:
+        """Update a key's quota from the response of a request made with it.
+
+        Parameters
+        ----------
+        token: str
+            The key used for the request.
+        response: :class:`httpx.Response` | None
+            The response, or None if the request failed.
+        """
+        quotas = await self._load()
+        quota = quotas[token_key(token)]
+
+        header = response.headers.get("x-api-quota-left") if response else None
+        if header is None:
+            quota.retry_at = time.time() + HUMORAPI_FAILURE_COOLDOWN
+            logging.warning(
+                f"[HumorAPI] Request failed, not using key {token_key(token)} "
+                f"for {HUMORAPI_FAILURE_COOLDOWN}s."
+            )
+        else:
+            try:
+                quota_left = float(header)
+            except ValueError:
+                quota_left = None
+            if quota_left is not None:
+                if quota.quota_left is not None and quota_left < quota.quota_left:
+                    cost = quota.quota_left - quota_left
+                    quota.request_cost = (quota.request_cost + cost) / 2
+                quota.quota_left = quota_left
+                if not quota.can_afford():
+                    logging.info(
+                        f"[HumorAPI] Key {token_key(token)} is exhausted for today."
+                    )
+
+        self._config_manager.set(
+            "humor_api_quota", {key: asdict(value) for key, value in quotas.items()}
+        )
+        await self._config_manager.save("humor_api_quota", DB_CACHE)
+
+    async def _load(self) -> dict[str, HumorApiQuota]:
+        today = datetime.now(UTC).date().isoformat()
+        if self._quotas is None:
+            stored: Any = await self._config_manager.get("humor_api_quota", DB_CACHE)
+            self._quotas = {}
+            if isinstance(stored, dict):
+                for key, value in stored.items():
+                    try:
+                        self._quotas[key] = HumorApiQuota(**value)
+                    except TypeError:
+                        continue
+
+        for token in self._tokens:
+            key = token_key(token)
+            quota = self._quotas.get(key)
+            # Quotas reset daily
+            if quota is None or quota.day != today:
+                self._quotas[key] = HumorApiQuota(day=today)
+        return self._quotas
@@ -0,0 +1,275 @@
+"""Keep the joke pools filled in the background.
+
+Joke commands used to call the joke APIs inside the interaction once a
+guild had seen every loaded joke. The prefetcher refills a pool as soon as a
+guild gets close to the end of it, queries the sources concurrently, and
+stores the pools in MongoDB so a restart doesn't start with empty pools.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+import httpx
+
+from app.classes.humor_api_quota import HumorApiQuotaManager
+from app.config.mongo import DB_CACHE
+from app.config.scraping import (
+    API_DAD_JOKE,
+    API_HUMORAPI,
+    API_JOKEAPI,
+    JOKE_LOW_WATERMARK,
+    JOKE_POOL_PERSISTED,
+    JOKE_REFILL_WAIT,
+)
+from app.data.bot_data import BotConfigManager
+from app.data.joke_pool import JokePool
+from app.data.temp_guild_data import JokeCacheManager
+from app.utils import make_http_request
+
+JOKE_CATEGORIES = ("jokes", "dad_jokes", "yo_mama_jokes")
+
+
+class JokePrefetcher:
+    """Refills the joke pools of a :class:`JokeCacheManager` in the background.
+
+    Parameters
+    ----------
+    humor_quota: :class:`HumorApiQuotaManager`
+        Hands out the HumorAPI keys.
+    session: :class:`httpx.AsyncClient`
+        HTTP client for the joke APIs.
+    joke_cache: :class:`JokeCacheManager`
+        The pools to keep filled.
+    config_manager: :class:`BotConfigManager`
+        Config manager the pools are persisted with.
+    """
+
+    def __init__(
+        self,
+        humor_quota: HumorApiQuotaManager,
+        session: httpx.AsyncClient,
+        joke_cache: JokeCacheManager,
+        config_manager: BotConfigManager,
+    ) -> None:
+        self._humor_quota = humor_quota
+        self._session = session
+        self._config_manager = config_manager
+        self._pools: dict[str, JokePool] = {
+            "jokes": joke_cache.loaded_jokes,
+            "dad_jokes": joke_cache.loaded_dad_jokes,
+            "yo_mama_jokes": joke_cache.loaded_yo_mama_jokes,
+        }
+        self._fetchers: dict[str, Callable[[], Awaitable[Optional[set[str]]]]] = {
+            "jokes": self._get_jokes,
+            "dad_jokes": self._get_dad_jokes,
+            "yo_mama_jokes": self._get_yo_mama_jokes,
+        }
+        self._refill_tasks: dict[str, asyncio.Task[None]] = {}
+        self._load_task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Load the stored pools and refill the ones that are low."""
+        self._load_task = asyncio.create_task(self._load())
+
+    def notify(self, category: str, remaining: int) -> None:
+        """Refill a pool if a guild has fewer unseen jokes than the watermark.
+
+        Parameters
+        ----------
+        category: str
+            One of ``JOKE_CATEGORIES``.
+        remaining: int
+            Number of jokes of the pool the guild hasn't seen yet.
+        """
+        if remaining < JOKE_LOW_WATERMARK:
+            self.schedule_refill(category)
+
+    def schedule_refill(self, category: str) -> None:
+        """Refill a pool in the background, unless a refill is running."""
+        task = self._refill_tasks.get(category)
+        if task is not None and not task.done():
+            return
+        self._refill_tasks[category] = asyncio.create_task(self._refill(category))
+
+    def schedule_refill_all(self) -> None:
+        """Refill every pool in the background."""
+        for category in JOKE_CATEGORIES:
+            self.schedule_refill(category)
+
+    def refilling(self, category: str) -> bool:
+        """Whether a pool is being loaded from the database or refilled."""
+        tasks = (self._load_task, self._refill_tasks.get(category))
+        return any(task is not None and not task.done() for task in tasks)
+
+    async def wait_for_refill(self, category: str) -> None:
+        """Wait for the running load and refill of a pool to finish.
+
+        Gives up after ``JOKE_REFILL_WAIT`` seconds, the refill then keeps
+        running in the background.
+
+        Parameters
+        ----------
+        category: str
+            One of ``JOKE_CATEGORIES``.
+        """
+        try:
+            async with asyncio.timeout(JOKE_REFILL_WAIT):
+                if self._load_task is not None:
+                    await asyncio.shield(self._load_task)
+                # Looked up after the load, which may have started the refill
+                task = self._refill_tasks.get(category)
+                if task is not None:
+                    await asyncio.shield(task)
+        except Exception:
+            # Timed out or the refill failed, the pool is left as it is
+            return
+
+    async def reset(self) -> None:
+        """Persist the emptied pools, then refill every pool in the background.
+
+        Without saving the empty pools first, a restart before the refills
+        finish would load the cleared jokes back from the database.
+        """
+        for category in JOKE_CATEGORIES:
+            self._config_manager.set(f"{category}_pool", [])
+            await self._config_manager.save(f"{category}_pool", DB_CACHE)
+        self.schedule_refill_all()
+
+    async def _load(self) -> None:
+        for category, pool in self._pools.items():
+            stored = await self._config_manager.get(f"{category}_pool", DB_CACHE)
+            pool.add_many(stored)
+            if len(pool) < JOKE_LOW_WATERMARK:
+                self.schedule_refill(category)
+
+    async def _refill(self, category: str) -> None:
+        pool = self._pools[category]
+        jokes = await self._fetchers[category]()
+        if not jokes:
+            logging.warning(f"[Jokes] Failed to refill {category}.")
+            return
+
+        if not pool.add_many(jokes):
+            return
+        self._config_manager.set(
+            f"{category}_pool", pool.to_list()[-JOKE_POOL_PERSISTED:]
+        )
+        await self._config_manager.save(f"{category}_pool", DB_CACHE)
+
+    async def _get_jokes(self) -> Optional[set[str]]:
+        results = await asyncio.gather(
+            self._get_humor_api_jokes(), self._get_joke_api_jokes()
+        )
+        return set().union(*results)
+
+    async def _get_dad_jokes(self) -> Optional[set[str]]:
+        fetched_jokes: set[str] = set()
+        response = await make_http_request(
+            self._session,
+            API_DAD_JOKE,
+            retries=3,
+            headers={"Accept": "application/json"},
+            get_json=True,
+        )
+        if not response:
+            return None
+
+        jokes = response.get("results")
+        if not jokes:
+            return None
+
+        for joke in jokes:
+            joke = joke.get("joke")
+            if joke in self._pools["dad_jokes"]:
+                continue
+
+            fetched_jokes.add(joke)
+        return fetched_jokes
+
+    async def _get_yo_mama_jokes(self) -> Optional[set[str]]:
+        fetched_jokes: set[str] = set()
+        response = await self._humor_api_request("yo_mama")
+        if not response:
+            return None
+
+        jokes = response.json()
+        for joke in jokes.get("jokes", []):
+            text = joke.get("joke")
+            if not text or text in self._pools["yo_mama_jokes"]:
+                continue
+
+            fetched_jokes.add(text)
+
+        return fetched_jokes
+
+    async def _get_joke_api_jokes(self) -> set[str]:
+        fetched_jokes: set[str] = set()
+        response = await make_http_request(
+            self._session,
+            API_JOKEAPI,
+            get_json=True,
+        )
+        if not response:
+            return set()
+
+        if response.get("error"):
+            return set()
+
+        jokes = response.get("jokes")
+        if not jokes:
+            return set()
+
+        for joke in jokes:
+            joke_text: str = (
+                f"{joke.get('setup')}\n{joke.get('delivery')}"
+                if joke.get("type") == "twopart"
+                else joke.get("joke")
+            )
+            if not joke_text or joke_text in self._pools["jokes"]:
+                continue
+
+            fetched_jokes.add(joke_text)
+
+        return fetched_jokes
+
+    async def _get_humor_api_jokes(self) -> set[str]:
+        fetched_jokes: set[str] = set()
+
+        responses = await asyncio.gather(
+            *(
+                self._humor_api_request(joke_type)
+                for joke_type in ["racist", "jewish", "nsfw"]
+            )
+        )
+        for response in responses:
+            if not response:
+                continue
+
+            jokes = response.json()
+            for joke in jokes.get("jokes", []):
+                text = joke.get("joke")
+                if not text or text in self._pools["jokes"]:
+                    continue
+
+                fetched_jokes.add(text)
+
+        return fetched_jokes
+
+    async def _humor_api_request(self, tags: str) -> Optional[httpx.Response]:
+        # A failed key is skipped by the quota manager, so try the others
+        for _ in range(len(self._humor_quota)):
+            token = await self._humor_quota.acquire()
+            if not token:
+                return None
+
+            response = await make_http_request(
+                self._session,
+                API_HUMORAPI + f"{tags}&api-key={token}&max-length=256",
+                retries=3,
+            )
+            await self._humor_quota.record(token, response)
+            if response:
+                return response
+        return None
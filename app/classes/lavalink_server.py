@@ -5,7 +5,12 @@ import httpx
 
 from app.config.mongo import DB_CACHE
 from app.config.scraping import API_LAVALIST
-from app.utils import get_url_response_time, make_http_request
+from app.utils import (
+    NOT_MODIFIED,
+    HttpValidatorCache,
+    get_url_response_time,
+    make_http_request,
+)
 
 if TYPE_CHECKING:
     from app.main import KexoBotClient
@@ -37,11 +42,18 @@ class LavalinkServerManager:
         self._session = session
         self._cached_lavalink_servers = self._bot.cached_lavalink_servers
         self._fresh_nodes: set[str] = set()
+        self._validators = HttpValidatorCache()
 
     async def _fetch_and_parse(self, api_url: str) -> list | None:
-        json_data: list = await make_http_request(self._session, api_url, get_json=True)
+        json_data = await make_http_request(
+            self._session, api_url, get_json=True, validators=self._validators
+        )
+        if json_data is NOT_MODIFIED:
+            logging.info("[Lavalink] Lavalink servers list unchanged.")
+            return None
         if json_data:
             await self._parse_lavalink_servers(json_data)
+            self._validators.commit(api_url)
         return json_data
 
     async def fetch(self) -> None:
@@ -0,0 +1,219 @@
+"""Queue outbound channel messages, merging embeds and pacing each channel.
+
+Scrapers post several embeds in a row and every one used to be its own
+request, so a burst ran into Discord's per-channel rate limit and waited out
+429 responses. The dispatcher keeps a queue per channel: consecutive
+embed-only messages are merged into a single message (up to 10 embeds), and
+a channel is never sent more messages than its rate-limit window allows.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import discord
+
+from app.config.discord import (
+    MESSAGE_COALESCE_DELAY,
+    MESSAGE_MAX_EMBED_CHARS,
+    MESSAGE_MAX_EMBEDS,
+    MESSAGE_RATE_LIMIT,
+    MESSAGE_RATE_PERIOD,
+)
+
+
+@dataclass(slots=True)
+class _QueuedMessage:
+    payload: dict[str, Any]
+    delete_after: float | None
+    queued_at: float
+    # Cleared when a merged message failed, to retry the message on its own
+    mergeable: bool = True
+
+    def embeds(self) -> list[discord.Embed] | None:
+        """Get the embeds of the message if it can be merged with others."""
+        if not self.mergeable or self.delete_after is not None:
+            return None
+        if set(self.payload) == {"embed"}:
+            return [self.payload["embed"]]
+        if set(self.payload) == {"embeds"}:
+            return self.payload["embeds"]
+        return None
+
+
+@dataclass(slots=True)
+class _ChannelQueue:
+    messages: deque[_QueuedMessage] = field(default_factory=deque)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    # Send times within the current rate-limit window, oldest first
+    sent_at: deque[float] = field(default_factory=deque)
+    task: asyncio.Task[None] | None = None
+
+
+@dataclass(slots=True)
+class DispatcherStats:
+    """Snapshot of the dispatcher's queues and counters."""
+
+    # Messages waiting to be sent
+    queued: int
+    # Channels with a queue
+    channels: int
+    # Discord messages sent
+    sent: int
+    # Queued messages merged into another message
+    merged: int
+    # Queued messages that couldn't be sent
+    failed: int
+    # Seconds between queueing and sending, summed over all sent messages
+    latency_total: float
+    latency_max: float
+
+    @property
+    def latency_average(self) -> float:
+        delivered = self.sent + self.merged
+        return self.latency_total / delivered if delivered else 0.0
+
+
+class MessageDispatcher:
+    """Sends channel messages in the background, one queue per channel."""
+
+    def __init__(self) -> None:
+        self._channels: dict[int, _ChannelQueue] = {}
+        self._sent = 0
+        self._merged = 0
+        self._failed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def enqueue(
+        self,
+        channel: discord.abc.Messageable,
+        payload: dict[str, Any],
+        delete_after: float | None = None,
+    ) -> None:
+        """Queue a message to be sent to a channel.
+
+        Parameters
+        ----------
+        channel: :class:`discord.abc.Messageable`
+            The channel to send to.
+        payload: dict[str, Any]
+            Keyword arguments for ``channel.send``.
+        delete_after: float | None
+            Seconds after which the sent message is deleted.
+        """
+        key = getattr(channel, "id", None) or id(channel)
+        queue = self._channels.get(key)
+        if queue is None:
+            queue = self._channels[key] = _ChannelQueue()
+
+        queue.messages.append(_QueuedMessage(payload, delete_after, time.monotonic()))
+        queue.wakeup.set()
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._run(key, channel, queue))
+
+    def stats(self) -> DispatcherStats:
+        """Get the current queue depth and send counters."""
+        return DispatcherStats(
+            queued=sum(len(queue.messages) for queue in self._channels.values()),
+            channels=len(self._channels),
+            sent=self._sent,
+            merged=self._merged,
+            failed=self._failed,
+            latency_total=self._latency_total,
+            latency_max=self._latency_max,
+        )
+
+    async def _run(
+        self, key: int, channel: discord.abc.Messageable, queue: _ChannelQueue
+    ) -> None:
+        while True:
+            if not queue.messages:
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), MESSAGE_RATE_PERIOD)
+                except TimeoutError:
+                    if queue.messages:
+                        continue
+                    # Idle for a whole window, so its rate limit has reset
+                    del self._channels[key]
+                    return
+                continue
+
+            if queue.messages[0].embeds() is not None:
+                # Let the rest of a burst arrive so it can be merged
+                await asyncio.sleep(MESSAGE_COALESCE_DELAY)
+            await self._wait_for_slot(queue)
+            await self._deliver(channel, queue, self._take(queue))
+
+    @staticmethod
+    async def _wait_for_slot(queue: _ChannelQueue) -> None:
+        while True:
+            now = time.monotonic()
+            while queue.sent_at and now - queue.sent_at[0] >= MESSAGE_RATE_PERIOD:
+                queue.sent_at.popleft()
+            if len(queue.sent_at) < MESSAGE_RATE_LIMIT:
+                return
+            await asyncio.sleep(queue.sent_at[0] + MESSAGE_RATE_PERIOD - now)
+
+    @staticmethod
+    def _take(queue: _ChannelQueue) -> list[_QueuedMessage]:
+        batch = [queue.messages.popleft()]
+        embeds = batch[0].embeds()
+        if embeds is None:
+            return batch
+
+        count = len(embeds)
+        chars = sum(len(embed) for embed in embeds)
+        while queue.messages:
+            following = queue.messages[0].embeds()
+            if following is None:
+                break
+            count += len(following)
+            chars += sum(len(embed) for embed in following)
+            if count > MESSAGE_MAX_EMBEDS or chars > MESSAGE_MAX_EMBED_CHARS:
+                break
+            batch.append(queue.messages.popleft())
+        return batch
+
+    async def _deliver(
+        self,
+        channel: discord.abc.Messageable,
+        queue: _ChannelQueue,
+        batch: list[_QueuedMessage],
+    ) -> None:
+        if len(batch) == 1:
+            payload = batch[0].payload
+        else:
+            payload = {
+                "embeds": [embed for queued in batch for embed in queued.embeds() or []]
+            }
+
+        queue.sent_at.append(time.monotonic())
+        try:
+            message = await channel.send(**payload)  # pyright: ignore[reportAny]
+        except discord.HTTPException as e:
+            if len(batch) > 1:
+                # One invalid embed shouldn't drop the others, send them one by one
+                for queued in reversed(batch):
+                    queued.mergeable = False
+                    queue.messages.appendleft(queued)
+                return
+            self._failed += 1
+            logging.warning(f"[Dispatcher] Failed to send message to {channel}: {e}")
+            return
+
+        now = time.monotonic()
+        self._sent += 1
+        self._merged += len(batch) - 1
+        for queued in batch:
+            latency = now - queued.queued_at
+            self._latency_total += latency
+            self._latency_max = max(self._latency_max, latency)
+
+        delete_after = batch[0].delete_after
+        if delete_after is not None:
+            await message.delete(delay=delete_after)  # pyright: ignore[reportUnknownMemberType]
@@ -1,3 +1,4 @@
+import asyncio
 import copy
 import logging
 import re
@@ -20,12 +21,17 @@ from app.config.reddit import (
     CRACKWATCH_HIGHLIGHT_KEYWORDS,
     ICON_REDDIT_CRACKWATCH,
     ICON_REDDIT_FREEGAMEFINDINGS,
-    REDDIT_CRACKWATCH_MAX_RESULTS,
     REDDIT_FREEGAMEFINDINGS_EMBEDS,
-    REDDIT_FREEGAMEFINDINGS_MAX_RESULTS,
+    REDDIT_POLL_ANCHOR_RESET,
+    REDDIT_POLL_MAX_RESULTS,
+    REDDIT_POLL_SUBREDDITS,
+    REDDIT_STREAM_BACKOFF_MAX,
+    REDDIT_STREAM_BACKOFF_MIN,
     REDDIT_TO_REMOVE,
 )
 from app.data.bot_data import BotConfigManager
+from app.data.seen_set import SeenSet, url_path
+from app.response_handler import send
 from app.utils import strip_text
 
 
@@ -84,96 +90,206 @@ class RedditFetcher:
         self._reddit_agent = reddit_agent
         self._free_stuff = free_stuff
         self._game_cracks = game_cracks
+        # Fullname of the newest submission seen, used as ``before`` anchor
+        self._newest_fullname: str | None = None
+        self._empty_polls = 0
+        self._stream_task: asyncio.Task[None] | None = None
+
+    @property
+    def streaming(self) -> bool:
+        """Whether new submissions are received by the streaming task."""
+        return self._stream_task is not None and not self._stream_task.done()
+
+    def start_streaming(self) -> None:
+        """Receive new submissions as they're posted, instead of polling.
+
+        The stream runs as a background task that catches up with a poll and
+        reconnects with exponential backoff whenever it fails.
+        """
+        if self.streaming:
+            return
+        self._stream_task = asyncio.create_task(self._supervise_stream())
+
+    async def close(self) -> None:
+        """Stop receiving submissions by streaming."""
+        task = self._stream_task
+        if task is None:
+            return
+        self._stream_task = None
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
-    async def crackwatch(self) -> None:
-        """Method to fetch game repacks from r/CrackWatch subreddit."""
-        crackwatch_cache = await self._config_manager.get("crackwatch_cache", DB_CACHE)
-        crackwatch_cache_copy = crackwatch_cache.copy()
-        to_filter = await self._config_manager.get("crackwatch_exceptions", DB_LISTS)
+    async def poll(self) -> None:
+        """Fetch new submissions of r/CrackWatch and r/FreeGameFindings.
 
+        Both subreddits are fetched in a single listing request, and only
+        submissions newer than the newest one from the previous poll.
+        """
         subreddit: asyncpraw.models.Subreddit = await self._reddit_agent.subreddit(
-            "CrackWatch"
+            REDDIT_POLL_SUBREDDITS
         )
+        params = {"before": self._newest_fullname} if self._newest_fullname else {}
+        newest = None
         try:
-            async for submission in subreddit.new(limit=REDDIT_CRACKWATCH_MAX_RESULTS):
-                if not self._is_valid_crackwatch_submission(
-                    submission,
-                    crackwatch_cache_copy,
-                    to_filter,
+            async for submission in subreddit.new(
+                limit=REDDIT_POLL_MAX_RESULTS, params=params
+            ):
+                if newest is None:
+                    newest = submission.fullname
+                await self._handle_submission(submission)
+
+        except (
+            AsyncPrawcoreException,
+            RequestException,
+            ResponseException,
+        ) as e:
+            logging.warning(f"[Reddit] - Error while fetching subreddits:\n{e}")
+        else:
+            # Only after a clean pass, the next poll retries a failed batch and
+            # the caches skip the submissions that were already handled
+            self._update_anchor(newest)
+        finally:
+            await self._save_caches()
+
+    async def _supervise_stream(self) -> None:
+        backoff = REDDIT_STREAM_BACKOFF_MIN
+        while True:
+            try:
+                # Submissions posted while the stream was down are skipped by it
+                await self.poll()
+                subreddit: asyncpraw.models.Subreddit = (
+                    await self._reddit_agent.subreddit(REDDIT_POLL_SUBREDDITS)
+                )
+                async for submission in subreddit.stream.submissions(
+                    skip_existing=True
                 ):
-                    continue
+                    backoff = REDDIT_STREAM_BACKOFF_MIN
+                    self._newest_fullname = submission.fullname
+                    await self._handle_submission(submission)
+                    await self._save_caches()
+            except (
+                AsyncPrawcoreException,
+                RequestException,
+                ResponseException,
+            ) as e:
+                logging.warning(
+                    f"[Reddit] - Stream failed, restarting in {backoff}s:\n{e}"
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Any other error would end streaming for good
+                logging.exception(
+                    f"[Reddit] - Stream crashed, restarting in {backoff}s."
+                )
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, REDDIT_STREAM_BACKOFF_MAX)
 
-                img_url = None
-                if submission.url.endswith((".jpg", ".jpeg", ".png")):
-                    img_url = submission.url
+    async def _handle_submission(self, submission: asyncpraw.models.Submission) -> None:
+        crackwatch_cache = await self._config_manager.get_seen_set(
+            "crackwatch_cache", DB_CACHE, history_key="crackwatch_history"
+        )
+        freegamefindings_cache = await self._config_manager.get_seen_set(
+            "freegamefindings_cache", DB_CACHE, history_key="freegamefindings_history"
+        )
 
-                submission_text = submission.selftext
-                if not submission_text:
-                    continue
+        name = submission.subreddit.display_name.lower()
+        if name == "crackwatch":
+            to_filter = await self._config_manager.get(
+                "crackwatch_exceptions", DB_LISTS
+            )
+            if self._is_valid_crackwatch_submission(
+                submission, crackwatch_cache, to_filter
+            ):
+                await self._crackwatch(submission, crackwatch_cache)
+        elif name == "freegamefindings":
+            to_filter = await self._config_manager.get(
+                "freegamefindings_exceptions", DB_LISTS
+            )
+            if self._is_valid_freegame_submission(
+                submission, freegamefindings_cache, to_filter
+            ):
+                freegamefindings_cache.add(submission.url)
+                await self._process_submission(submission)
 
-                description_list = []
+    async def _save_caches(self) -> None:
+        await self._config_manager.save("crackwatch_cache", DB_CACHE)
+        await self._config_manager.save("freegamefindings_cache", DB_CACHE)
+
+    def _update_anchor(self, newest: str | None) -> None:
+        if newest is not None:
+            self._newest_fullname = newest
+            self._empty_polls = 0
+            return
+
+        # A removed anchor makes every later listing empty, so fall back to
+        # the plain listing from time to time
+        self._empty_polls += 1
+        if self._empty_polls >= REDDIT_POLL_ANCHOR_RESET:
+            self._newest_fullname = None
+            self._empty_polls = 0
+
+    async def _crackwatch(
+        self, submission: asyncpraw.models.Submission, cache: SeenSet
+    ) -> None:
+        img_url = None
+        if submission.url.endswith((".jpg", ".jpeg", ".png")):
+            img_url = submission.url
 
-                submission_text = strip_text(submission_text, REDDIT_TO_REMOVE).split(
-                    "\n"
-                )
-                for line in submission_text:
-                    line = line.strip()
+        submission_text = submission.selftext
+        if not submission_text:
+            return
 
-                    if not line:
-                        continue
+        description_list = []
 
-                    if img_candidate := get_image_from_line(line):
-                        img_url = img_candidate
-                        continue
+        submission_text = strip_text(submission_text, REDDIT_TO_REMOVE).split("\n")
+        for line in submission_text:
+            line = line.strip()
 
-                    description_list.append(f"• {line}\n")
+            if not line:
+                continue
 
-                crackwatch_cache.pop(0)
-                crackwatch_cache.append(submission.permalink)
+            if img_candidate := get_image_from_line(line):
+                img_url = img_candidate
+                continue
 
-                description = "".join(description_list)[:4096]
-                title_lower = submission.title.lower()
-                description_lower = description.lower()
+            description_list.append(f"• {line}\n")
 
-                if any(
-                    keyword in title_lower or keyword in description_lower
-                    for keyword in CRACKWATCH_HIGHLIGHT_KEYWORDS
-                ):
-                    embed = create_embed_crackwatch(
-                        submission, description, discord.Color.gold()
-                    )
-                else:
-                    embed = create_embed_crackwatch(
-                        submission, description, discord.Color.orange()
-                    )
-
-                if img_url:
-                    embed.set_image(url=img_url)
-
-                embed.set_footer(
-                    text="I took it from - r/CrackWatch",
-                    icon_url=ICON_REDDIT_CRACKWATCH,
-                )
-                embed.timestamp = datetime.fromtimestamp(submission.created_utc)
-                await self._game_cracks.send(embed=embed)
+        cache.add(submission.permalink)
+
+        description = "".join(description_list)[:4096]
+        title_lower = submission.title.lower()
+        description_lower = description.lower()
 
-        except discord.errors.HTTPException as e:
-            logging.warning(
-                f"[CrackWatch] - Error when sending message ({submission.permalink}):\n{e}"
+        if any(
+            keyword in title_lower or keyword in description_lower
+            for keyword in CRACKWATCH_HIGHLIGHT_KEYWORDS
+        ):
+            embed = create_embed_crackwatch(
+                submission, description, discord.Color.gold()
             )
-        except (
-            AsyncPrawcoreException,
-            RequestException,
-            ResponseException,
-        ) as e:
-            logging.warning(f"[CrackWatch] - Error when accessing crackwatch:\n{e}")
-        finally:
-            await self._config_manager.save("crackwatch_cache", DB_CACHE)
+        else:
+            embed = create_embed_crackwatch(
+                submission, description, discord.Color.orange()
+            )
+
+        if img_url:
+            embed.set_image(url=img_url)
+
+        embed.set_footer(
+            text="I took it from - r/CrackWatch",
+            icon_url=ICON_REDDIT_CRACKWATCH,
+        )
+        embed.timestamp = datetime.fromtimestamp(submission.created_utc)
+        await send(self._game_cracks, embed=embed, queued=True)
 
     def _is_valid_crackwatch_submission(
         self,
         submission: asyncpraw.models.Submission,
-        cache: list[str],
+        cache: SeenSet,
         to_filter: list[str],
     ) -> bool:
         if (
@@ -193,53 +309,10 @@ class RedditFetcher:
 
         return True
 
-    async def freegamefindings(self) -> None:
-        """Method to fetch free games from r/FreeGameFindings subreddit."""
-        freegamefindings_cache = await self._config_manager.get(
-            "freegamefindings_cache", DB_CACHE
-        )
-        freegamefindings_cache_copy = freegamefindings_cache.copy()
-        to_filter = await self._config_manager.get(
-            "freegamefindings_exceptions", DB_LISTS
-        )
-
-        subreddit: asyncpraw.models.Subreddit = await self._reddit_agent.subreddit(
-            "FreeGameFindings"
-        )
-        try:
-            async for submission in subreddit.new(
-                limit=REDDIT_FREEGAMEFINDINGS_MAX_RESULTS
-            ):
-                if not self._is_valid_freegame_submission(
-                    submission,
-                    freegamefindings_cache_copy,
-                    to_filter,
-                ):
-                    continue
-
-                freegamefindings_cache.pop(0)
-                freegamefindings_cache.append(submission.url)
-                await self._process_submission(submission)
-
-        except discord.errors.HTTPException as e:
-            logging.warning(
-                f"[FreeGameFindings] - Error when sending message ({submission.permalink}):\n{e}"
-            )
-        except (
-            AsyncPrawcoreException,
-            RequestException,
-            ResponseException,
-        ) as e:
-            logging.warning(
-                f"[FreeGameFindings] - Error while fetching subreddit:\n{e}"
-            )
-        finally:
-            await self._config_manager.save("freegamefindings_cache", DB_CACHE)
-
     def _is_valid_freegame_submission(
         self,
         submission: asyncpraw.models.Submission,
-        cache: list[str],
+        cache: SeenSet,
         to_filter: list[str],
     ) -> bool:
         if (
@@ -293,13 +366,12 @@ class RedditFetcher:
 
     async def _alienwarearena(self, url) -> None:
         # There might be an occurence where giveaway is not showing in alienwarearena.com
-        alienwarearena_cache = await self._config_manager.get(
+        alienwarearena_cache = await self._config_manager.get_seen_set(
             "alienwarearena_cache", DB_CACHE
         )
-        reddit_path = url[29:]
-        for cached_url in alienwarearena_cache:
-            if reddit_path in cached_url:
-                return
+        # Reddit may link another regional host than the one that was cached
+        if alienwarearena_cache.has_path(url_path(url)):
+            return
 
         await self._create_embed(REDDIT_FREEGAMEFINDINGS_EMBEDS["AlienwareArena"], url)
 
@@ -315,4 +387,4 @@ class RedditFetcher:
             text="I took it from - r/FreeGameFindings",
             icon_url=ICON_REDDIT_FREEGAMEFINDINGS,
         )
-        await self._free_stuff.send(embed=embed)
+        await send(self._free_stuff, embed=embed, queued=True)
@@ -0,0 +1,120 @@
+"""In-memory cache of pre-rendered SFD activity graphs."""
+
+import asyncio
+import datetime
+import io
+import logging
+from dataclasses import dataclass
+
+import discord
+
+from app.classes.sfd_servers import SFDServers
+from app.config.sfd import GRAPH_CACHE_MAX_AGE, SFD_GRAPH_RANGES, TIMEZONES
+
+
+@dataclass(slots=True)
+class GraphCacheEntry:
+    """A rendered graph together with its generation metadata."""
+
+    image: bytes
+    graph_range: str
+    timezone: str
+    generated_at: datetime.datetime
+
+    @property
+    def filename(self) -> str:
+        return f"sfd_activity_{self.graph_range.lower()}_{self.timezone}.png"
+
+    @property
+    def age(self) -> float:
+        """Seconds since the graph was rendered."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return (now - self.generated_at).total_seconds()
+
+
+class SFDGraphCache:
+    """Keeps every ``TIMEZONES`` variant of the activity graphs in memory.
+
+    All variants are re-rendered in the background after each stats update,
+    so ``/sfd activity`` is served from memory. A graph is only rendered
+    on demand if it is missing or older than ``GRAPH_CACHE_MAX_AGE``.
+
+    Parameters
+    ----------
+    sfd_servers: :class:`SFDServers`
+        The SFD servers handler used to render graphs.
+    """
+
+    def __init__(self, sfd_servers: SFDServers) -> None:
+        self._sfd_servers = sfd_servers
+        self._entries: dict[tuple[str, str], GraphCacheEntry] = {}
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    def schedule_refresh(self) -> None:
+        """Re-render all graphs in the background, unless a refresh is running."""
+        if self._refresh_task and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self.refresh())
+
+    async def refresh(self) -> None:
+        """Re-render all graph ranges for every timezone."""
+        try:
+            activity = await self._sfd_servers.load_activity_data()
+            for graph_range in SFD_GRAPH_RANGES:
+                await self._render(graph_range, list(TIMEZONES), activity)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if task is not None and task.cancelling():
+                raise
+            # A render was cancelled, not this refresh
+            logging.error("[Graphs] Failed to refresh graph cache: render cancelled.")
+            return
+        except Exception as e:
+            logging.error(f"[Graphs] Failed to refresh graph cache: {e}")
+            return
+        logging.info("[Graphs] Graph cache refreshed.")
+
+    async def get_file(self, graph_range: str, timezone: str) -> discord.File | None:
+        """Get a graph as a :class:`discord.File`, rendering it on a cache miss.
+
+        Parameters
+        ----------
+        graph_range: str
+            The range of the graph (Day or Week).
+        timezone: str
+            The timezone used for graph labels.
+
+        Returns
+        -------
+        :class:`discord.File` | None
+            The graph, or None if it is not cached and rendering failed.
+        """
+        key = (graph_range, timezone)
+        entry = self._entries.get(key)
+        if entry is None or entry.age >= GRAPH_CACHE_MAX_AGE:
+            await self._render(graph_range, [timezone])
+            entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+        return discord.File(io.BytesIO(entry.image), filename=entry.filename)
+
+    async def _render(
+        self, graph_range: str, timezones: list[str], activity: dict | None = None
+    ) -> None:
+        if graph_range == "Day":
+            images = await self._sfd_servers.generate_graphs_day(timezones, activity)
+        else:
+            images = await self._sfd_servers.generate_graphs_week(timezones, activity)
+
+        if images is None:
+            return
+
+        generated_at = datetime.datetime.now(datetime.timezone.utc)
+        for timezone, image in images.items():
+            self._entries[(graph_range, timezone)] = GraphCacheEntry(
+                image=image,
+                graph_range=graph_range,
+                timezone=timezone,
+                generated_at=generated_at,
+            )
@@ -1,39 +1,51 @@
 import datetime
-import gc
-import os
+from collections.abc import Iterable
 from datetime import timedelta
 from zoneinfo import ZoneInfo
 
 import httpx
-import matplotlib
 from bs4 import BeautifulSoup
 from typing import Any
 
 from pymongo.asynchronous.collection import AsyncCollection
 
+from app.classes.graph_renderer import (
+    GraphRenderer,
+    render_day_graphs,
+    render_week_graphs,
+)
 from app.config.mongo import DB_SFD_ACTIVITY
 from app.config.sfd import API_SFD_SERVER, SFD_HEADERS, SFD_REQUEST, TIMEZONES
-from app.utils import average, is_older_than, make_http_request
-
-matplotlib.use("agg")
-import matplotlib.pyplot as plt
-import mplcyberpunk
-
-plt.style.use("cyberpunk")
-
-
-def generate_lines_and_effects(
-    x_positions: list[int], players: list[int], servers: list[int]
-) -> None:
-    plt.figure(figsize=(14, 7))
-    plt.plot(x_positions, players, color="cyan", label="Players")
-    plt.plot(x_positions, servers, color="magenta", label="Servers")
-    plt.legend(loc="upper center", fontsize=12, bbox_to_anchor=(0.5, 1.05), ncol=2)
-
-    mplcyberpunk.add_glow_effects()
-    mplcyberpunk.add_gradient_fill(alpha_gradientglow=0.5)
-    plt.tight_layout()
-    plt.grid(True)
+from app.utils import BodyHashCache, average, is_older_than, make_http_request
+
+
+def get_day_labels(timezone: str) -> list[str]:
+    """Get one x-axis label per hour for the last 24 hours in a timezone."""
+    now = datetime.datetime.now(ZoneInfo(TIMEZONES[timezone]))
+    return [
+        (now - timedelta(hours=i)).strftime("%I%p").lstrip("0")
+        for i in range(23, -1, -1)
+    ]
+
+
+def get_week_labels(timezone: str) -> list[str]:
+    """Get one x-axis label per 6-hour period for the last week in a timezone."""
+    now = datetime.datetime.now(ZoneInfo(TIMEZONES[timezone]))
+    last_update = now - timedelta(
+        hours=now.hour % 6,
+        minutes=now.minute,
+        seconds=now.second,
+    )
+
+    labels = []
+    # Generate 28 labels (one for each 6-hour period, going backwards)
+    for i in range(27, -1, -1):
+        time = last_update - timedelta(hours=i * 6)
+        day_str = time.strftime("%a")
+        hour = int(time.strftime("%I"))
+        ampm = time.strftime("%p")
+        labels.append(f"{day_str} {hour}{ampm}")
+    return labels
 
 
 class SFDServer:
@@ -110,6 +122,99 @@ class SFDServer:
         return game_modes.get(self._game_mode, "Unknown")
 
 
+def parse_servers(response: str) -> list[SFDServer] | None:
+    """Parse the SOAP response of the SFD server list.
+
+    Parameters
+    ----------
+    response: str
+        The XML body of the ``GetGameServers`` response.
+
+    Returns
+    -------
+    list[SFDServer] | None
+        The listed servers, or None if the response has no server list.
+    """
+    soup = BeautifulSoup(response, "xml")
+    servers_element = soup.find("GetGameServersResult").find("Servers")
+
+    servers = []
+    if not servers_element:
+        return None
+
+    all_servers = servers_element.find_all("SFDGameServer")
+    for server_element in all_servers:
+        if int(server_element.find("VersionNr").text) == 0:
+            continue  # Skip servers with version 0
+
+        server_name = (
+            server_element.find("GameName").text
+            if server_element.find("GameName")
+            else None
+        )
+
+        address_ipv4 = (
+            server_element.find("AddressIPv4").text
+            if server_element.find("AddressIPv4")
+            else None
+        )
+        port = (
+            int(server_element.find("Port").text) if server_element.find("Port") else 0
+        )
+
+        game_mode = (
+            int(server_element.find("GameMode").text)
+            if server_element.find("GameMode")
+            else 0
+        )
+        map_name = (
+            server_element.find("MapName").text
+            if server_element.find("MapName")
+            else None
+        )
+        players = (
+            int(server_element.find("Players").text)
+            if server_element.find("Players")
+            else 0
+        )
+        max_players = (
+            int(server_element.find("MaxPlayers").text)
+            if server_element.find("MaxPlayers")
+            else 0
+        )
+        bots = (
+            int(server_element.find("Bots").text) if server_element.find("Bots") else 0
+        )
+        has_password = server_element.find("HasPassword").text == "true"
+        description = (
+            server_element.find("Description").text
+            if server_element.find("Description")
+            else None
+        )
+        version = (
+            server_element.find("Version").text
+            if server_element.find("Version")
+            else None
+        )
+
+        server = SFDServer(
+            address_ipv4,
+            port,
+            server_name,
+            game_mode,
+            map_name,
+            players,
+            max_players,
+            bots,
+            has_password,
+            description,
+            version,
+        )
+
+        servers.append(server)
+    return servers
+
+
 class SFDServers:
     """Class to handle SFD server data and activity.
 
@@ -119,94 +224,74 @@ class SFDServers:
         The MongoDB client for database operations.
     session: httpx.AsyncClient
         The HTTP client for making requests.
-    graphs_dir: str
-        The directory where graphs will be saved.
+    graph_renderer: GraphRenderer
+        The process pool used to render activity graphs.
     """
 
-    def __init__(self, bot_config: AsyncCollection[Any], session: httpx.AsyncClient):
+    def __init__(
+        self,
+        bot_config: AsyncCollection[Any],
+        session: httpx.AsyncClient,
+        graph_renderer: GraphRenderer,
+    ):
         self._session = session
         self._bot_config = bot_config
-        self._graphs_dir = os.path.join(os.getcwd(), "graphs")
-        os.makedirs(self._graphs_dir, exist_ok=True)
+        self._graph_renderer = graph_renderer
+        self._body_hashes = BodyHashCache()
+        self._servers: list[SFDServer] = []
 
-    async def generate_graph_day(self, timezone: str) -> None:
-        """Method to generate a daily activity graph.
+    async def generate_graphs_day(
+        self, timezones: Iterable[str], activity: dict | None = None
+    ) -> dict[str, bytes] | None:
+        """Method to generate daily activity graphs for several timezones.
 
         Parameters:
         ----------
-        timezone: str
-            The timezone to use for the graph.
+        timezones: Iterable[str]
+            The timezones to render the graph for.
+        activity: dict | None
+            Preloaded activity document, loaded from MongoDB if not given.
+
+        Returns:
+        -------
+        dict[str, bytes] | None
+            The encoded PNG image per timezone, or None if rendering failed.
         """
-        activity = await self._load_sfd_activity_data()
+        if activity is None:
+            activity = await self.load_activity_data()
         players, servers = activity["players_day"], activity["servers_day"]
+        labels = {timezone: get_day_labels(timezone) for timezone in timezones}
 
-        selected_timezone = ZoneInfo(TIMEZONES[timezone])
-        now = datetime.datetime.now(selected_timezone)
-
-        hours = [
-            (now - timedelta(hours=i)).strftime("%I%p").lstrip("0")
-            for i in range(23, -1, -1)
-        ]
-
-        generate_lines_and_effects(list(range(240)), players, servers)
-
-        # One time position per hour
-        time_positions = [i * 10 + 5 for i in range(24)]
-        plt.xticks(time_positions, hours)
-        plt.savefig(
-            os.path.join(self._graphs_dir, f"sfd_activity_day_{timezone}.png"),
-            dpi=300,
+        return await self._graph_renderer.render(
+            render_day_graphs, players, servers, labels
         )
-        plt.clf()
-        plt.close()
-        gc.collect()
 
-    async def generate_graph_week(self, timezone: str) -> None:
-        """Method to generate a weekly activity graph.
+    async def generate_graphs_week(
+        self, timezones: Iterable[str], activity: dict | None = None
+    ) -> dict[str, bytes] | None:
+        """Method to generate weekly activity graphs for several timezones.
 
         Parameters:
         ----------
-        timezone: str
-            The timezone to use for the graph.
+        timezones: Iterable[str]
+            The timezones to render the graph for.
+        activity: dict | None
+            Preloaded activity document, loaded from MongoDB if not given.
+
+        Returns:
+        -------
+        dict[str, bytes] | None
+            The encoded PNG image per timezone, or None if rendering failed.
         """
-        activity = await self._load_sfd_activity_data()
+        if activity is None:
+            activity = await self.load_activity_data()
         players, servers = activity["players_week"], activity["servers_week"]
-        selected_timezone = ZoneInfo(TIMEZONES[timezone])
-
-        now = datetime.datetime.now(selected_timezone)
-        hours_since_six = now.hour % 6
-        minutes = now.minute
-        seconds = now.second
+        labels = {timezone: get_week_labels(timezone) for timezone in timezones}
 
-        last_update = now - timedelta(
-            hours=hours_since_six,
-            minutes=minutes,
-            seconds=seconds,
+        return await self._graph_renderer.render(
+            render_week_graphs, players, servers, labels
         )
 
-        hours = []
-        # Generate 28 labels (one for each 6-hour period, going backwards)
-        for i in range(27, -1, -1):
-            time = last_update - timedelta(hours=i * 6)
-            day_str = time.strftime("%a")
-            hour = int(time.strftime("%I"))
-            ampm = time.strftime("%p")
-            hours.append(f"{day_str} {hour}{ampm}")
-
-        generate_lines_and_effects(list(range(280)), players, servers)
-
-        time_positions = [i * 10 + 5 for i in range(28)]
-        plt.xticks(time_positions, hours, rotation=45)
-        plt.subplots_adjust(bottom=0.2)
-        plt.savefig(
-            os.path.join(self._graphs_dir, f"sfd_activity_week_{timezone}.png"),
-            dpi=300,
-            bbox_inches="tight",
-        )
-        plt.clf()
-        plt.close()
-        gc.collect()
-
     async def update_stats(self, now: datetime.datetime) -> None:
         """Method to update the server statistics.
 
@@ -215,7 +300,7 @@ class SFDServers:
         now: datetime.datetime
             The current datetime.
         """
-        activity = await self._load_sfd_activity_data()
+        activity = await self.load_activity_data()
         players_day, servers_day = (
             activity["players_day"],
             activity["servers_day"],
@@ -368,7 +453,8 @@ class SFDServers:
             players += server.players
         return players, len(servers)
 
-    async def _load_sfd_activity_data(self) -> dict:
+    async def load_activity_data(self) -> dict:
+        """Load the SFD activity document from MongoDB."""
         return await self._bot_config.find_one(DB_SFD_ACTIVITY)
 
     async def _parse_servers(self, search: str | None = None) -> list[SFDServer] | None:
@@ -376,87 +462,19 @@ class SFDServers:
         if not response:
             return None
 
-        soup = BeautifulSoup(response, "xml")
-        servers_element = soup.find("GetGameServersResult").find("Servers")
-
-        servers = []
-        if not servers_element:
-            return None
-
-        all_servers = servers_element.find_all("SFDGameServer")
-        for server_element in all_servers:
-            if int(server_element.find("VersionNr").text) == 0:
-                continue  # Skip servers with version 0
-
-            server_name = (
-                server_element.find("GameName").text
-                if server_element.find("GameName")
-                else None
-            )
-
-            address_ipv4 = (
-                server_element.find("AddressIPv4").text
-                if server_element.find("AddressIPv4")
-                else None
-            )
-            port = (
-                int(server_element.find("Port").text)
-                if server_element.find("Port")
-                else 0
-            )
-
-            game_mode = (
-                int(server_element.find("GameMode").text)
-                if server_element.find("GameMode")
-                else 0
-            )
-            map_name = (
-                server_element.find("MapName").text
-                if server_element.find("MapName")
-                else None
-            )
-            players = (
-                int(server_element.find("Players").text)
-                if server_element.find("Players")
-                else 0
-            )
-            max_players = (
-                int(server_element.find("MaxPlayers").text)
-                if server_element.find("MaxPlayers")
-                else 0
-            )
-            bots = (
-                int(server_element.find("Bots").text)
-                if server_element.find("Bots")
-                else 0
-            )
-            has_password = server_element.find("HasPassword").text == "true"
-            description = (
-                server_element.find("Description").text
-                if server_element.find("Description")
-                else None
-            )
-            version = (
-                server_element.find("Version").text
-                if server_element.find("Version")
-                else None
-            )
-
-            server = SFDServer(
-                address_ipv4,
-                port,
-                server_name,
-                game_mode,
-                map_name,
-                players,
-                max_players,
-                bots,
-                has_password,
-                description,
-                version,
-            )
-
-            servers.append(server)
+        # The SOAP endpoint doesn't support conditional requests, so reuse the
+        # last parsed list while the response body stays the same.
+        if not self._body_hashes.unchanged("servers", response):
+            servers = None
+            try:
+                servers = parse_servers(response)
+            finally:
+                if servers is None:
+                    self._body_hashes.invalidate("servers")
+            if servers is None:
+                return None
+            self._servers = servers
+        servers = self._servers
 
         if search:
             filtered_servers = [
@@ -466,4 +484,4 @@ class SFDServers:
             ]
             return filtered_servers
 
-        return servers
+        return list(servers)
@@ -0,0 +1,160 @@
+"""Per-user queue of posts for ``/shitpost``.
+
+The feed is composed locally from the shared hot listings of the subreddits
+the user selected, see :class:`SubredditListingCache`. Unseen posts are kept
+in a queue that's refilled in the background before it runs dry. If none of
+the shared listings can be fetched, it falls back to paging through the
+user's own multireddit with ``after``.
+"""
+
+import asyncio
+import itertools
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+import asyncpraw.models
+
+from app.classes.subreddit_listings import REDDIT_ERRORS, SubredditListingCache
+from app.config.reddit import SHITPOST_LOW_WATERMARK, SHITPOST_PAGE_SIZE
+from app.data.seen_set import SeenSet
+
+
+def merge_listings(
+    listings: list[list[asyncpraw.models.Submission]],
+) -> list[asyncpraw.models.Submission]:
+    """Interleave listings by rank, the way a multireddit mixes subreddits."""
+    return [
+        submission
+        for rank in itertools.zip_longest(*listings)
+        for submission in rank
+        if submission is not None
+    ]
+
+
+class ShitpostFeed:
+    """Queue of hot submissions of the user's subreddits.
+
+    Parameters
+    ----------
+    listings: :class:`SubredditListingCache`
+        Shared subreddit listings the feed is composed from.
+    subreddits: list[str]
+        Subreddits selected by the user.
+    viewed_posts: :class:`SeenSet`
+        Permalinks of posts the user has already seen, skipped when queued.
+    load_multireddit: Callable[[], Awaitable[asyncpraw.models.Multireddit | None]]
+        Loads the user's multireddit, used when the shared listings fail.
+    """
+
+    def __init__(
+        self,
+        listings: SubredditListingCache,
+        subreddits: list[str],
+        viewed_posts: SeenSet,
+        load_multireddit: Callable[[], Awaitable[asyncpraw.models.Multireddit | None]],
+    ) -> None:
+        self._listings = listings
+        self._subreddits = list(subreddits)
+        self._viewed_posts = viewed_posts
+        self._load_multireddit = load_multireddit
+        self._queue: deque[asyncpraw.models.Submission] = deque()
+        self._queued: set[str] = set()
+        self._after: str | None = None
+        self._exhausted = False
+        self._lock = asyncio.Lock()
+        self._refill_task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    async def next(
+        self, is_valid: Callable[[asyncpraw.models.Submission], bool]
+    ) -> asyncpraw.models.Submission | None:
+        """Get the next unseen submission accepted by ``is_valid``.
+
+        Parameters
+        ----------
+        is_valid: Callable[[asyncpraw.models.Submission], bool]
+            Check applied to each queued submission before it's served.
+
+        Returns
+        -------
+        asyncpraw.models.Submission | None
+            The submission, or None if there are no unseen posts. The next
+            call looks at the listings again.
+        """
+        while True:
+            while self._queue:
+                submission = self._queue.popleft()
+                self._queued.discard(submission.permalink)
+                if submission.permalink in self._viewed_posts or not is_valid(
+                    submission
+                ):
+                    continue
+                if len(self._queue) < SHITPOST_LOW_WATERMARK:
+                    self._schedule_refill()
+                return submission
+
+            if self._exhausted:
+                self._after = None
+                self._exhausted = False
+                return None
+            await self._refill()
+
+    def _schedule_refill(self) -> None:
+        if self._exhausted or (self._refill_task and not self._refill_task.done()):
+            return
+        self._refill_task = asyncio.create_task(self._background_refill())
+
+    async def _background_refill(self) -> None:
+        try:
+            await self._refill()
+        except REDDIT_ERRORS as e:
+            logging.warning(f"[Reddit] - Failed to refill shitpost feed:\n{e}")
+
+    async def _refill(self) -> None:
+        async with self._lock:
+            # Another refill may have finished while waiting for the lock
+            if len(self._queue) >= SHITPOST_LOW_WATERMARK or self._exhausted:
+                return
+
+            listings = await self._listings.get_many(self._subreddits)
+            if any(listings):
+                self._enqueue(merge_listings(listings))
+                # Nothing new until the shared listings get refreshed
+                if not self._queue:
+                    self._exhausted = True
+            else:
+                await self._refill_from_multireddit()
+
+    async def _refill_from_multireddit(self) -> None:
+        multireddit = await self._load_multireddit()
+        if multireddit is None:
+            self._exhausted = True
+            return
+
+        params = {"after": self._after} if self._after else {}
+        submissions = [
+            submission
+            async for submission in multireddit.hot(
+                limit=SHITPOST_PAGE_SIZE, params=params
+            )
+        ]
+        if submissions:
+            self._after = submissions[-1].fullname
+        if len(submissions) < SHITPOST_PAGE_SIZE:
+            self._exhausted = True
+        self._enqueue(submissions)
+
+    def _enqueue(self, submissions: list[asyncpraw.models.Submission]) -> None:
+        for submission in submissions:
+            if (
+                submission.locked
+                or submission.stickied
+                or submission.permalink in self._viewed_posts
+                or submission.permalink in self._queued
+            ):
+                continue
+            self._queue.append(submission)
+            self._queued.add(submission.permalink)
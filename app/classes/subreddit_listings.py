@@ -0,0 +1,115 @@
+"""Hot listings of subreddits shared by every user's ``/shitpost`` feed.
+
+Users pick their subreddits from the same short list, so fetching a private
+multireddit per user downloads the same posts many times. The cache keeps
+the hot listing of each subreddit for a while and refreshes it in the
+background once it gets old, so Reddit API calls scale with the number of
+subreddits instead of the number of users.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+
+import asyncpraw
+import asyncpraw.models
+from asyncprawcore.exceptions import (
+    AsyncPrawcoreException,
+    RequestException,
+    ResponseException,
+)
+
+from app.config.reddit import SHITPOST_LISTING_SIZE, SHITPOST_LISTING_TTL
+
+REDDIT_ERRORS = (AsyncPrawcoreException, RequestException, ResponseException)
+
+
+@dataclass(slots=True)
+class SubredditListing:
+    """Cached hot listing of a subreddit."""
+
+    submissions: list[asyncpraw.models.Submission]
+    fetched_at: float
+
+
+class SubredditListingCache:
+    """Cache of subreddit hot listings with a time to live.
+
+    Parameters
+    ----------
+    reddit_agent: :class:`asyncpraw.Reddit`
+        Reddit client used to fetch the listings.
+    """
+
+    def __init__(self, reddit_agent: asyncpraw.Reddit) -> None:
+        self._reddit_agent = reddit_agent
+        self._listings: dict[str, SubredditListing] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refresh_tasks: dict[str, asyncio.Task[None]] = {}
+
+    async def get(self, name: str) -> list[asyncpraw.models.Submission]:
+        """Get the hot listing of a subreddit.
+
+        Only the first request for a subreddit waits for Reddit. After that
+        the cached listing is returned, and refreshed in the background once
+        it's older than ``SHITPOST_LISTING_TTL``.
+
+        Parameters
+        ----------
+        name: str
+            The subreddit name.
+
+        Returns
+        -------
+        list[asyncpraw.models.Submission]
+            Submissions in hot order, empty if the listing can't be fetched.
+        """
+        listing = self._listings.get(name)
+        if listing is None:
+            try:
+                await self._refresh(name)
+            except REDDIT_ERRORS as e:
+                logging.warning(f"[Reddit] - Failed to fetch r/{name}:\n{e}")
+                return []
+            return self._listings[name].submissions
+
+        if time.monotonic() - listing.fetched_at > SHITPOST_LISTING_TTL:
+            self._schedule_refresh(name)
+        return listing.submissions
+
+    async def get_many(
+        self, names: list[str]
+    ) -> list[list[asyncpraw.models.Submission]]:
+        """Get the hot listings of several subreddits concurrently."""
+        return list(await asyncio.gather(*(self.get(name) for name in names)))
+
+    def _schedule_refresh(self, name: str) -> None:
+        task = self._refresh_tasks.get(name)
+        if task is not None and not task.done():
+            return
+        self._refresh_tasks[name] = asyncio.create_task(self._background_refresh(name))
+
+    async def _background_refresh(self, name: str) -> None:
+        try:
+            await self._refresh(name)
+        except REDDIT_ERRORS as e:
+            logging.warning(f"[Reddit] - Failed to refresh r/{name}:\n{e}")
+
+    async def _refresh(self, name: str) -> None:
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed it while waiting for the lock
+            listing = self._listings.get(name)
+            if (
+                listing is not None
+                and time.monotonic() - listing.fetched_at <= SHITPOST_LISTING_TTL
+            ):
+                return
+
+            subreddit = await self._reddit_agent.subreddit(name)
+            submissions = [
+                submission
+                async for submission in subreddit.hot(limit=SHITPOST_LISTING_SIZE)
+            ]
+            self._listings[name] = SubredditListing(submissions, time.monotonic())
@@ -0,0 +1,199 @@
+"""Translate texts off the event loop, with batching and a persistent cache.
+
+``deep_translator`` makes one blocking HTTP request per call. The service
+runs those calls on its own small thread pool, packs several texts into a
+single request where possible, and stores every translation in MongoDB
+keyed by a hash of its source text, so a text is only ever translated once.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from deep_translator import GoogleTranslator
+from deep_translator.exceptions import BaseError, RequestError, TooManyRequests
+from pymongo import UpdateOne
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import PyMongoError
+from requests.exceptions import RequestException
+
+from app.config.scraping import (
+    TRANSLATION_BATCH_CHARS,
+    TRANSLATION_MEMORY_CACHE,
+    TRANSLATION_WORKERS,
+)
+
+TRANSLATION_ERRORS = (BaseError, RequestError, TooManyRequests, RequestException)
+
+# Joins texts of a batch into one request, kept verbatim by the translator
+BATCH_SEPARATOR = "\n\n|||\n\n"
+
+
+def translation_key(text: str, source: str, target: str) -> str:
+    """Hash identifying the translation of a text between two languages."""
+    digest = hashlib.blake2b(f"{source}:{target}:{text}".encode(), digest_size=16)
+    return digest.hexdigest()
+
+
+def make_batches(texts: list[str], max_chars: int) -> list[list[str]]:
+    """Group texts into batches whose joined length stays under ``max_chars``.
+
+    Texts longer than ``max_chars`` get a batch of their own.
+    """
+    batches: list[list[str]] = []
+    length = 0
+    for text in texts:
+        added = len(text) + len(BATCH_SEPARATOR)
+        if batches and length + added <= max_chars:
+            batches[-1].append(text)
+            length += added
+        else:
+            batches.append([text])
+            length = added
+    return batches
+
+
+class TranslationService:
+    """Translates texts, caching results in memory and in MongoDB.
+
+    Parameters
+    ----------
+    collection: :class:`pymongo.AsyncCollection`
+        Collection storing translations by :func:`translation_key`.
+    source: str
+        Source language code.
+    target: str
+        Target language code.
+    """
+
+    def __init__(
+        self,
+        collection: AsyncCollection[Any],
+        source: str = "ru",
+        target: str = "en",
+    ) -> None:
+        self._db = collection
+        self._source = source
+        self._target = target
+        self._executor = ThreadPoolExecutor(
+            max_workers=TRANSLATION_WORKERS, thread_name_prefix="translator"
+        )
+        self._memory: OrderedDict[str, str] = OrderedDict()
+
+    async def translate(self, text: str) -> str:
+        """Translate a single text, see :meth:`translate_many`."""
+        return (await self.translate_many([text]))[0]
+
+    async def translate_many(self, texts: list[str]) -> list[str]:
+        """Translate several texts, using as few requests as possible.
+
+        Parameters
+        ----------
+        texts: list[str]
+            The texts to translate.
+
+        Returns
+        -------
+        list[str]
+            The translations, in the order of ``texts``. A text that failed
+            to translate is returned as is.
+        """
+        keys = [translation_key(text, self._source, self._target) for text in texts]
+        translations: dict[str, str] = {}
+        for key in keys:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                translations[key] = self._memory[key]
+
+        missing = {
+            key: text
+            for key, text in zip(keys, texts)
+            if key not in translations and text.strip()
+        }
+        if missing:
+            translations.update(await self._load(list(missing)))
+            to_translate = {
+                key: text for key, text in missing.items() if key not in translations
+            }
+            if to_translate:
+                translated = await self._translate_batches(to_translate)
+                translations.update(translated)
+                await self._store(translated)
+
+        for key, translation in translations.items():
+            self._remember(key, translation)
+        return [translations.get(key, text) for key, text in zip(keys, texts)]
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _remember(self, key: str, translation: str) -> None:
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        if len(self._memory) > TRANSLATION_MEMORY_CACHE:
+            self._memory.popitem(last=False)
+
+    async def _load(self, keys: list[str]) -> dict[str, str]:
+        try:
+            cursor = self._db.find({"_id": {"$in": keys}})
+            return {doc["_id"]: doc["text"] async for doc in cursor}
+        except PyMongoError as exc:
+            logging.warning(f"[Translator] Failed to load cached translations: {exc}")
+            return {}
+
+    async def _store(self, translations: dict[str, str]) -> None:
+        if not translations:
+            return
+        try:
+            await self._db.bulk_write(
+                [
+                    UpdateOne({"_id": key}, {"$set": {"text": text}}, upsert=True)
+                    for key, text in translations.items()
+                ],
+                ordered=False,
+            )
+        except PyMongoError as exc:
+            logging.warning(f"[Translator] Failed to store translations: {exc}")
+
+    async def _translate_batches(self, texts: dict[str, str]) -> dict[str, str]:
+        keys = list(texts)
+        batches = make_batches(list(texts.values()), TRANSLATION_BATCH_CHARS)
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, self._translate_batch, batch)
+                for batch in batches
+            )
+        )
+        translated = [translation for batch in results for translation in batch]
+        # Failed translations come back as None and aren't cached
+        return {
+            key: translation
+            for key, translation in zip(keys, translated)
+            if translation is not None
+        }
+
+    def _translate_batch(self, batch: list[str]) -> list[str | None]:
+        translator = GoogleTranslator(source=self._source, target=self._target)
+        if len(batch) > 1:
+            try:
+                joined = translator.translate(text=BATCH_SEPARATOR.join(batch))
+                parts = [part.strip() for part in joined.split("|||")]
+                if len(parts) == len(batch):
+                    return parts
+                logging.info("[Translator] Batch got merged, translating one by one.")
+            except TRANSLATION_ERRORS as exc:
+                logging.warning(f"[Translator] Batch translation failed: {exc}")
+
+        results: list[str | None] = []
+        for text in batch:
+            try:
+                results.append(translator.translate(text=text))
+            except TRANSLATION_ERRORS as exc:
+                logging.warning(f"[Translator] Translation failed: {exc}")
+                results.append(None)
+        return results
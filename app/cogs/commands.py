@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import datetime
-import logging
 import os
 import random
 import sys
@@ -9,7 +8,6 @@ import time
 from typing import TYPE_CHECKING, Optional
 from urllib.parse import urlparse
 
-import asyncpraw
 import discord
 import httpx
 import sonolink
@@ -18,6 +16,7 @@ from discord.ext import commands
 from pymongo import AsyncMongoClient
 
 from app.__init__ import __version__
+from app.classes.sfd_graph_cache import SFDGraphCache
 from app.classes.sfd_servers import SFDServers
 from app.config.colors import (
     COLOR_BLUE,
@@ -49,15 +48,6 @@ def iso_to_timestamp(iso_time: str) -> datetime.datetime:
     return timestamp
 
 
-def get_file_age(file_path: str) -> float:
-    """Get the age of a file in seconds."""
-    if os.path.exists(file_path):
-        file_time = os.path.getmtime(file_path)
-        current_time = datetime.datetime.now().timestamp()
-        return current_time - file_time
-    return 0.0
-
-
 def get_memory_usage() -> float:
     """Get the current memory usage of the process in MB."""
     import psutil
@@ -101,8 +91,8 @@ class CommandCog(commands.Cog):
         self._user_mgr: BaseDataManager[UserData] = self._bot.user_data_manager
 
         self._run_time = time.time()
-        self._graphs_dir = os.path.join(os.getcwd(), "graphs")
-        self._sfd_servers = SFDServers(self._bot_config, self._bot.session)
+        self._sfd_servers: SFDServers = self._bot.sfd_servers
+        self._sfd_graph_cache: SFDGraphCache = self._bot.sfd_graph_cache
 
     slash_bot_config = app_commands.Group(
         name="bot_config",
@@ -537,19 +527,17 @@ class CommandCog(commands.Cog):
         """
         await defer_interaction(ctx)
 
-        if graph_range == "Day":
-            filename = f"sfd_activity_day_{timezone}.png"
-            generator = self._sfd_servers.generate_graph_day
-        else:
-            filename = f"sfd_activity_week_{timezone}.png"
-            generator = self._sfd_servers.generate_graph_week
-
-        image_location = os.path.join(self._graphs_dir, filename)
-
-        if not os.path.exists(image_location) or get_file_age(image_location) >= 3600:
-            await generator(timezone)
+        file = await self._sfd_graph_cache.get_file(graph_range, timezone)
+        if file is None:
+            await send(
+                ctx,
+                embed=make_embed(
+                    ":x: Failed to generate graph, try again later.",
+                    color=COLOR_RED,
+                ),
+            )
+            return
 
-        file = discord.File(image_location, filename=filename)
         await send(ctx, files=[file], embed=None)
 
     # -------------------- SFD Hosting -------------------- #
@@ -842,7 +830,7 @@ class CommandCog(commands.Cog):
             repeat_count = integer - 1
 
         for _ in range(repeat_count):
-            await target_channel.send(word)
+            await send(target_channel, word, queued=True)
 
     # -------------------- Database Managment -------------------- #
     @slash_bot_config.command(
@@ -1215,26 +1203,14 @@ class SubredditSelectorView(discord.ui.View):
 
     async def _update_multireddit(self) -> None:
         temp = self._bot.temp_user_data_manager.get(self._user_id)
+        # Queued posts are from the old subreddits
+        temp.reddit.feed = None
         multireddit = temp.reddit.multireddit
         if not multireddit:
             return
-        await multireddit.load()
-        added_subreddits = set()
-
-        for subreddit in multireddit.subreddits:
-            if subreddit.display_name not in self.selected_subreddits:
-                await multireddit.remove(subreddit)
-                continue
-            added_subreddits.add(subreddit.display_name)
-
-        for subreddit in self.selected_subreddits:
-            if subreddit in added_subreddits:
-                continue
-
-            try:
-                await multireddit.add(await self._bot.reddit_agent.subreddit(subreddit))
-            except asyncpraw.exceptions.RedditAPIException:
-                logging.warning(f"[Reddit] Failed to add subreddit `{subreddit}`")
+        await self._bot.temp_user_data_manager.sync_multireddit(
+            multireddit, self.selected_subreddits
+        )
 
 
 class SubredditSelect(discord.ui.Select):
@@ -1,7 +1,7 @@
 import logging
 import random
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING
 
 import asyncpraw.models
 import asyncpraw.reddit
@@ -15,10 +15,11 @@ from asyncprawcore.exceptions import (
 from discord import app_commands
 from discord.ext import commands
 
-from app.config.scraping import API_DAD_JOKE, API_HUMORAPI, API_JOKEAPI
+from app.classes.shitpost_feed import ShitpostFeed
+from app.data.joke_pool import JokeCursor, JokePool
 from app.data.models import TempUserRedditData, UserRedditData
 from app.response_handler import defer_interaction, make_embed, send
-from app.utils import load_text_file, make_http_request
+from app.utils import load_text_file
 
 if TYPE_CHECKING:
     from app.main import KexoBotClient
@@ -74,12 +75,14 @@ class FunCommands(commands.Cog):
         self._temp_user_mgr = self._bot.temp_user_data_manager
         self._temp_guild_mgr = self._bot.temp_guild_data_manager
         self._joke_cache = self._bot.joke_cache_manager
+        self._joke_prefetcher = self._bot.joke_prefetcher
         self._reddit_agent = self._bot.reddit_agent
+        self._subreddit_listings = self._bot.subreddit_listings
         self._session: httpx.AsyncClient = self._bot.session
 
-        self._loaded_jokes: set[str] = self._joke_cache.loaded_jokes
-        self._loaded_dad_jokes: set[str] = self._joke_cache.loaded_dad_jokes
-        self._loaded_yo_mama_jokes: set[str] = self._joke_cache.loaded_yo_mama_jokes
+        self._loaded_jokes: JokePool = self._joke_cache.loaded_jokes
+        self._loaded_dad_jokes: JokePool = self._joke_cache.loaded_dad_jokes
+        self._loaded_yo_mama_jokes: JokePool = self._joke_cache.loaded_yo_mama_jokes
 
         self._topstropscreenshot = load_text_file("topstropscreenshot")
         self._kotrmelce = load_text_file("kotrmelec")
@@ -122,7 +125,7 @@ class FunCommands(commands.Cog):
     async def joke(self, ctx: discord.Interaction) -> None:
         """This command fetches a random joke from the loaded jokes.
 
-        If all jokes have been viewed, it fetches new jokes from the API.
+        The joke pool is refilled in the background when it runs low.
 
         Parameters
         ----------
@@ -130,29 +133,13 @@ class FunCommands(commands.Cog):
             The context of the command.
         """
         temp_guild = self._temp_guild_mgr.get(ctx.guild.id)
-        viewed_count = len(temp_guild.jokes.viewed_jokes)
-        loaded_count = len(self._loaded_jokes)
-
-        if (viewed_count == 0 and loaded_count == 0) or viewed_count == loaded_count:
-            await defer_interaction(ctx)
-            jokes = await self._get_jokes()
-            if not jokes:
-                await send(ctx, code="JOKE_TIMEOUT")
-                return
-
-            self._loaded_jokes.update(jokes)
-
-        joke = None
-        for joke in self._loaded_jokes:
-            if joke in temp_guild.jokes.viewed_jokes:
-                continue
-            break
+        cursor = temp_guild.jokes.viewed_jokes
 
+        joke = await self._pick_joke(ctx, "jokes", self._loaded_jokes, cursor)
         if not joke:
             await send(ctx, code="NO_MORE_JOKES")
             return
 
-        temp_guild.jokes.viewed_jokes.append(joke)
         joke = discord.utils.escape_markdown(joke)
         await send(ctx, joke)
 
@@ -161,7 +148,7 @@ class FunCommands(commands.Cog):
     async def dad_joke(self, ctx: discord.Interaction) -> None:
         """This command fetches a random dad joke from the loaded dad jokes.
 
-        If all dad jokes have been viewed, it fetches new dad jokes from the API.
+        The dad joke pool is refilled in the background when it runs low.
 
         Parameters
         ----------
@@ -169,30 +156,13 @@ class FunCommands(commands.Cog):
             The context of the command.
         """
         temp_guild = self._temp_guild_mgr.get(ctx.guild.id)
-        viewed_count = len(temp_guild.jokes.viewed_dad_jokes)
-        loaded_count = len(self._loaded_dad_jokes)
-
-        if (viewed_count == 0 and loaded_count == 0) or viewed_count == loaded_count:
-            await defer_interaction(ctx)
-            jokes = await self._get_dad_jokes()
-            if not jokes:
-                await send(ctx, code="JOKE_TIMEOUT")
-                return
-
-            self._loaded_dad_jokes.update(jokes)
-
-        joke = None
-        for joke in self._loaded_dad_jokes:
-            if joke in temp_guild.jokes.viewed_dad_jokes:
-                continue
-            break
+        cursor = temp_guild.jokes.viewed_dad_jokes
 
+        joke = await self._pick_joke(ctx, "dad_jokes", self._loaded_dad_jokes, cursor)
         if not joke:
             await send(ctx, code="NO_MORE_JOKES")
             return
 
-        temp_guild.jokes.viewed_dad_jokes.append(joke)
-
         joke = discord.utils.escape_markdown(joke)
         await send(ctx, joke)
 
@@ -213,30 +183,15 @@ class FunCommands(commands.Cog):
             The member to roast.
         """
         temp_guild = self._temp_guild_mgr.get(ctx.guild.id)
-        viewed_count = len(temp_guild.jokes.viewed_yo_mama_jokes)
-        loaded_count = len(self._loaded_yo_mama_jokes)
-
-        if (viewed_count == 0 and loaded_count == 0) or viewed_count == loaded_count:
-            await defer_interaction(ctx)
-            jokes = await self._get_yo_mama_jokes()
-            if not jokes:
-                await send(ctx, code="JOKE_TIMEOUT")
-                return
-
-            self._loaded_yo_mama_jokes.update(jokes)
-
-        joke = None
-        for joke in self._loaded_yo_mama_jokes:
-            if joke in temp_guild.jokes.viewed_yo_mama_jokes:
-                continue
-            break
+        cursor = temp_guild.jokes.viewed_yo_mama_jokes
 
+        joke = await self._pick_joke(
+            ctx, "yo_mama_jokes", self._loaded_yo_mama_jokes, cursor
+        )
         if not joke:
             await send(ctx, code="NO_MORE_JOKES")
             return
 
-        temp_guild.jokes.viewed_yo_mama_jokes.append(joke)
-
         joke = joke[0].lower() + joke[1:] if joke else ""
         joke = discord.utils.escape_markdown(joke)
 
@@ -267,46 +222,54 @@ class FunCommands(commands.Cog):
         """
         user_id = ctx.user.id
         user_reddit, temp_user_reddit = await self._load_user_data(user_id)
-        multireddit = temp_user_reddit.multireddit
-        limit = temp_user_reddit.search_limit
 
-        if not temp_user_reddit.multireddit:
-            await send(ctx, "REDDIT_CANT_LOAD_MULTIREDDIT")
-            return
-
-        multireddit = temp_user_reddit.multireddit
-        limit = temp_user_reddit.search_limit
+        if temp_user_reddit.feed is None:
+            temp_user_reddit.feed = ShitpostFeed(
+                self._subreddit_listings,
+                user_reddit.subreddits,
+                temp_user_reddit.viewed_posts,
+                lambda: self._load_multireddit(user_id),
+            )
 
         try:
-            async for submission in multireddit.hot(limit=limit):
-                if not is_valid_submission(submission, user_reddit, temp_user_reddit):
-                    continue
-
-                is_channel_nsfw = ctx.channel.is_nsfw()
-                if submission.over_18 and not is_channel_nsfw:
-                    await send(
-                        ctx,
-                        embed=make_embed(
-                            ":x: This post is NSFW, use the command in an NSFW channel."
-                        ),
-                    )
-                    return
-
-                if not submission.media:
-                    embed = await self._create_reddit_embed(submission)
-
-                if submission.media:
-                    await post_video(ctx, submission.permalink)
-                # If it has multiple images
-                elif hasattr(submission, "gallery_data"):
-                    await send(ctx, embed=embed)
-                    await send_multiple_images(ctx, submission)
-                else:
-                    embed.set_image(url=submission.url)
-                    await send(ctx, embed=embed)
-
-                self._update_temp_user_data(user_id, submission.permalink)
-                break
+            submission = await temp_user_reddit.feed.next(
+                lambda submission: is_valid_submission(
+                    submission, user_reddit, temp_user_reddit
+                )
+            )
+            if submission is None:
+                await send(
+                    ctx,
+                    embed=make_embed(
+                        ":x: You've seen all current posts, try again later."
+                    ),
+                )
+                return
+
+            is_channel_nsfw = ctx.channel.is_nsfw()
+            if submission.over_18 and not is_channel_nsfw:
+                await send(
+                    ctx,
+                    embed=make_embed(
+                        ":x: This post is NSFW, use the command in an NSFW channel."
+                    ),
+                )
+                return
+
+            if not submission.media:
+                embed = await self._create_reddit_embed(submission)
+
+            if submission.media:
+                await post_video(ctx, submission.permalink)
+            # If it has multiple images
+            elif hasattr(submission, "gallery_data"):
+                await send(ctx, embed=embed)
+                await send_multiple_images(ctx, submission)
+            else:
+                embed.set_image(url=submission.url)
+                await send(ctx, embed=embed)
+
+            self._update_temp_user_data(user_id, submission.permalink)
 
         except (
             AsyncPrawcoreException,
@@ -321,24 +284,47 @@ class FunCommands(commands.Cog):
                 ),
             )
 
-        if len(temp_user_reddit.viewed_posts) >= len(user_reddit.subreddits):
-            temp_user_reddit.search_limit = min(50, temp_user_reddit.search_limit + 1)
+    async def _pick_joke(
+        self,
+        ctx: discord.Interaction,
+        category: str,
+        pool: JokePool,
+        cursor: JokeCursor,
+    ) -> str | None:
+        """Pick a joke the guild hasn't seen, waiting for a refill if there's none."""
+        joke = pool.pick(cursor)
+        self._joke_prefetcher.notify(category, pool.remaining(cursor))
+        if joke or not self._joke_prefetcher.refilling(category):
+            return joke
+
+        # The refill may take longer than an interaction can wait for a reply
+        await defer_interaction(ctx)
+        await self._joke_prefetcher.wait_for_refill(category)
+        return pool.pick(cursor)
 
     async def _load_user_data(self, user_id: int) -> tuple[UserRedditData, TempUserRedditData]:
-        """Load user and temp user data, ensuring multireddit exists."""
+        """Load user and temp user data."""
         user = await self._user_mgr.get(user_id)
         temp = self._temp_user_mgr.get(user_id)
+        return user.reddit, temp.reddit
 
+    async def _load_multireddit(
+        self, user_id: int
+    ) -> asyncpraw.models.Multireddit | None:
+        """Load the user's multireddit, only needed when shared listings fail."""
+        temp = self._temp_user_mgr.get(user_id)
         if temp.reddit.multireddit is None:
             await self._temp_user_mgr.ensure_multireddit(user_id)
-
-        return user.reddit, temp.reddit
+        return temp.reddit.multireddit
 
     def _update_temp_user_data(self, user_id: int, submission_url: str) -> None:
         temp = self._temp_user_mgr.get(user_id)
         temp.reddit.viewed_posts.add(submission_url)
         temp.reddit.last_used = datetime.now()
-        logging.info(f"User {user_id} viewed posts: {temp.reddit.viewed_posts}")
+        logging.debug(
+            f"User {user_id} viewed {len(temp.reddit.viewed_posts)} posts, "
+            f"last: {submission_url}"
+        )
 
     async def _create_reddit_embed(
         self, submission: asyncpraw.reddit.Submission
@@ -357,158 +343,6 @@ class FunCommands(commands.Cog):
         embed.timestamp = datetime.fromtimestamp(submission.created_utc)
         return embed
 
-    async def _get_jokes(self) -> Optional[set[str]]:
-        fetched_jokes: set[str] = set()
-        jokes = await self._get_humor_api_jokes()
-        fetched_jokes.update(jokes)
-
-        jokes = await self._get_joke_api_jokes()
-        fetched_jokes.update(jokes)
-
-        return fetched_jokes
-
-    async def _get_dad_jokes(self) -> Optional[set[str]]:
-        fetched_jokes: set[str] = set()
-        response = await make_http_request(
-            self._session,
-            API_DAD_JOKE,
-            retries=3,
-            headers={"Accept": "application/json"},
-            get_json=True,
-        )
-        if not response:
-            return None
-
-        jokes = response.get("results")
-        if not jokes:
-            return None
-
-        for joke in jokes:
-            joke = joke.get("joke")
-            if joke in self._loaded_dad_jokes:
-                continue
-
-            fetched_jokes.add(joke)
-        return fetched_jokes
-
-    async def _get_yo_mama_jokes(self) -> Optional[set[str]]:
-        token = self._load_humor_api_token()
-        fetched_jokes: set[str] = set()
-        if not token or self._bot.humor_api_tokens[token]["exhausted"]:
-            return None
-
-        response = None
-        for _ in range(len(self._bot.humor_api_tokens)):
-            response = await make_http_request(
-                self._session,
-                API_HUMORAPI + f"yo_mama&api-key={token}&max-length=256",
-                retries=3,
-            )
-            token = self._is_token_exhausted(response, token)
-            if token:
-                break
-            token = self._load_humor_api_token()
-
-        if not response:
-            return None
-
-        jokes = response.json()
-        for joke in jokes.get("jokes", []):
-            text = joke.get("joke")
-            if not text or text in self._loaded_yo_mama_jokes:
-                continue
-
-            fetched_jokes.add(text)
-
-        return fetched_jokes
-
-    async def _get_joke_api_jokes(self) -> set[str]:
-        fetched_jokes: set[str] = set()
-        response = await make_http_request(
-            self._session,
-            API_JOKEAPI,
-            get_json=True,
-        )
-        if not response:
-            return set()
-
-        if response.get("error"):
-            return set()
-
-        jokes = response.get("jokes")
-        if not jokes:
-            return set()
-
-        for joke in jokes:
-            joke_text: str = (
-                f"{joke.get('setup')}\n{joke.get('delivery')}"
-                if joke.get("type") == "twopart"
-                else joke.get("joke")
-            )
-            if not joke_text or joke_text in self._loaded_jokes:
-                continue
-
-            fetched_jokes.add(joke_text)
-
-        return fetched_jokes
-
-    async def _get_humor_api_jokes(self) -> set[str]:
-        fetched_jokes: set[str] = set()
-
-        for joke_type in ["racist", "jewish", "nsfw"]:
-            token = self._load_humor_api_token()
-            if not token or self._bot.humor_api_tokens[token]["exhausted"]:
-                break
-
-            response = None
-            for _ in range(len(self._bot.humor_api_tokens)):
-                response = await make_http_request(
-                    self._session,
-                    API_HUMORAPI + f"{joke_type}&api-key={token}&max-length=256",
-                    retries=3,
-                )
-                token = self._is_token_exhausted(response, token)
-                if token:
-                    break
-                token = self._load_humor_api_token()
-
-            if not response:
-                continue
-
-            jokes = response.json()
-            for joke in jokes.get("jokes", []):
-                text = joke.get("joke")
-                if not text or text in self._loaded_jokes:
-                    continue
-
-                fetched_jokes.add(text)
-
-        return fetched_jokes
-
-    def _load_humor_api_token(self) -> Optional[str]:
-        for token in self._bot.humor_api_tokens:
-            if self._bot.humor_api_tokens[token].get("exhausted"):
-                continue
-            return token
-        return None
-
-    def _is_token_exhausted(
-        self, response: Optional[httpx.Response], token: Optional[str]
-    ) -> Optional[str]:
-        if not token:
-            return None
-
-        if not response:
-            self._bot.humor_api_tokens[token]["exhausted"] = True
-            return None
-
-        quota_left = response.headers.get("x-api-quota-left")
-        if quota_left == "0":
-            self._bot.humor_api_tokens[token]["exhausted"] = True
-            return None
-
-        return token
-
 
 async def setup(bot: "KexoBotClient"):
     """This function sets up the FunCommands cog."""
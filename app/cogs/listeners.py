@@ -136,6 +136,7 @@ class Listeners(commands.Cog):
             await send(
                 player.text_channel,
                 embed=make_now_playing_embed(player.current),
+                queued=True,
             )
 
         if player.autoplay != sonolink.AutoPlayMode.ENABLED:
@@ -147,7 +148,7 @@ class Listeners(commands.Cog):
                 formatted_tip = tip.format(
                     node_count=self._bot.state.get_available_nodes()
                 )
-                await player.text_channel.send(formatted_tip)
+                await send(player.text_channel, formatted_tip, queued=True)
 
     @commands.Cog.listener()
     async def on_sonolink_websocket_closed(
@@ -3,6 +3,7 @@ import datetime
 import logging
 import random
 import re
+import time
 from typing import TYPE_CHECKING, Optional, Union
 
 import discord
@@ -22,11 +23,15 @@ from app.config.music import (
     API_RADIOGARDEN_PLACES,
     API_RADIOGARDEN_SEARCH,
     MUSIC_SOURCES,
+    RADIOGARDEN_PLACES_TTL,
 )
 from app.decorators import is_joined, is_playing, is_queue_empty
+from app.metrics import LAVALINK_OPERATION_DURATION
 from app.response_handler import defer_interaction, make_embed, send
 from app.utils import (
+    NOT_MODIFIED,
     EmbedPaginator,
+    HttpValidatorCache,
     find_track,
     fix_audio_title,
     get_track_requester_avatar,
@@ -167,6 +172,8 @@ class MusicCommands(commands.Cog):
         self._bot = bot
         self._session = self._bot.session
         self._radiomap_cache: list[str] = []
+        self._radiomap_checked_at = 0.0
+        self._validators = HttpValidatorCache()
 
     music = app_commands.Group(name="music", description="All music commands")
     radio = app_commands.Group(name="radio", description="All radio commands")
@@ -860,10 +867,11 @@ class MusicCommands(commands.Cog):
 
         for i in range(2):
             try:
-                tracks: sl_models.SearchResult = await asyncio.wait_for(
-                    self._bot.sonolink_client.search_track(search, source=source),
-                    timeout=5,
-                )
+                with LAVALINK_OPERATION_DURATION.time("search"):
+                    tracks: sl_models.SearchResult = await asyncio.wait_for(
+                        self._bot.sonolink_client.search_track(search, source=source),
+                        timeout=5,
+                    )
                 if not tracks.is_error() and not tracks.is_empty() and tracks.result:
                     return tracks
 
@@ -1191,15 +1199,27 @@ class MusicCommands(commands.Cog):
         return embed
 
     async def _get_radiomap_data(self) -> list[str]:
-        """Get radio map data with caching."""
-        if self._radiomap_cache:
+        """Get radio map data with caching.
+
+        The cached list is revalidated with a conditional request once it is
+        older than ``RADIOGARDEN_PLACES_TTL``.
+        """
+        now = time.monotonic()
+        if (
+            self._radiomap_cache
+            and now - self._radiomap_checked_at < RADIOGARDEN_PLACES_TTL
+        ):
             return self._radiomap_cache
 
         response = await make_http_request(
             self._session,
             API_RADIOGARDEN_PLACES,
             headers={"accept": "application/json"},
+            validators=self._validators,
         )
+        if response is NOT_MODIFIED:
+            self._radiomap_checked_at = now
+            return self._radiomap_cache
         if not response:
             return self._radiomap_cache
 
@@ -1211,6 +1231,8 @@ class MusicCommands(commands.Cog):
                 if "url" in item
             ]
             self._radiomap_cache = place_ids
+            self._radiomap_checked_at = now
+            self._validators.commit(API_RADIOGARDEN_PLACES)
             return place_ids
         return []
 
@@ -11,3 +11,19 @@ ICON_YOUTUBE = "https://freelogopng.com/images/all_img/1656501968youtube-icon-pn
 ICON_DISCORD = (
     "https://img.icons8.com/?size=100&id=M725CLW4L7wE&format=png&color=000000"
 )
+
+############################ Message Dispatch ############################
+# Messages a channel accepts per rate-limit window (Discord allows 5 per 5s)
+MESSAGE_RATE_LIMIT = 5
+# Length of the per-channel rate-limit window in seconds
+MESSAGE_RATE_PERIOD = 5.0
+# Seconds to wait for more embeds to merge before sending a queued message
+MESSAGE_COALESCE_DELAY = 0.5
+# Most embeds Discord accepts in a single message
+MESSAGE_MAX_EMBEDS = 10
+# Most characters Discord accepts across all embeds of a message
+MESSAGE_MAX_EMBED_CHARS = 6000
+
+############################ Responses ############################
+# Embeds kept per dynamic response builder, keyed by the builder arguments
+RESPONSE_CACHE_SIZE = 128
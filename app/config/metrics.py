@@ -0,0 +1,17 @@
+"""Metrics endpoint configuration."""
+
+import os
+
+############################ Metrics Endpoint ############################
+# Local port the Prometheus metrics are served on, 0 disables the endpoint
+ENV_METRICS_PORT = int(os.getenv("METRICS_PORT", "9100"))
+# Only scrapers on the same machine may read the metrics
+METRICS_HOST = "127.0.0.1"
+# Seconds between two event-loop lag measurements
+EVENT_LOOP_LAG_INTERVAL = 0.5
+
+############################ Histogram Buckets ############################
+# Upper bounds in seconds of the duration histogram buckets
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Upper bounds in seconds of the event-loop lag histogram buckets
+EVENT_LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
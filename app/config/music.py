@@ -8,6 +8,8 @@ API_RADIOGARDEN_PLACES = "https://radio.garden/api/ara/content/places"
 API_RADIOGARDEN_PAGE = "https://radio.garden/api/ara/content/page/"
 API_RADIOGARDEN_SEARCH = "https://radio.garden/api/search?q="
 API_RADIOGARDEN_LISTEN = "https://radio.garden/api/ara/content/listen/"
+# Seconds before the cached places list is revalidated
+RADIOGARDEN_PLACES_TTL = 6 * 3600
 
 ############################# Music Sources ############################
 MUSIC_SOURCES = [
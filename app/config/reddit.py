@@ -8,6 +8,8 @@ ENV_REDDIT_SECRET = os.getenv("REDDIT_SECRET")
 ENV_REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
 ENV_REDDIT_USERNAME = os.getenv("REDDIT_USERNAME")
 ENV_REDDIT_PASSWORD = os.getenv("REDDIT_PASSWORD")
+# Receive CrackWatch and FreeGameFindings submissions by streaming
+ENV_REDDIT_STREAMING = os.getenv("REDDIT_STREAMING", "").lower() in {"1", "true"}
 
 ############################# Icons ############################
 ICON_REDDIT = "https://www.pngkit.com/png/full/207-2074270_reddit-icon-png.png"
@@ -35,10 +37,30 @@ SHITPOST_SUBREDDITS_ALL = (
     "clamworks",
 )
 
+############################# Shitpost ############################
+# Submissions kept of each subreddit's shared hot listing
+SHITPOST_LISTING_SIZE = 50
+# Seconds after which a shared listing is refreshed in the background
+SHITPOST_LISTING_TTL = 10 * 60
+# Submissions fetched per page of a user's multireddit, used as fallback
+SHITPOST_PAGE_SIZE = 25
+# Queued submissions below which the next page is fetched in the background
+SHITPOST_LOW_WATERMARK = 5
+# Viewed posts remembered per user, the oldest are forgotten first. Enough
+# for every post of the shared listings, so none is served twice
+SHITPOST_VIEWED_POSTS = SHITPOST_LISTING_SIZE * len(SHITPOST_SUBREDDITS_ALL)
+
 ############################# Scraping ############################
 REDDIT_TO_REMOVE = (" *", "* ", "*", "---")
-REDDIT_FREEGAMEFINDINGS_MAX_RESULTS = 5
-REDDIT_CRACKWATCH_MAX_RESULTS = 5
+# Subreddits fetched together in a single listing request
+REDDIT_POLL_SUBREDDITS = "CrackWatch+FreeGameFindings"
+REDDIT_POLL_MAX_RESULTS = 10
+# Empty polls after which the ``before`` anchor is dropped, in case the
+# anchored submission was removed
+REDDIT_POLL_ANCHOR_RESET = 10
+# Seconds to wait before restarting a failed stream, doubled on every failure
+REDDIT_STREAM_BACKOFF_MIN = 5
+REDDIT_STREAM_BACKOFF_MAX = 300
 CRACKWATCH_HIGHLIGHT_KEYWORDS = ["denuvo removed", "voices38"]
 
 ############################# Default Embeds ############################
@@ -1,5 +1,20 @@
 """Scraping and content-monitoring configuration."""
 
+############################# HTTP ############################
+# Maximum number of concurrent requests to a single host
+HOST_CONCURRENCY = 4
+
+############################# Cloudscraper ############################
+CLOUDSCRAPER_WORKERS = 2
+# Seconds before a request, including challenge solving, is abandoned
+CLOUDSCRAPER_TIMEOUT = 30
+
+############################# Dedup ############################
+# Items remembered by each scraper's long-term history, a Bloom filter of
+# about 90 KB with these values
+POSTED_HISTORY_CAPACITY = 50_000
+POSTED_HISTORY_ERROR_RATE = 0.001
+
 ############################# Game3rb ############################
 SITE_URL_GAME3RB = "https://game3rb.com/category/games-online/"
 GAME3RB_TO_REMOVE = (
@@ -28,6 +43,14 @@ GAME3RB_TO_REMOVE = (
     ")",
 )
 ICON_GAME3RB = "https://files.catbox.moe/oj3jso.png"
+GAME3RB_MAX_ARTICLES = 16
+
+############################# Translation ############################
+TRANSLATION_WORKERS = 2
+# Google Translate accepts at most 5000 characters per request
+TRANSLATION_BATCH_CHARS = 4500
+# Number of translations kept in memory on top of the MongoDB cache
+TRANSLATION_MEMORY_CACHE = 256
 
 ############################# Online-Fix ############################
 ONLINEFIX_MAX_RESULTS = 10
@@ -45,6 +68,14 @@ ALIENWAREARENA_TO_REMOVE = ("Key", "Giveaway", "Steam Game")
 API_JOKEAPI = "https://v2.jokeapi.dev/joke/Miscellaneous,Dark?amount=10"
 API_HUMORAPI = "https://api.humorapi.com/jokes/search?number=10&include-tags="
 API_DAD_JOKE = "https://icanhazdadjoke.com/search?limit=10"
+# Seconds a HumorAPI key isn't used after a failed request
+HUMORAPI_FAILURE_COOLDOWN = 3600
+# Unseen jokes left for a guild below which the pool is refilled
+JOKE_LOW_WATERMARK = 5
+# Newest jokes of each pool stored in MongoDB
+JOKE_POOL_PERSISTED = 1000
+# Seconds a joke command waits for a running refill of an empty pool
+JOKE_REFILL_WAIT = 10
 
 ############################# Lavalink ############################
 API_LAVALIST = "https://lavalink-list.ajieblogs.eu.org/All"
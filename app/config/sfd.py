@@ -28,3 +28,11 @@ SFD_HEADERS = {
     "Content-Type": "application/soap+xml; charset=utf-8",
     "SOAPAction": "https://mythologicinteractive.com/Games/SFD/GetGameServers",
 }
+
+############################# SFD Graphs ############################
+GRAPH_DPI = 300
+GRAPH_RENDER_WORKERS = 1
+GRAPH_RENDER_MAX_QUEUE = 4
+GRAPH_RENDER_TIMEOUT = 60
+GRAPH_CACHE_MAX_AGE = 3600
+SFD_GRAPH_RANGES = ("Day", "Week")
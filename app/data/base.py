@@ -7,6 +7,8 @@ from typing import Any, Generic, TypeVar, cast
 
 from pymongo.asynchronous.collection import AsyncCollection
 
+from app.metrics import MONGO_OPERATION_DURATION
+
 T = TypeVar("T")
 
 
@@ -54,7 +56,8 @@ class BaseDataManager(Generic[T]):
         if cached is not None:
             return cached
 
-        raw = await self._db.find_one({"_id": _id})
+        with MONGO_OPERATION_DURATION.time(self._db.name, "find_one"):
+            raw = await self._db.find_one({"_id": _id})
         if raw is not None:
             raw.pop("_id", None)  # pyright: ignore[reportAny]
             instance: T = self._data_class(**cast(dict[str, Any], raw))
@@ -65,9 +68,10 @@ class BaseDataManager(Generic[T]):
                 self._data_class.__name__,
                 _id,
             )
-            await self._db.insert_one(
-                cast(dict[str, Any], {"_id": _id, **cast(Any, instance.to_dict())})  # pyright: ignore[reportUnknownMemberType]
-            )
+            with MONGO_OPERATION_DURATION.time(self._db.name, "insert_one"):
+                await self._db.insert_one(
+                    cast(dict[str, Any], {"_id": _id, **cast(Any, instance.to_dict())})  # pyright: ignore[reportUnknownMemberType]
+                )
 
         self._cache[_id] = instance
         return instance
@@ -83,8 +87,9 @@ class BaseDataManager(Generic[T]):
             The data instance to persist.
         """
         self._cache[_id] = data
-        await self._db.update_one(
-            {"_id": _id},
-            {"$set": cast(Any, data.to_dict())},  # pyright: ignore[reportUnknownMemberType]
-            upsert=True,
-        )
+        with MONGO_OPERATION_DURATION.time(self._db.name, "update_one"):
+            await self._db.update_one(
+                {"_id": _id},
+                {"$set": cast(Any, data.to_dict())},  # pyright: ignore[reportUnknownMemberType]
+                upsert=True,
+            )
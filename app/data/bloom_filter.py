@@ -0,0 +1,117 @@
+"""Compact probabilistic set remembering every item ever posted by a scraper.
+
+``SeenSet`` only keeps the most recent items, so an old post resurfacing
+after it was evicted would be posted again. A Bloom filter answers "was this
+ever seen?" for a fixed number of bits per item, with a small, configurable
+chance of false positives and no false negatives.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Any
+
+
+class BloomFilter:
+    """Bloom filter over strings, serializable to a MongoDB document.
+
+    Parameters
+    ----------
+    capacity: int
+        Number of items after which the error rate is no longer guaranteed.
+    error_rate: float
+        Wanted probability of a false positive at full capacity.
+    """
+
+    __slots__ = ("_bits", "count", "hashes", "size", "version")
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size: int = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes: int = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count: int = 0
+        # Incremented on every change, used for dirty-checking
+        self.version: int = 0
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, str):
+            return False
+        return all(
+            self._bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(item)
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"BloomFilter({self.count} items, {len(self._bits)} bytes)"
+
+    def add(self, item: str) -> bool:
+        """Add an item to the filter.
+
+        Parameters
+        ----------
+        item: str
+            The item to add.
+
+        Returns
+        -------
+        bool
+            True if the item was (probably) not in the filter yet.
+        """
+        added = False
+        for index in self._indexes(item):
+            mask = 1 << (index & 7)
+            if not self._bits[index >> 3] & mask:
+                self._bits[index >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+            self.version += 1
+        return added
+
+    def to_document(self) -> dict[str, Any]:
+        """Serialize the filter, see :meth:`from_document`."""
+        return {
+            "size": self.size,
+            "hashes": self.hashes,
+            "count": self.count,
+            "bits": bytes(self._bits),
+        }
+
+    @classmethod
+    def from_document(
+        cls, document: Any, capacity: int, error_rate: float
+    ) -> BloomFilter:
+        """Load a filter saved by :meth:`to_document`.
+
+        An empty filter is returned if the document is missing or was made
+        with other parameters, since its bits can't be reused.
+
+        Parameters
+        ----------
+        document: Any
+            The stored document.
+        capacity: int
+            Wanted capacity, see :class:`BloomFilter`.
+        error_rate: float
+            Wanted error rate, see :class:`BloomFilter`.
+        """
+        bloom = cls(capacity, error_rate)
+        if (
+            isinstance(document, dict)
+            and document.get("size") == bloom.size
+            and document.get("hashes") == bloom.hashes
+            and len(document.get("bits", b"")) == len(bloom._bits)
+        ):
+            bloom._bits[:] = document["bits"]
+            bloom.count = document.get("count", 0)
+        return bloom
+
+    def _indexes(self, item: str) -> list[int]:
+        # Double hashing, every index derived from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
@@ -13,6 +13,11 @@ from typing import Any, TypedDict
 
 from pymongo.asynchronous.collection import AsyncCollection
 
+from app.config.scraping import POSTED_HISTORY_CAPACITY, POSTED_HISTORY_ERROR_RATE
+from app.data.bloom_filter import BloomFilter
+from app.data.seen_set import SeenSet
+from app.metrics import MONGO_OPERATION_DURATION
+
 
 class NodeCacheEntry(TypedDict):
     """Cached data for a Lavalink node."""
@@ -46,6 +51,7 @@ class BotConfigManager:
         self._default_factory: Callable[[], Any] = default_factory
         self._cache: dict[str, Any] = {}
         self._snapshot: dict[str, Any] = {}
+        self._history_keys: dict[str, str] = {}
 
     async def get(self, key: str, query: dict[str, Any]) -> Any:  # pyright: ignore[reportAny]
         """Get cached data by key, loading from MongoDB if needed.
@@ -65,7 +71,8 @@ class BotConfigManager:
         if key in self._cache:
             return self._cache[key]  # pyright: ignore[reportAny]
 
-        doc = await self._db.find_one(query)
+        with MONGO_OPERATION_DURATION.time(self._db.name, "find_one"):
+            doc = await self._db.find_one(query)
         if doc is not None and key in doc:
             data: Any = doc[key]  # pyright: ignore[reportAny]
         else:
@@ -75,6 +82,63 @@ class BotConfigManager:
         self._snapshot[key] = copy.deepcopy(data)  # pyright: ignore[reportAny]
         return data  # pyright: ignore[reportAny]
 
+    async def get_seen_set(
+        self, key: str, query: dict[str, Any], history_key: str | None = None
+    ) -> SeenSet:
+        """Get a list stored in MongoDB as a :class:`SeenSet`.
+
+        Changes are detected by the set's version instead of deep copies,
+        and it's saved back as a plain list.
+
+        Parameters
+        ----------
+        key: str
+            Cache key (e.g., ``"game3rb_cache"``).
+        query: dict
+            MongoDB query to fetch the document if not cached.
+        history_key: str | None
+            Cache key of a :class:`BloomFilter` kept as the set's long-term
+            history. It's saved together with the set.
+
+        Returns
+        -------
+        SeenSet
+            The cached set for the specified key.
+        """
+        cached = self._cache.get(key)
+        if isinstance(cached, SeenSet):
+            return cached
+
+        items = await self.get(key, query)
+        history = None
+        if history_key is not None:
+            history = await self._get_bloom_filter(history_key, query)
+            self._history_keys[key] = history_key
+            if not history:
+                # New filter, start with what the recent items already know
+                for item in items:
+                    history.add(item)
+
+        seen = SeenSet(items, history=history)
+        self._cache[key] = seen
+        self._snapshot[key] = seen.version
+        return seen
+
+    async def _get_bloom_filter(self, key: str, query: dict[str, Any]) -> BloomFilter:
+        cached = self._cache.get(key)
+        if isinstance(cached, BloomFilter):
+            return cached
+
+        bloom = BloomFilter.from_document(
+            await self.get(key, query),
+            POSTED_HISTORY_CAPACITY,
+            POSTED_HISTORY_ERROR_RATE,
+        )
+        self._cache[key] = bloom
+        # Snapshot of a loaded filter, so a new one is saved once it's filled
+        self._snapshot[key] = bloom.version if bloom else None
+        return bloom
+
     def get_cached(self, key: str) -> Any | None:
         """Get data from cache only, without hitting the database.
 
@@ -90,6 +154,20 @@ class BotConfigManager:
         """
         return self._cache.get(key)
 
+    def set(self, key: str, value: Any) -> None:
+        """Replace the cached data for a key.
+
+        The change is persisted on the next ``save()`` of that key.
+
+        Parameters
+        ----------
+        key: str
+            Cache key.
+        value: Any
+            The new data.
+        """
+        self._cache[key] = value
+
     async def save(self, key: str, query: dict[str, Any]) -> None:
         """Persist data to MongoDB only if it has changed.
 
@@ -107,16 +185,33 @@ class BotConfigManager:
         if current is None:
             return
 
+        if isinstance(current, SeenSet | BloomFilter):
+            history_key = self._history_keys.get(key)
+            if history_key is not None:
+                await self.save(history_key, query)
+            if current.version == self._snapshot.get(key):
+                return
+            value = (
+                current.to_list()
+                if isinstance(current, SeenSet)
+                else current.to_document()
+            )
+            with MONGO_OPERATION_DURATION.time(self._db.name, "update_one"):
+                await self._db.update_one(query, {"$set": {key: value}}, upsert=True)
+            self._snapshot[key] = current.version
+            return
+
         # Deep copy current state for comparison (handles in-place modifications)
         current_snapshot = copy.deepcopy(current)  # pyright: ignore[reportAny]
         if current_snapshot == self._snapshot.get(key):
             return  # No changes, skip DB write
 
-        await self._db.update_one(
-            query,
-            {"$set": {key: current}},
-            upsert=True,
-        )
+        with MONGO_OPERATION_DURATION.time(self._db.name, "update_one"):
+            await self._db.update_one(
+                query,
+                {"$set": {key: current}},
+                upsert=True,
+            )
         self._snapshot[key] = current_snapshot
 
     async def save_all(self, query: dict[str, Any]) -> None:
@@ -140,3 +235,6 @@ class BotConfigManager:
         """
         self._cache.pop(key, None)
         self._snapshot.pop(key, None)
+        history_key = self._history_keys.pop(key, None)
+        if history_key is not None:
+            self.invalidate(history_key)
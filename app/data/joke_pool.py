@@ -0,0 +1,138 @@
+"""Shared joke storage with cheap random, unseen-joke selection per guild.
+
+Jokes are stored once in a list shared by all guilds. Each guild only keeps
+a :class:`JokeCursor`, a shuffled permutation of joke indexes that's built
+incrementally (Fisher-Yates), so picking a random joke the guild hasn't seen
+yet is O(1) and costs 4 bytes per seen joke.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Iterable
+
+
+class JokeCursor:
+    """Position of a guild in the shuffled order of a :class:`JokePool`.
+
+    Parameters
+    ----------
+    seen: Iterable[int]
+        Indexes of jokes the guild has already seen.
+    """
+
+    __slots__ = ("_order", "_position", "_restored", "_size", "generation")
+
+    def __init__(self, seen: Iterable[int] = ()) -> None:
+        # Seen indexes first, then the remaining ones in no particular order
+        self._order: array[int] = array("I", seen)
+        self._position: int = len(self._order)
+        # Number of pool indexes already placed in the order
+        self._size: int = 0
+        # Restored seen indexes, not to be placed in the order again
+        self._restored: set[int] = set(self._order)
+        self.generation: int = 0
+
+    def __len__(self) -> int:
+        return self._position
+
+    def seen(self) -> list[int]:
+        """Get the indexes of the seen jokes, in the order they were picked."""
+        return self._order[: self._position].tolist()
+
+    def _sync(self, size: int, generation: int) -> None:
+        if generation != self.generation:
+            # The pool was cleared, its indexes now point to other jokes
+            self._order = array("I")
+            self._position = 0
+            self._size = 0
+            self._restored.clear()
+            self.generation = generation
+        if self._size < size:
+            if self._restored:
+                new = (i for i in range(self._size, size) if i not in self._restored)
+            else:
+                new = range(self._size, size)
+            self._order.extend(new)
+            self._size = size
+
+    def _pick(self) -> int | None:
+        if self._position == len(self._order):
+            return None
+        # One step of Fisher-Yates shuffle
+        swap = random.randrange(self._position, len(self._order))
+        order = self._order
+        order[self._position], order[swap] = order[swap], order[self._position]
+        self._position += 1
+        return order[self._position - 1]
+
+
+class JokePool:
+    """Jokes of one kind, shared by all guilds."""
+
+    def __init__(self) -> None:
+        self._jokes: list[str] = []
+        self._indexes: dict[str, int] = {}
+        # Incremented on clear, so cursors know to start over
+        self._generation: int = 0
+
+    def __contains__(self, joke: object) -> bool:
+        return joke in self._indexes
+
+    def __len__(self) -> int:
+        return len(self._jokes)
+
+    def add_many(self, jokes: Iterable[str]) -> int:
+        """Add jokes that aren't in the pool yet.
+
+        Parameters
+        ----------
+        jokes: Iterable[str]
+            The jokes to add.
+
+        Returns
+        -------
+        int
+            Number of jokes added.
+        """
+        added = 0
+        for joke in jokes:
+            if joke in self._indexes:
+                continue
+            self._indexes[joke] = len(self._jokes)
+            self._jokes.append(joke)
+            added += 1
+        return added
+
+    def to_list(self) -> list[str]:
+        """Get the jokes, oldest first."""
+        return list(self._jokes)
+
+    def remaining(self, cursor: JokeCursor) -> int:
+        """Get the number of jokes the cursor hasn't seen yet."""
+        cursor._sync(len(self._jokes), self._generation)
+        return len(self._jokes) - len(cursor)
+
+    def pick(self, cursor: JokeCursor) -> str | None:
+        """Pick a random joke the cursor hasn't seen yet and mark it seen.
+
+        Parameters
+        ----------
+        cursor: :class:`JokeCursor`
+            The guild's cursor.
+
+        Returns
+        -------
+        str | None
+            The joke, or None if the cursor has seen all of them.
+        """
+        cursor._sync(len(self._jokes), self._generation)
+        index = cursor._pick()
+        return None if index is None else self._jokes[index]
+
+    def clear(self) -> None:
+        """Remove all jokes, resetting every cursor on its next use."""
+        self._jokes.clear()
+        self._indexes.clear()
+        self._generation += 1
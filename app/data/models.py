@@ -4,11 +4,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import asyncpraw.models
 
-from app.config.reddit import SHITPOST_SUBREDDITS_DEFAULT
+from app.config.reddit import SHITPOST_SUBREDDITS_DEFAULT, SHITPOST_VIEWED_POSTS
+from app.data.joke_pool import JokeCursor
+from app.data.seen_set import SeenSet
+
+if TYPE_CHECKING:
+    from app.classes.shitpost_feed import ShitpostFeed
 
 ############################ Persistent Data ############################
 
@@ -89,15 +94,15 @@ class GuildData:
 class GuildJokesData:
     """Temporary joke-tracking per guild."""
 
-    viewed_jokes: list[str] = field(default_factory=list)
-    viewed_dad_jokes: list[str] = field(default_factory=list)
-    viewed_yo_mama_jokes: list[str] = field(default_factory=list)
+    viewed_jokes: JokeCursor = field(default_factory=JokeCursor)
+    viewed_dad_jokes: JokeCursor = field(default_factory=JokeCursor)
+    viewed_yo_mama_jokes: JokeCursor = field(default_factory=JokeCursor)
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            "viewed_jokes": self.viewed_jokes,
-            "viewed_dad_jokes": self.viewed_dad_jokes,
-            "viewed_yo_mama_jokes": self.viewed_yo_mama_jokes,
+            "viewed_jokes": self.viewed_jokes.seen(),
+            "viewed_dad_jokes": self.viewed_dad_jokes.seen(),
+            "viewed_yo_mama_jokes": self.viewed_yo_mama_jokes.seen(),
         }
 
 
@@ -111,12 +116,14 @@ class TempGuildData:
         if isinstance(self.jokes, dict):
             jokes_dict = cast(dict[str, Any], self.jokes)
             self.jokes = GuildJokesData(
-                viewed_jokes=cast(list[str], jokes_dict.get("viewed_jokes", [])),
-                viewed_dad_jokes=cast(
-                    list[str], jokes_dict.get("viewed_dad_jokes", [])
+                viewed_jokes=JokeCursor(
+                    cast(list[int], jokes_dict.get("viewed_jokes", []))
+                ),
+                viewed_dad_jokes=JokeCursor(
+                    cast(list[int], jokes_dict.get("viewed_dad_jokes", []))
                 ),
-                viewed_yo_mama_jokes=cast(
-                    list[str], jokes_dict.get("viewed_yo_mama_jokes", [])
+                viewed_yo_mama_jokes=JokeCursor(
+                    cast(list[int], jokes_dict.get("viewed_yo_mama_jokes", []))
                 ),
             )
 
@@ -128,15 +135,17 @@ class TempGuildData:
 class TempUserRedditData:
     """Ephemeral Reddit session data per user."""
 
-    viewed_posts: set[str] = field(default_factory=set)
-    search_limit: int = 3
-    last_used: datetime | None = None
+    viewed_posts: SeenSet = field(
+        default_factory=lambda: SeenSet(capacity=SHITPOST_VIEWED_POSTS)
+    )
+    # Set on creation, so a session that didn't fetch a post yet isn't stale
+    last_used: datetime = field(default_factory=datetime.now)
     multireddit: object | None = None
+    feed: ShitpostFeed | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return {
             "viewed_posts": list(self.viewed_posts),
-            "search_limit": self.search_limit,
             "last_used": self.last_used,
             "multireddit": self.multireddit,
         }
@@ -152,18 +161,13 @@ class TempUserData:
         if isinstance(self.reddit, dict):
             # Reconstruct from dict — handle set serialization
             reddit_dict = cast(dict[str, Any], self.reddit)
-            viewed_raw = cast(
-                list[str] | set[str], reddit_dict.get("viewed_posts", set())
-            )
-            if isinstance(viewed_raw, list):
-                viewed: set[str] = set(viewed_raw)
-            else:
-                viewed = viewed_raw
+            viewed_raw = cast(list[str] | set[str], reddit_dict.get("viewed_posts", []))
 
             self.reddit = TempUserRedditData(
-                viewed_posts=viewed,
-                search_limit=cast(int, reddit_dict.get("search_limit", 3)),
-                last_used=cast(datetime | None, reddit_dict.get("last_used")),
+                viewed_posts=SeenSet(viewed_raw, capacity=SHITPOST_VIEWED_POSTS),
+                last_used=cast(
+                    datetime, reddit_dict.get("last_used") or datetime.now()
+                ),
                 multireddit=cast(
                     asyncpraw.models.Multireddit | None, reddit_dict.get("multireddit")
                 ),
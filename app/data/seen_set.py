@@ -0,0 +1,127 @@
+"""Bounded, insertion-ordered set used to remember already posted items.
+
+Scraper caches used to be plain lists kept at a fixed length with
+``pop(0)`` and ``append``, which makes both membership tests and updates
+O(n). ``SeenSet`` keeps the same oldest-first order, and the same list shape
+in MongoDB, with O(1) lookups and updates.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from urllib.parse import urlparse
+
+from app.data.bloom_filter import BloomFilter
+
+DEFAULT_CAPACITY = 100
+
+
+def url_path(url: str) -> str:
+    """Get the path of a URL without the trailing slash, used as lookup key."""
+    return urlparse(url).path.rstrip("/")
+
+
+class SeenSet:
+    """Bounded set of seen keys that forgets the oldest key when full.
+
+    Parameters
+    ----------
+    items: Iterable[str]
+        Initial keys, oldest first.
+    capacity: int | None
+        Maximum number of keys. Defaults to the number of initial keys, so a
+        cache loaded from MongoDB keeps its size, or ``DEFAULT_CAPACITY``
+        if there are none.
+    history: :class:`BloomFilter` | None
+        Long-term history of every key ever added. Evicted keys are still
+        reported as seen while they're in it.
+    """
+
+    __slots__ = ("_items", "_paths", "capacity", "history", "version")
+
+    def __init__(
+        self,
+        items: Iterable[str] = (),
+        capacity: int | None = None,
+        history: BloomFilter | None = None,
+    ) -> None:
+        self._items: dict[str, None] = dict.fromkeys(items)
+        self._paths: dict[str, int] | None = None
+        self.history: BloomFilter | None = history
+        self.capacity: int = capacity or len(self._items) or DEFAULT_CAPACITY
+        # Incremented on every change, used for dirty-checking
+        self.version: int = 0
+        while len(self._items) > self.capacity:
+            self._evict()
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._items:
+            return True
+        return self.history is not None and key in self.history
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"SeenSet({len(self._items)}/{self.capacity})"
+
+    def add(self, key: str) -> bool:
+        """Remember a key, forgetting the oldest one if the set is full.
+
+        Parameters
+        ----------
+        key: str
+            The key to add.
+
+        Returns
+        -------
+        bool
+            True if the key wasn't among the recent keys.
+        """
+        if self.history is not None:
+            self.history.add(key)
+        if key in self._items:
+            return False
+
+        self._items[key] = None
+        if self._paths is not None:
+            path = url_path(key)
+            self._paths[path] = self._paths.get(path, 0) + 1
+        if len(self._items) > self.capacity:
+            self._evict()
+        self.version += 1
+        return True
+
+    def has_path(self, path: str) -> bool:
+        """Check whether a URL with the given path was seen, on any host.
+
+        The path index is built on first use and kept up to date afterwards.
+
+        Parameters
+        ----------
+        path: str
+            The URL path, see :func:`url_path`.
+        """
+        if self._paths is None:
+            self._paths = {}
+            for key in self._items:
+                key_path = url_path(key)
+                self._paths[key_path] = self._paths.get(key_path, 0) + 1
+        return path.rstrip("/") in self._paths
+
+    def to_list(self) -> list[str]:
+        """Get the keys oldest first, as stored in MongoDB."""
+        return list(self._items)
+
+    def _evict(self) -> None:
+        oldest = next(iter(self._items))
+        del self._items[oldest]
+        if self._paths is not None:
+            path = url_path(oldest)
+            if self._paths[path] == 1:
+                del self._paths[path]
+            else:
+                self._paths[path] -= 1
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from app.data.joke_pool import JokePool
 from app.data.models import TempGuildData
 
 
@@ -9,9 +10,9 @@ class JokeCacheManager:
     """Manages global joke caches (shared across all guilds)."""
 
     def __init__(self) -> None:
-        self.loaded_jokes: set[str] = set()
-        self.loaded_dad_jokes: set[str] = set()
-        self.loaded_yo_mama_jokes: set[str] = set()
+        self.loaded_jokes = JokePool()
+        self.loaded_dad_jokes = JokePool()
+        self.loaded_yo_mama_jokes = JokePool()
 
     def clear_all(self) -> None:
         """Clear all in-memory joke caches."""
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol, cast, runtime_checkable
 
@@ -13,13 +15,34 @@ import asyncprawcore.exceptions
 from app.data.models import TempUserData, UserData
 
 
-@runtime_checkable
-class _RedditAgent(Protocol):
-    async def multireddit(
-        self, name: str, redditor: str
+class _LocalSubreddit(Protocol):
+    display_name: str
+
+
+class _LocalMultireddit(Protocol):
+    subreddits: list[_LocalSubreddit]
+
+    async def load(self) -> None: ...
+
+    async def update(self, *, subreddits: list[str]) -> None: ...
+
+
+class _MultiredditHelper(Protocol):
+    async def __call__(
+        self, *, name: str, redditor: str
     ) -> object:  # pragma: no cover - protocol
         ...
 
+    async def create(
+        self, *, display_name: str, subreddits: list[str]
+    ) -> object:  # pragma: no cover - protocol
+        ...
+
+
+@runtime_checkable
+class _RedditAgent(Protocol):
+    multireddit: _MultiredditHelper
+
     async def subreddit(self, name: str) -> object:  # pragma: no cover - protocol
         ...
 
@@ -36,6 +59,17 @@ class _BotLike(Protocol):
     user_data_manager: _UserDataManager | None
 
 
+@dataclass(slots=True)
+class TempUserMemoryReport:
+    """Size of the Reddit session data kept for all users."""
+
+    users: int = 0
+    viewed_posts: int = 0
+    queued_posts: int = 0
+    # Size of the viewed permalinks, without container overhead
+    estimated_bytes: int = 0
+
+
 class TempUserDataManager:
     """Manages temporary (non-persisted) user data.
 
@@ -54,9 +88,11 @@ class TempUserDataManager:
         return self._cache[user_id]
 
     async def ensure_multireddit(self, user_id: int) -> None:
-        """Generate a multireddit if one doesn't exist yet.
+        """Load the user's multireddit, creating it if it doesn't exist.
 
-        Preserves existing viewed_posts, search_limit, and last_used.
+        The multireddit is synced to the user's subreddits with at most one
+        update request, and kept in the temp data so it's only loaded once.
+        Preserves existing viewed_posts and last_used.
         """
         temp = self.get(user_id)
         if temp.reddit.multireddit is not None:
@@ -73,66 +109,92 @@ class TempUserDataManager:
             )
             return
 
-        multireddit_raw: object = await self._bot.reddit_agent.multireddit(
-            name=str(user_id), redditor="KexoBOT"
+        user = await self._bot.user_data_manager.get(user_id)
+        multireddit = cast(
+            _LocalMultireddit,
+            await self._bot.reddit_agent.multireddit(
+                name=str(user_id), redditor="KexoBOT"
+            ),
         )
+        try:
+            await multireddit.load()
+        except asyncprawcore.exceptions.NotFound:
+            logging.info("[Reddit] Creating multireddit for user %s.", user_id)
+            try:
+                temp.reddit.multireddit = (
+                    await self._bot.reddit_agent.multireddit.create(
+                        display_name=str(user_id),
+                        subreddits=list(user.reddit.subreddits),
+                    )
+                )
+            except asyncpraw.exceptions.RedditAPIException as e:
+                logging.error(
+                    "[Reddit] Failed to create multireddit for user %s: %s", user_id, e
+                )
+            return
 
-        class _LocalMultireddit(Protocol):
-            subreddits: list[object]
-
-            async def load(self) -> None: ...
+        await self.sync_multireddit(multireddit, user.reddit.subreddits)
+        temp.reddit.multireddit = multireddit
 
-            async def remove(self, subreddit: object) -> None: ...
+    async def sync_multireddit(
+        self, multireddit: object, subreddits: Iterable[str]
+    ) -> None:
+        """Make a loaded multireddit contain exactly the given subreddits.
 
-            async def add(self, subreddit: object) -> None: ...
+        Nothing is sent if it already does, otherwise the whole list is
+        replaced in a single update request.
 
-        multireddit = cast(_LocalMultireddit, multireddit_raw)
-        for attempt in range(3):
-            try:
-                await multireddit.load()
-                break
-            except asyncprawcore.exceptions.NotFound:
-                logging.warning(
-                    "[Reddit] Multireddit for user %s not found. "
-                    + "Attempting to create it... (Attempt %s/3)",
-                    user_id,
-                    attempt + 1,
-                )
-                await asyncio.sleep(attempt + 1)
-        else:
-            logging.error(
-                "[Reddit] Failed to load multireddit for user %s after 3 attempts.",
-                user_id,
-            )
+        Parameters
+        ----------
+        multireddit: :class:`asyncpraw.models.Multireddit`
+            The loaded multireddit.
+        subreddits: Iterable[str]
+            Names of the subreddits it should contain.
+        """
+        multireddit = cast(_LocalMultireddit, multireddit)
+        wanted = sorted(set(subreddits))
+        current = {
+            subreddit.display_name.lower() for subreddit in multireddit.subreddits
+        }
+        if current == {name.lower() for name in wanted}:
             return
 
-        # Remove all subreddits first, then add the user's selected ones
-        for subreddit in multireddit.subreddits:
-            try:
-                await multireddit.remove(subreddit)
-            except asyncpraw.exceptions.RedditAPIException:
-                pass
+        try:
+            await multireddit.update(subreddits=wanted)
+        except asyncpraw.exceptions.RedditAPIException as e:
+            logging.warning(f"[Reddit] Failed to update multireddit subreddits: {e}")
 
-        user = await self._bot.user_data_manager.get(user_id)
+    def clear_stale_reddit_data(self, stale_hours: int = 5) -> int:
+        """Forget users whose Reddit session is stale.
 
-        for subreddit_name in user.reddit.subreddits:
-            try:
-                subreddit_obj = await self._bot.reddit_agent.subreddit(subreddit_name)
-                await multireddit.add(subreddit_obj)
-            except asyncpraw.exceptions.RedditAPIException:
-                pass
-
-        temp.reddit.multireddit = multireddit
+        Parameters
+        ----------
+        stale_hours: int
+            Hours since the last viewed post, or since the session was
+            created, after which a session is stale.
 
-    def clear_stale_reddit_data(self, stale_hours: int = 5) -> None:
-        """Reset Reddit session data for users whose session is stale."""
+        Returns
+        -------
+        int
+            Number of users removed.
+        """
         now = datetime.now()
+        stale = [
+            user_id
+            for user_id, temp in self._cache.items()
+            if (now - temp.reddit.last_used).total_seconds() > stale_hours * 3600
+        ]
+        for user_id in stale:
+            del self._cache[user_id]
+        return len(stale)
+
+    def memory_report(self) -> TempUserMemoryReport:
+        """Estimate the memory used by the Reddit session data of all users."""
+        report = TempUserMemoryReport(users=len(self._cache))
         for temp in self._cache.values():
-            last_used = temp.reddit.last_used
-            if last_used is None:
-                continue
-            diff = now - last_used
-            if diff.total_seconds() > stale_hours * 3600:
-                temp.reddit.last_used = None
-                temp.reddit.viewed_posts = set()
-                temp.reddit.search_limit = 3
+            viewed_posts = temp.reddit.viewed_posts
+            report.viewed_posts += len(viewed_posts)
+            report.estimated_bytes += sum(sys.getsizeof(post) for post in viewed_posts)
+            if temp.reddit.feed is not None:
+                report.queued_posts += len(temp.reddit.feed)
+        return report
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import copy
+import hashlib
+import json
 import logging
 import socket
+import time
 from collections.abc import Awaitable, Callable
 from datetime import datetime
 from typing import Any, cast
@@ -11,7 +14,6 @@ from zoneinfo import ZoneInfo
 
 import asyncpraw
 import asyncprawcore.exceptions
-import cloudscraper
 import discord
 import httpx
 import sonolink
@@ -22,10 +24,17 @@ from pymongo.asynchronous.collection import AsyncCollection
 from typing_extensions import override
 
 from app.bot_state import BotState
+from app.classes.cloudscraper_gateway import CloudscraperGateway
 from app.classes.content_monitor import ContentMonitor
+from app.classes.graph_renderer import GraphRenderer
+from app.classes.humor_api_quota import HumorApiQuotaManager
+from app.classes.joke_prefetcher import JokePrefetcher
 from app.classes.lavalink_server import LavalinkServerManager
 from app.classes.reddit_fetcher import RedditFetcher
+from app.classes.sfd_graph_cache import SFDGraphCache
 from app.classes.sfd_servers import SFDServers
+from app.classes.subreddit_listings import SubredditListingCache
+from app.classes.translation_service import TranslationService
 from app.config.colors import COLOR_ORANGE_LIGHT, COLOR_RED
 from app.config.discord import (
     CHANNEL_ID_FREE_STUFF_CHANNEL,
@@ -41,11 +50,13 @@ from app.config.env import (
     LOCAL_MACHINE_NAME,
     USER_AGENT,
 )
+from app.config.metrics import ENV_METRICS_PORT, METRICS_HOST
 from app.config.mongo import DB_CACHE
 from app.config.reddit import (
     ENV_REDDIT_CLIENT_ID,
     ENV_REDDIT_PASSWORD,
     ENV_REDDIT_SECRET,
+    ENV_REDDIT_STREAMING,
     ENV_REDDIT_USER_AGENT,
     ENV_REDDIT_USERNAME,
     ICON_REDDIT,
@@ -61,7 +72,8 @@ from app.data import (
     UserData,
 )
 from app.data.bot_data import NodeCacheEntry
-from app.response_handler import make_embed, send
+from app.metrics import JOB_DURATION, MetricsServer, TimedCommandTree, observe_command
+from app.response_handler import make_embed, message_dispatcher, send
 from app.utils import get_url_response_time, make_http_request
 
 
@@ -74,6 +86,7 @@ class KexoBotClient(commands.Bot):
     temp_user_data_manager: TempUserDataManager | None = None
     temp_guild_data_manager: TempGuildDataManager | None = None
     joke_cache_manager: JokeCacheManager | None = None
+    joke_prefetcher: JokePrefetcher | None = None
     config_manager: BotConfigManager | None = None
     track_exceptions: (
         dict[int, tuple[sonolink.models.Playable | None, asyncio.Event]] | None
@@ -85,53 +98,58 @@ class KexoBotClient(commands.Bot):
     _user_data_db: AsyncCollection[Any] | None = None
     _guild_data_db: AsyncCollection[Any] | None = None
     reddit_agent: asyncpraw.Reddit | None = None
-    humor_api_tokens: dict[str, dict[str, bool]] | None = None
+    subreddit_listings: SubredditListingCache | None = None
+    humor_api_quota: HumorApiQuotaManager | None = None
+    metrics_server: MetricsServer | None = None
     node_is_switching: dict[int, bool] | None = None
     session: httpx.AsyncClient | None = None
     state: BotState | None = None
+    graph_renderer: GraphRenderer | None = None
+    sfd_servers: SFDServers | None = None
+    sfd_graph_cache: SFDGraphCache | None = None
     connect_node: Callable[..., Awaitable[sonolink.Node | None]] | None = None
 
     @override
     async def setup_hook(self) -> None:
         """Initialize sonolink client, fetch cached nodes, connect node, load cogs.
 
-        Runs once after login, before any events are processed.
+        Runs once after login, before any events are processed. Connecting
+        the node and loading the cogs are independent and run concurrently.
         Only wordnik_presence (needs fully loaded bot) stays in on_ready.
         """
-        await kexobot.initialize()
-        node = await kexobot.connect_node()
-        if not node:
-            logging.warning(
-                "[Sonolink] Setup hook connect failed, refreshing node cache."
-            )
-            assert kexobot.lavalink_server_manager is not None, (
-                "Lavalink server manager must be initialized"
-            )
-            await kexobot.lavalink_server_manager.fetch()
-            node = await kexobot.connect_node()
-
-        if not node:
-            logging.error("[Sonolink] Node is not connected after setup hook attempts.")
-
-        await setup_cogs()
+        timings = StartupTimings()
+        await timings.run("initialize", kexobot.initialize(timings))
+        await asyncio.gather(
+            timings.run("node", kexobot.connect_startup_node()),
+            timings.run("cogs", setup_cogs(timings)),
+        )
         assert self.sonolink_client is not None, "Sonolink client must be initialized"
         await self.sonolink_client.start()
+        timings.report()
 
         main_loop_task.start()
         hourly_loop_task.start()
+        if ENV_METRICS_PORT:
+            self.metrics_server = MetricsServer(METRICS_HOST, ENV_METRICS_PORT)
+            await self.metrics_server.start()
+
+    @override
+    async def close(self) -> None:
+        """Stop the background tasks, then close the connection to Discord."""
+        await kexobot.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
+            self.metrics_server = None
+        await super().close()
 
 
 intents = discord.Intents.default()
 intents.message_content = False
 intents.members = False
 
-bot = KexoBotClient(command_prefix=commands.when_mentioned, intents=intents)
-
-
-def load_humor_api_tokens() -> None:
-    """Load the humor API tokens."""
-    assert bot.humor_api_tokens is not None, "Humor API tokens dict must be initialized"
-    bot.humor_api_tokens = {token: {"exhausted": False} for token in ENV_HUMOR_KEY}
+bot = KexoBotClient(
+    command_prefix=commands.when_mentioned, intents=intents, tree_cls=TimedCommandTree
+)
 
 
 def clear_temp_reddit_data() -> None:
@@ -139,7 +157,36 @@ def clear_temp_reddit_data() -> None:
     assert bot.temp_user_data_manager is not None, (
         "Temp user data manager must be initialized"
     )
-    bot.temp_user_data_manager.clear_stale_reddit_data(stale_hours=5)
+    removed = bot.temp_user_data_manager.clear_stale_reddit_data(stale_hours=5)
+    report = bot.temp_user_data_manager.memory_report()
+    logging.info(
+        f"[TempUserData] Removed {removed} idle users, {report.users} left with "
+        f"{report.viewed_posts} viewed and {report.queued_posts} queued posts "
+        f"(~{report.estimated_bytes / 1024:.1f} KiB)."
+    )
+
+
+def log_message_dispatch() -> None:
+    """Log the queue depth and send latency of the message dispatcher."""
+    stats = message_dispatcher.stats()
+    logging.info(
+        f"[Dispatcher] {stats.queued} messages queued in {stats.channels} "
+        f"channels, {stats.sent} sent ({stats.merged} merged, {stats.failed} "
+        f"failed), latency avg {stats.latency_average:.2f}s, "
+        f"max {stats.latency_max:.2f}s."
+    )
+
+
+def log_cloudscraper_stats() -> None:
+    """Log the request counters of the cloudscraper gateway."""
+    if kexobot.cloudscraper_gateway is None:
+        return
+    stats = kexobot.cloudscraper_gateway.stats
+    logging.info(
+        f"[Cloudscraper] {stats.requests} requests ({stats.failures} failed, "
+        f"{stats.timeouts} timed out, {stats.rejected} rejected), "
+        f"{stats.in_flight} in flight, avg {stats.average_time:.2f}s."
+    )
 
 
 def clear_temp_guild_data() -> None:
@@ -150,10 +197,36 @@ def clear_temp_guild_data() -> None:
     bot.temp_guild_data_manager.reset_all()
 
 
-def clear_cached_jokes() -> None:
+async def clear_cached_jokes() -> None:
     """Clear the cached jokes loaded from FunCommands"""
     assert bot.joke_cache_manager is not None, "Joke cache manager must be initialized"
     bot.joke_cache_manager.clear_all()
+    assert bot.joke_prefetcher is not None, "Joke prefetcher must be initialized"
+    await bot.joke_prefetcher.reset()
+
+
+class StartupTimings:
+    """Collects how long each startup phase took, for a single log report."""
+
+    def __init__(self) -> None:
+        self._start = time.perf_counter()
+        self._phases: dict[str, float] = {}
+
+    async def run(self, phase: str, coro: Awaitable[Any]) -> Any:
+        """Await ``coro`` and record its duration under ``phase``."""
+        start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            self._phases[phase] = time.perf_counter() - start
+
+    def report(self) -> None:
+        """Log the duration of every recorded phase and the total."""
+        phases = ", ".join(
+            f"{phase} {duration:.2f}s" for phase, duration in self._phases.items()
+        )
+        total = time.perf_counter() - self._start
+        logging.info(f"[Starter] Startup took {total:.2f}s ({phases})")
 
 
 class KexoBot:
@@ -169,7 +242,7 @@ class KexoBot:
 
     def __init__(self):
         self.session: httpx.AsyncClient | None = None
-        self.cloudscraper_session: cloudscraper.CloudScraper | None = None
+        self.cloudscraper_gateway: CloudscraperGateway | None = None
         self._user_kexo: discord.User | None = None
         self._subreddit_cache: dict[str, Any] | None = None
         self._hostname: str = socket.gethostname()
@@ -185,6 +258,9 @@ class KexoBot:
         self._guild_data_db: AsyncCollection[Any] = cast(
             AsyncCollection[Any], db["GuildData"]
         )
+        self.translator = TranslationService(
+            cast(AsyncCollection[Any], db["Translations"])
+        )
 
         self._reddit_agent: asyncpraw.Reddit | None = None
 
@@ -192,6 +268,7 @@ class KexoBot:
         self._content_monitor: ContentMonitor | None = None
         self._lavalink_server_manager: LavalinkServerManager | None = None
         self._sfd_servers: SFDServers | None = None
+        self._sfd_graph_cache: SFDGraphCache | None = None
 
         self.lavalink_server_manager: LavalinkServerManager | None = None
 
@@ -208,6 +285,7 @@ class KexoBot:
         bot.sonolink_client = sonolink.Client(bot)
         bot.connect_node = self.connect_node
         bot.state = BotState(bot)
+        bot.graph_renderer = GraphRenderer()
 
         # Data managers (replace old raw dicts)
         bot.user_data_manager = BaseDataManager[UserData](self._user_data_db, UserData)
@@ -219,21 +297,45 @@ class KexoBot:
         bot.joke_cache_manager = JokeCacheManager()
         bot.config_manager = BotConfigManager(self._bot_config, lambda: list[str]())
 
-        bot.humor_api_tokens = {}
+        bot.humor_api_quota = HumorApiQuotaManager(ENV_HUMOR_KEY, bot.config_manager)
         bot.node_is_switching = {}
         bot.track_exceptions = {}
 
-    async def initialize(self) -> None:
-        """Initialize classes and fetch all channels and users."""
+    async def initialize(self, timings: StartupTimings) -> None:
+        """Initialize classes and fetch all channels and users.
+
+        Discord and MongoDB lookups don't depend on each other, so they
+        run concurrently.
+
+        Parameters
+        ----------
+        timings: StartupTimings
+            Collector for the duration of each startup phase.
+        """
         self._create_reddit_agent()
-        await self._fetch_users()
-        await self._fetch_channels()
-        await self._fetch_subreddit_icons()
-        await self._fetch_cached_lavalink_servers()
-        load_humor_api_tokens()
         self._create_http_sessions()
+        await asyncio.gather(
+            timings.run("discord fetch", self._fetch_discord_objects()),
+            timings.run("config load", self._fetch_config()),
+        )
         self._define_classes()
 
+    async def connect_startup_node(self) -> None:
+        """Connect the first node, refreshing the node cache if none is reachable."""
+        node = await self.connect_node()
+        if not node:
+            logging.warning(
+                "[Sonolink] Setup hook connect failed, refreshing node cache."
+            )
+            assert self.lavalink_server_manager is not None, (
+                "Lavalink server manager must be initialized"
+            )
+            await self.lavalink_server_manager.fetch()
+            node = await self.connect_node()
+
+        if not node:
+            logging.error("[Sonolink] Node is not connected after setup hook attempts.")
+
     def _create_reddit_agent(self) -> None:
         """Create Reddit API client in runtime initialization context."""
         self._reddit_agent = asyncpraw.Reddit(
@@ -244,17 +346,30 @@ class KexoBot:
             password=ENV_REDDIT_PASSWORD,
         )
         bot.reddit_agent = self._reddit_agent
+        bot.subreddit_listings = SubredditListingCache(self._reddit_agent)
+
+    async def _fetch_discord_objects(self) -> None:
+        """Fetch the users and channels the bot needs."""
+        await asyncio.gather(self._fetch_users(), self._fetch_channels())
+
+    async def _fetch_config(self) -> None:
+        """Load the cached config entries from MongoDB."""
+        await asyncio.gather(
+            self._fetch_subreddit_icons(),
+            self._fetch_cached_lavalink_servers(),
+            bot.config_manager.get("command_tree_hashes", DB_CACHE),
+        )
 
     async def _fetch_channels(self) -> None:
         """Fetch all channels for the bot."""
-        self._channel_game_updates = await bot.fetch_channel(
-            CHANNEL_ID_GAME_UPDATES_CHANNEL
-        )
-        self._channel_game_cracks = await bot.fetch_channel(
-            CHANNEL_ID_GAME_CRACKS_CHANNEL
-        )
-        self._channel_free_stuff = await bot.fetch_channel(
-            CHANNEL_ID_FREE_STUFF_CHANNEL
+        (
+            self._channel_game_updates,
+            self._channel_game_cracks,
+            self._channel_free_stuff,
+        ) = await asyncio.gather(
+            bot.fetch_channel(CHANNEL_ID_GAME_UPDATES_CHANNEL),
+            bot.fetch_channel(CHANNEL_ID_GAME_CRACKS_CHANNEL),
+            bot.fetch_channel(CHANNEL_ID_FREE_STUFF_CHANNEL),
         )
         logging.info("[Starter] Channels fetched.")
 
@@ -275,8 +390,8 @@ class KexoBot:
         if self._reddit_agent is None:
             raise RuntimeError("Reddit client is not initialized")
 
-        assert self.cloudscraper_session is not None, (
-            "Cloudscraper session must be initialized"
+        assert self.cloudscraper_gateway is not None, (
+            "Cloudscraper gateway must be initialized"
         )
         assert self.session is not None, "HTTP session must be initialized"
         assert bot.config_manager is not None, "Config manager must be initialized"
@@ -294,7 +409,8 @@ class KexoBot:
         self._content_monitor = ContentMonitor(
             bot.config_manager,
             self.session,
-            self.cloudscraper_session,
+            self.cloudscraper_gateway,
+            self.translator,
             self._channel_game_updates,
             self._channel_free_stuff,
             self._user_kexo,
@@ -307,8 +423,29 @@ class KexoBot:
             self._channel_free_stuff,
             self._channel_game_cracks,
         )
-        self._sfd_servers = SFDServers(self._bot_config, self.session)
+        if ENV_REDDIT_STREAMING:
+            self._reddit_fetcher.start_streaming()
+        self._sfd_servers = SFDServers(
+            self._bot_config, self.session, bot.graph_renderer
+        )
+        self._sfd_graph_cache = SFDGraphCache(self._sfd_servers)
+        self._sfd_graph_cache.schedule_refresh()
+        bot.sfd_servers = self._sfd_servers
+        bot.sfd_graph_cache = self._sfd_graph_cache
         self._lavalink_server_manager = LavalinkServerManager(bot, self.session)
+        assert bot.joke_cache_manager is not None, (
+            "Joke cache manager must be initialized"
+        )
+        assert bot.humor_api_quota is not None, (
+            "HumorAPI quota manager must be initialized"
+        )
+        bot.joke_prefetcher = JokePrefetcher(
+            bot.humor_api_quota,
+            self.session,
+            bot.joke_cache_manager,
+            bot.config_manager,
+        )
+        bot.joke_prefetcher.start()
 
     async def main_loop(self) -> None:
         """Main loop for the bot.
@@ -319,30 +456,34 @@ class KexoBot:
         assert self._reddit_fetcher is not None, "Reddit fetcher must be initialized"
         assert self._content_monitor is not None, "Content monitor must be initialized"
         assert self._sfd_servers is not None, "SFD servers must be initialized"
+        assert self._sfd_graph_cache is not None, "SFD graph cache must be initialized"
         now = datetime.now(ZoneInfo("Europe/Bratislava"))
 
         if self._main_loop_counter == 0:
             self._main_loop_counter = 1
-            await self._reddit_fetcher.freegamefindings()
+            if not self._reddit_fetcher.streaming:
+                with JOB_DURATION.time("reddit"):
+                    await self._reddit_fetcher.poll()
 
         elif self._main_loop_counter == 1:
             self._main_loop_counter = 2
-            await self._content_monitor.alienware_arena()
+            with JOB_DURATION.time("alienware_arena"):
+                await self._content_monitor.alienware_arena()
 
         elif self._main_loop_counter == 2:
             self._main_loop_counter = 3
-            await self._content_monitor.game3rb()
+            with JOB_DURATION.time("game3rb"):
+                await self._content_monitor.game3rb()
 
         elif self._main_loop_counter == 3:
-            self._main_loop_counter = 4
-            await self._content_monitor.online_fix()
-
-        elif self._main_loop_counter == 4:
             self._main_loop_counter = 0
-            await self._reddit_fetcher.crackwatch()
+            with JOB_DURATION.time("online_fix"):
+                await self._content_monitor.online_fix()
 
         if now.minute % 6 == 0 and self._hostname != LOCAL_MACHINE_NAME:
-            await self._sfd_servers.update_stats(now)
+            with JOB_DURATION.time("sfd_stats"):
+                await self._sfd_servers.update_stats(now)
+            self._sfd_graph_cache.schedule_refresh()
 
     async def hourly_loop(self) -> None:
         """Hourly loop for the bot.
@@ -361,9 +502,11 @@ class KexoBot:
 
         now = datetime.now(ZoneInfo("Europe/Bratislava"))
         weekday = now.weekday()
+        log_message_dispatch()
+        log_cloudscraper_stats()
 
         if weekday == 6 and now.hour == 0:
-            clear_cached_jokes()
+            await clear_cached_jokes()
             clear_temp_guild_data()
             await self._refresh_subreddit_icons()
 
@@ -371,7 +514,6 @@ class KexoBot:
             clear_temp_reddit_data()
 
         if now.hour == 0:
-            load_humor_api_tokens()
             await self._upload_cached_lavalink_servers()
             await self._test_all_node_pings()
             await self._lavalink_server_manager.fetch()
@@ -380,6 +522,11 @@ class KexoBot:
             assert self.session is not None, "HTTP session must be initialized"
             await self.wordnik_presence()
 
+    async def close(self) -> None:
+        """Stop the background tasks of the fetchers."""
+        if self._reddit_fetcher is not None:
+            await self._reddit_fetcher.close()
+
     async def connect_node(
         self,
         exclude_nodes: list[str] | None = None,
@@ -505,11 +652,11 @@ class KexoBot:
         logging.info(f"[Starter] User {self._user_kexo.name} fetched.")
 
     def _create_http_sessions(self) -> None:
-        """Create a httpx session for the bot."""
+        """Create a httpx session and the cloudscraper gateway for the bot."""
         self.session = httpx.AsyncClient()
         self.session.headers = httpx.Headers({"User-Agent": USER_AGENT})
-        self.cloudscraper_session = cloudscraper.create_scraper()  # pyright: ignore[reportUnknownMemberType]
-        logging.info("[Starter] Httpx and cloudscraper session initialized.")
+        self.cloudscraper_gateway = CloudscraperGateway()
+        logging.info("[Starter] Httpx session and cloudscraper gateway initialized.")
 
     async def _upload_cached_lavalink_servers(self) -> None:
         """Upload cached lavalink servers to the database."""
@@ -543,8 +690,61 @@ def initialize_cog_http_session() -> None:
     bot.session.headers = httpx.Headers({"User-Agent": USER_AGENT})
 
 
-async def setup_cogs() -> None:
-    """Load all cogs for the bot."""
+def get_command_tree_hash(guild: discord.abc.Snowflake | None = None) -> str:
+    """Hash the command payloads that ``tree.sync`` would upload.
+
+    Parameters
+    ----------
+    guild: discord.abc.Snowflake | None
+        The guild to hash the guild-specific commands of, or None for global.
+
+    Returns
+    -------
+    str
+        SHA-256 hex digest of the payloads.
+    """
+    tree_commands = bot.tree.get_commands(guild=guild)
+    payload = [command.to_dict(bot.tree) for command in tree_commands]
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+async def sync_command_tree(guild: discord.abc.Snowflake | None = None) -> None:
+    """Sync the command tree, skipping it if unchanged since the last sync.
+
+    Hashes are stored per application, so a development bot sharing the
+    database doesn't invalidate the hashes of the production bot.
+
+    Parameters
+    ----------
+    guild: discord.abc.Snowflake | None
+        The guild to sync, or None to sync global commands.
+    """
+    assert bot.config_manager is not None, "Config manager must be initialized"
+    hashes = await bot.config_manager.get("command_tree_hashes", DB_CACHE)
+    if not isinstance(hashes, dict):
+        hashes = {}
+        bot.config_manager.set("command_tree_hashes", hashes)
+
+    scope = f"{bot.application_id}:{guild.id if guild else 'global'}"
+    tree_hash = get_command_tree_hash(guild)
+    if hashes.get(scope) == tree_hash:
+        logging.info(f"[Starter] Command tree unchanged, skipping sync ({scope}).")
+        return
+
+    await bot.tree.sync(guild=guild)
+    hashes[scope] = tree_hash
+    logging.info(f"[Starter] Command tree synced ({scope}).")
+
+
+async def setup_cogs(timings: StartupTimings) -> None:
+    """Load all cogs for the bot and sync the command tree.
+
+    Parameters
+    ----------
+    timings: StartupTimings
+        Collector for the duration of each startup phase.
+    """
 
     cogs_list = [
         "fun_commands",
@@ -557,11 +757,17 @@ async def setup_cogs() -> None:
     for cog in cogs_list:
         await bot.load_extension(f"app.cogs.{cog}")
 
-    await bot.tree.sync()
-    await bot.tree.sync(guild=discord.Object(id=CHANNEL_ID_KEXO_SERVER))
-
     logging.info("[Starter] Cogs loaded.")
 
+    await timings.run(
+        "command sync",
+        asyncio.gather(
+            sync_command_tree(),
+            sync_command_tree(discord.Object(id=CHANNEL_ID_KEXO_SERVER)),
+        ),
+    )
+    await bot.config_manager.save("command_tree_hashes", DB_CACHE)
+
 
 @tasks.loop(minutes=1)
 async def main_loop_task() -> None:
@@ -572,7 +778,8 @@ async def main_loop_task() -> None:
 @tasks.loop(hours=1)
 async def hourly_loop_task() -> None:
     """Hourly loop for the bot."""
-    await kexobot.hourly_loop()
+    with JOB_DURATION.time("hourly"):
+        await kexobot.hourly_loop()
 
 
 @main_loop_task.before_loop
@@ -672,9 +879,18 @@ async def on_application_command_error(
 async def on_tree_error(
     interaction: discord.Interaction, error: discord.app_commands.AppCommandError
 ) -> None:
+    observe_command(interaction, "error")
     await on_application_command_error(interaction, error)
 
 
+@bot.event
+async def on_app_command_completion(
+    interaction: discord.Interaction,
+    command: app_commands.Command[Any, ..., Any] | app_commands.ContextMenu,
+) -> None:
+    observe_command(interaction, "success")
+
+
 @bot.event
 async def on_guild_join(guild: discord.Guild) -> None:
     logging.info(f"Joined new guild: {guild.name}")
@@ -698,6 +914,11 @@ def run_bot() -> None:
         asyncio.set_event_loop(loop)
         loop.run_until_complete(save_all_data())
         loop.close()
+        if bot.graph_renderer is not None:
+            bot.graph_renderer.shutdown()
+        if kexobot.cloudscraper_gateway is not None:
+            kexobot.cloudscraper_gateway.shutdown()
+        kexobot.translator.shutdown()
 
 
 if __name__ == "__main__":
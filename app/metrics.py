@@ -0,0 +1,245 @@
+"""Latency histograms of the bot, served in the Prometheus text format.
+
+The ``/info`` command only shows a snapshot of the process. These
+histograms record how long the hot paths take under real load: slash
+commands, outgoing HTTP and cloudscraper requests, MongoDB operations,
+Lavalink searches, connects and failovers, the main-loop jobs and the
+event-loop lag. They are served at
+``http://127.0.0.1:<METRICS_PORT>/metrics`` for a local Prometheus (or
+``curl``) to read.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import discord
+from aiohttp import web
+from discord import app_commands
+
+from app.config.metrics import (
+    EVENT_LOOP_LAG_BUCKETS,
+    EVENT_LOOP_LAG_INTERVAL,
+    METRICS_BUCKETS,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass(slots=True)
+class _Series:
+    # Observations per bucket, the last one for values above every bucket
+    counts: list[int]
+    total: float = 0.0
+
+
+@dataclass(slots=True)
+class Histogram:
+    """Histogram of durations in seconds, one series per label values.
+
+    Parameters
+    ----------
+    name: str
+        Metric name, e.g. ``"kexobot_command_duration_seconds"``.
+    documentation: str
+        Help text of the metric.
+    labels: tuple[str, ...]
+        Names of the labels, their values are passed to :meth:`observe`.
+    buckets: tuple[float, ...]
+        Sorted upper bounds of the buckets.
+    """
+
+    name: str
+    documentation: str
+    labels: tuple[str, ...] = ()
+    buckets: tuple[float, ...] = METRICS_BUCKETS
+    _series: dict[tuple[str, ...], _Series] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        _REGISTRY.append(self)
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record a duration.
+
+        Parameters
+        ----------
+        value: float
+            The duration in seconds.
+        *label_values: str
+            Values of the labels, in the order of ``labels``.
+        """
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = _Series([0] * (len(self.buckets) + 1))
+        series.counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.total += value
+
+    @contextmanager
+    def time(self, *label_values: str) -> Iterator[None]:
+        """Record how long the ``with`` block takes, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self) -> list[str]:
+        """Get the lines of the metric in the Prometheus text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for label_values, series in self._series.items():
+            labels = ",".join(
+                f'{label}="{_escape(value)}"'
+                for label, value in zip(self.labels, label_values)
+            )
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series.counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += series.counts[-1]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {series.total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+_REGISTRY: list[Histogram] = []
+
+COMMAND_DURATION = Histogram(
+    "kexobot_command_duration_seconds",
+    "Time to handle a slash command.",
+    ("command", "outcome"),
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "kexobot_http_request_duration_seconds",
+    "Time of a single make_http_request attempt.",
+    ("host",),
+)
+CLOUDSCRAPER_REQUEST_DURATION = Histogram(
+    "kexobot_cloudscraper_request_duration_seconds",
+    "Time of a cloudscraper request, 0 for requests rejected as all workers were busy.",
+    ("outcome",),
+)
+MONGO_OPERATION_DURATION = Histogram(
+    "kexobot_mongo_operation_duration_seconds",
+    "Time of a MongoDB operation of the data managers.",
+    ("collection", "operation"),
+)
+LAVALINK_OPERATION_DURATION = Histogram(
+    "kexobot_lavalink_operation_duration_seconds",
+    "Time of a Lavalink track search, node connect or node failover.",
+    ("operation",),
+)
+JOB_DURATION = Histogram(
+    "kexobot_job_duration_seconds",
+    "Time of a main or hourly loop job.",
+    ("job",),
+)
+EVENT_LOOP_LAG = Histogram(
+    "kexobot_event_loop_lag_seconds",
+    "How late the event loop runs a scheduled callback.",
+    buckets=EVENT_LOOP_LAG_BUCKETS,
+)
+
+
+def render() -> str:
+    """Get every metric in the Prometheus text format."""
+    return "\n".join(line for metric in _REGISTRY for line in metric.render()) + "\n"
+
+
+class TimedCommandTree(app_commands.CommandTree):
+    """Command tree that notes when it started handling an interaction.
+
+    :func:`observe_command` records the duration once the command finished.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction, /) -> bool:
+        interaction.extras["started_at"] = time.perf_counter()
+        return True
+
+
+def observe_command(interaction: discord.Interaction, outcome: str) -> None:
+    """Record how long a slash command took.
+
+    Parameters
+    ----------
+    interaction: :class:`discord.Interaction`
+        Interaction of the command.
+    outcome: str
+        ``"success"`` or ``"error"``.
+    """
+    started = interaction.extras.get("started_at")
+    if started is None:
+        return
+    command = interaction.command
+    name = command.qualified_name if command else "unknown"
+    COMMAND_DURATION.observe(time.perf_counter() - started, name, outcome)
+
+
+class MetricsServer:
+    """Serves the metrics and measures the event-loop lag.
+
+    Parameters
+    ----------
+    host: str
+        Address to listen on.
+    port: int
+        Port to listen on.
+    """
+
+    def __init__(self, host: str, port: int) -> None:
+        self._host = host
+        self._port = port
+        self._runner: web.AppRunner | None = None
+        self._lag_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start serving ``/metrics`` and measuring the event-loop lag."""
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self._host, self._port).start()
+        except OSError as e:
+            logging.warning(f"[Metrics] Failed to listen on port {self._port}: {e}")
+            await self._runner.cleanup()
+            self._runner = None
+            return
+
+        self._lag_task = asyncio.create_task(self._measure_lag())
+        logging.info(f"[Metrics] Serving on http://{self._host}:{self._port}/metrics")
+
+    async def close(self) -> None:
+        """Stop the server and the lag measurement."""
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @staticmethod
+    async def _handle_metrics(_request: web.Request) -> web.Response:
+        return web.Response(
+            body=render().encode(),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    @staticmethod
+    async def _measure_lag() -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(EVENT_LOOP_LAG_INTERVAL)
+            late = time.perf_counter() - started - EVENT_LOOP_LAG_INTERVAL
+            EVENT_LOOP_LAG.observe(max(late, 0.0))
@@ -1,8 +1,15 @@
-from typing import Any, Callable
+import copy
+from functools import lru_cache
+from typing import Any, Callable, NoReturn
 
 import discord
 
+from app.classes.message_dispatcher import MessageDispatcher
 from app.config.colors import COLOR_BLUE, COLOR_RED
+from app.config.discord import RESPONSE_CACHE_SIZE
+
+# Sends the ``queued`` channel messages, see :func:`send`
+message_dispatcher = MessageDispatcher()
 
 
 def make_embed(
@@ -18,80 +25,152 @@ def make_embed(
     return embed
 
 
-def _no_track_found(to_find: str) -> discord.Embed:
-    return make_embed(
+class FrozenEmbed(discord.Embed):
+    """Read-only embed whose serialized payload is computed once.
+
+    Canned responses are shared by every send, so a caller tweaking one
+    would change it for everyone. Modifying a frozen embed raises
+    ``TypeError``, use :meth:`copy` to get a mutable one. discord.py calls
+    :meth:`to_dict` on every send, which returns the precomputed payload.
+    """
+
+    __slots__ = ("_payload",)
+
+    @classmethod
+    def freeze(cls, embed: discord.Embed) -> "FrozenEmbed":
+        """Create a frozen copy of an embed.
+
+        Parameters
+        ----------
+        embed: :class:`discord.Embed`
+            The embed to copy.
+        """
+        frozen = cls.__new__(cls)
+        for attr in discord.Embed.__slots__:
+            if hasattr(embed, attr):
+                object.__setattr__(frozen, attr, copy.deepcopy(getattr(embed, attr)))
+        if hasattr(embed, "_fields"):
+            object.__setattr__(frozen, "_fields", tuple(frozen._fields))
+        object.__setattr__(frozen, "_payload", copy.deepcopy(embed.to_dict()))
+        return frozen
+
+    def to_dict(self) -> Any:
+        """Get the precomputed payload of the embed.
+
+        The same dict is returned to every caller, so it must not be
+        modified, use ``copy().to_dict()`` for one that can be. It isn't
+        wrapped in a read-only mapping as those can't be serialized to JSON.
+        """
+        return self._payload
+
+    def copy(self) -> discord.Embed:
+        """Get a mutable copy of the embed."""
+        return discord.Embed.from_dict(copy.deepcopy(self._payload))
+
+    def __copy__(self) -> discord.Embed:
+        return self.copy()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> discord.Embed:
+        return self.copy()
+
+    def _frozen(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("FrozenEmbed can't be modified, modify a copy() instead")
+
+    __setattr__ = __delattr__ = _frozen
+    add_field = insert_field_at = set_field_at = remove_field = clear_fields = _frozen
+
+
+def make_frozen_embed(
+    description: str,
+    *,
+    color: discord.Color = COLOR_BLUE,
+    footer: str | None = None,
+) -> FrozenEmbed:
+    """Build a :func:`make_embed` embed for a canned response."""
+    return FrozenEmbed.freeze(make_embed(description, color=color, footer=footer))
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _no_track_found(to_find: str) -> FrozenEmbed:
+    return make_frozen_embed(
         f":x: No tracks with index {to_find} were found in the queue. "
         + "Type `/music queue` to see the list of tracks."
     )
 
 
-def _no_tracks_found(search: str) -> discord.Embed:
-    return make_embed(f":x: No tracks were found for `{search}`.")
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _no_tracks_found(search: str) -> FrozenEmbed:
+    return make_frozen_embed(f":x: No tracks were found for `{search}`.")
 
 
-def _radiomap_no_station_found(search: str) -> discord.Embed:
-    return make_embed(f":x: No station found with name {search}.")
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _radiomap_no_station_found(search: str) -> FrozenEmbed:
+    return make_frozen_embed(f":x: No station found with name {search}.")
 
 
-def _queue_track_removed(title: str, uri: str) -> discord.Embed:
-    return make_embed(f":wastebasket: Removed [{title}]({uri})")
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _queue_track_removed(title: str, uri: str) -> FrozenEmbed:
+    return make_frozen_embed(f":wastebasket: Removed [{title}]({uri})")
 
 
-def _queue_loop_enabled(count: int) -> discord.Embed:
-    return make_embed(f"🔁 Looping queue with `({count}` songs)")
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _queue_loop_enabled(count: int) -> FrozenEmbed:
+    return make_frozen_embed(f"🔁 Looping queue with `({count}` songs)")
 
 
-def _track_loop_enabled(title: str, uri: str) -> discord.Embed:
-    return make_embed(f"🔁 Looping [{title}]({uri})")
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _track_loop_enabled(title: str, uri: str) -> FrozenEmbed:
+    return make_frozen_embed(f"🔁 Looping [{title}]({uri})")
 
 
-def _reconnected_node(node: str) -> discord.Embed:
-    return make_embed(f":white_check_mark: Reconnected to node `{node}`.")
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _reconnected_node(node: str) -> FrozenEmbed:
+    return make_frozen_embed(f":white_check_mark: Reconnected to node `{node}`.")
 
 
-type ResponseBuilder = Callable[..., discord.Embed]
+type ResponseBuilder = Callable[..., FrozenEmbed]
 
 
-RESPONSE_CODES: dict[str, discord.Embed | ResponseBuilder] = {
+RESPONSE_CODES: dict[str, FrozenEmbed | ResponseBuilder] = {
     # ──────────────────────────── Music errors ───────────────────────────── #
-    "NO_VOICE_CHANNEL": make_embed(
+    "NO_VOICE_CHANNEL": make_frozen_embed(
         ":x: You're not in a voice channel. Type `/music play` from vc."
     ),
-    "NOT_IN_SAME_VOICE_CHANNEL": make_embed(
+    "NOT_IN_SAME_VOICE_CHANNEL": make_frozen_embed(
         ":x: I am playing in a different voice channel."
     ),
     "NO_TRACK_FOUND_IN_QUEUE": _no_track_found,
-    "NO_PERMISSIONS": make_embed(
+    "NO_PERMISSIONS": make_frozen_embed(
         ":x: I don't have permissions to join your channel.", color=COLOR_RED
     ),
-    "NO_NODE_INFO": make_embed(":x: Failed to get node info.", color=COLOR_RED),
-    "NODE_CONNECT_FAILURE": make_embed(
+    "NO_NODE_INFO": make_frozen_embed(":x: Failed to get node info.", color=COLOR_RED),
+    "NODE_CONNECT_FAILURE": make_frozen_embed(
         ":x: Failed to reconnect node.", color=COLOR_RED
     ),
-    "NODE_NOT_FOUND": make_embed(
+    "NODE_NOT_FOUND": make_frozen_embed(
         ":x: Couldn't find node to play this music, try switching to a different node "
         + "with `/node reconnect`, or use Youtube links instead of Spotify/Deezer/Apple Music.",
         color=COLOR_RED,
     ),
     "NO_TRACKS_FOUND": _no_tracks_found,
-    "NO_TRACKS_IN_QUEUE": make_embed("Queue is empty."),
-    "RADIOMAP_ERROR": make_embed(
+    "NO_TRACKS_IN_QUEUE": make_frozen_embed("Queue is empty."),
+    "RADIOMAP_ERROR": make_frozen_embed(
         ":x: Failed to get response from RadioMap API, try again later.",
         color=COLOR_RED,
     ),
     "RADIOMAP_NO_STATION_FOUND": _radiomap_no_station_found,
-    "JOKE_TIMEOUT": make_embed(
+    "JOKE_TIMEOUT": make_frozen_embed(
         ":x: Failed to get joke, try again later.", color=COLOR_RED
     ),
-    "NO_MORE_JOKES": make_embed(
+    "NO_MORE_JOKES": make_frozen_embed(
         ":x: You've seen all available jokes for now.", color=COLOR_RED
     ),
-    "QUEUE_CLEARED": make_embed(":wastebasket: Queue has been cleared."),
+    "QUEUE_CLEARED": make_frozen_embed(":wastebasket: Queue has been cleared."),
     "QUEUE_TRACK_REMOVED": _queue_track_removed,
-    "QUEUE_SHUFFLED": make_embed("🔀 Queue shuffled."),
-    "QUEUE_LOOP_DISABLED": make_embed("No longer looping queue."),
+    "QUEUE_SHUFFLED": make_frozen_embed("🔀 Queue shuffled."),
+    "QUEUE_LOOP_DISABLED": make_frozen_embed("No longer looping queue."),
     "QUEUE_LOOP_ENABLED": _queue_loop_enabled,
-    "TRACK_LOOP_DISABLED": make_embed("No longer looping current song."),
+    "TRACK_LOOP_DISABLED": make_frozen_embed("No longer looping current song."),
     "TRACK_LOOP_ENABLED": _track_loop_enabled,
     "RECONNECTED_NODE": _reconnected_node,
 }
@@ -146,6 +225,7 @@ async def send(
     delete_after: float | None = None,
     ephemeral: bool = False,
     suppress: bool | None = None,
+    queued: bool = False,
     **kwargs: Any,  # pyright: ignore[reportAny]
 ) -> discord.Message | None:
     """Unified send function — the one entry point for all bot messages.
@@ -162,6 +242,11 @@ async def send(
         precedence over ``embed`` / ``embeds`` (*you would not pass both*).
     embed, embeds, view, files, delete_after, suppress, ephemeral:
         Forwarded to the underlying Discord send method.
+    queued: :class:`bool`
+        Hand a channel message to the message dispatcher instead of sending
+        it right away. It's sent in the background, merged with neighbouring
+        embeds and paced by the channel's rate limit. Ignored for
+        interactions.
     **kwargs
         Any extra keyword arguments are passed to callable response builders.
 
@@ -169,7 +254,8 @@ async def send(
     -------
     :class:`discord.Message` | ``None``
         The sent message when available (interaction followups or channel
-        sends), ``None`` when the interaction was a fresh response.
+        sends), ``None`` when the interaction was a fresh response or the
+        message was queued.
     """
     # ── 1. Resolve response code ───────────────────────────────────────────
     resolved_embed: discord.Embed | None = embed
@@ -231,6 +317,9 @@ async def send(
             files=files,
             suppress=suppress,
         )
+        if queued:
+            message_dispatcher.enqueue(target, payload, delete_after)
+            return None
         try:
             message = await target.send(**payload)  # pyright: ignore[reportAny]
         except discord.HTTPException:
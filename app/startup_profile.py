@@ -0,0 +1,122 @@
+"""Report where the bot spends its startup import time.
+
+Imports ``app.main`` in a fresh interpreter with ``-X importtime`` and
+prints the import time grouped by top-level package, the slowest single
+modules and the peak memory of the import.
+
+Usage::
+
+    python -m app.startup_profile [--top N] [--module app.main]
+
+``MONGO_KEY`` and the other variables from ``app.config.env`` must be set,
+since importing ``app.main`` creates the database client.
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split(".", 1)[0]
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """Parse the stderr output of ``python -X importtime``.
+
+    Parameters
+    ----------
+    output: str
+        The captured stderr of the interpreter.
+
+    Returns
+    -------
+    list[ImportTiming]
+        One entry per imported module, in import order.
+    """
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        timings.append(
+            ImportTiming(module.strip(), int(self_us), int(cumulative_us), depth)
+        )
+    return timings
+
+
+def profile_import(module: str) -> tuple[list[ImportTiming], int]:
+    """Import a module in a subprocess and collect its import timings.
+
+    Parameters
+    ----------
+    module: str
+        The module to import, e.g. ``app.main``.
+
+    Returns
+    -------
+    tuple[list[ImportTiming], int]
+        The import timings and the peak RSS of the subprocess in KiB.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-2000:])
+        raise SystemExit(f"Importing {module} failed with code {result.returncode}")
+
+    max_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return parse_importtime(result.stderr), max_rss
+
+
+def print_report(timings: list[ImportTiming], max_rss: int, top: int) -> None:
+    total = sum(timing.self_us for timing in timings)
+    by_package: dict[str, int] = defaultdict(int)
+    for timing in timings:
+        by_package[timing.package] += timing.self_us
+
+    print(f"Imported {len(timings)} modules in {total / 1000:.1f} ms")
+    print(f"Peak RSS: {max_rss / 1024:.1f} MiB\n")
+
+    print(f"{'package':<32}{'ms':>10}{'share':>8}")
+    packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+    for package, self_us in packages[:top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}{self_us / total:>8.1%}")
+
+    print(f"\n{'module':<48}{'self ms':>10}{'cumul. ms':>11}")
+    slowest = sorted(timings, key=lambda timing: timing.self_us, reverse=True)
+    for timing in slowest[:top]:
+        print(
+            f"{timing.module:<48}{timing.self_us / 1000:>10.1f}"
+            f"{timing.cumulative_us / 1000:>11.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    args = parser.parse_args()
+
+    timings, max_rss = profile_import(args.module)
+    print_report(timings, max_rss, args.top)
+
+
+if __name__ == "__main__":
+    main()
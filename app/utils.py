@@ -1,9 +1,11 @@
 import asyncio
+import hashlib
 import json
 import logging
 import time
 from datetime import datetime
 from typing import Any, cast
+from urllib.parse import urlparse
 
 import discord
 import httpx
@@ -13,6 +15,8 @@ import sonolink.models as sl_models
 from app.config.colors import COLOR_GREEN
 from app.config.discord import ICON_YOUTUBE
 from app.config.music import MUSIC_TO_REMOVE
+from app.config.scraping import HOST_CONCURRENCY
+from app.metrics import HTTP_REQUEST_DURATION
 
 
 def load_text_file(name: str) -> list[str]:
@@ -235,6 +239,85 @@ def find_track(player: sonolink.Player, to_find: str) -> int | None:
         return index
 
 
+class NotModified:
+    """Type of :data:`NOT_MODIFIED`, returned on a ``304 Not Modified``."""
+
+    def __repr__(self) -> str:
+        return "NOT_MODIFIED"
+
+
+NOT_MODIFIED = NotModified()
+
+
+class HttpValidatorCache:
+    """Remembers the ``ETag`` and ``Last-Modified`` validators per URL.
+
+    Passed to :func:`make_http_request` to turn polling requests into
+    conditional GETs. The validators of a new response are only staged,
+    the caller commits them with :meth:`commit` once it processed the body,
+    so a failed poll downloads the page again instead of getting a ``304``.
+    """
+
+    def __init__(self) -> None:
+        self._validators: dict[str, dict[str, str]] = {}
+        self._staged: dict[str, dict[str, str]] = {}
+
+    def request_headers(self, url: str) -> dict[str, str]:
+        """Get the conditional request headers for a URL.
+
+        Parameters
+        ----------
+        url: str
+            The requested URL.
+
+        Returns
+        -------
+        dict[str, str]
+            ``If-None-Match`` and/or ``If-Modified-Since``, empty if the URL
+            has no stored validators.
+        """
+        return self._validators.get(url, {})
+
+    def stage(self, url: str, response: httpx.Response) -> None:
+        """Stage the validators of a successful response until :meth:`commit`.
+
+        Parameters
+        ----------
+        url: str
+            The requested URL.
+        response: :class:`httpx.Response`
+            The response to take the validators from.
+        """
+        headers = {}
+        if etag := response.headers.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := response.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+
+        self._staged[url] = headers
+
+    def commit(self, url: str) -> None:
+        """Use the staged validators of a URL for the next requests.
+
+        Parameters
+        ----------
+        url: str
+            The requested URL, whose response was processed successfully.
+        """
+        headers = self._staged.pop(url, None)
+        if headers is None:
+            return
+        if headers:
+            self._validators[url] = headers
+        else:
+            self._validators.pop(url, None)
+
+    def invalidate(self, url: str) -> None:
+        """Forget the validators of a URL, forcing a full download next time."""
+        self._validators.pop(url, None)
+        self._staged.pop(url, None)
+
+
 async def make_http_request(
     session: httpx.AsyncClient,
     url: str,
@@ -244,7 +327,8 @@ async def make_http_request(
     timeout: float = 3.0,
     get_json: bool = False,
     binary: bool = False,
-) -> httpx.Response | dict[str, Any] | None:
+    validators: HttpValidatorCache | None = None,
+) -> httpx.Response | dict[str, Any] | NotModified | None:
     """
     Make an HTTP request with retry logic.
 
@@ -266,28 +350,49 @@ async def make_http_request(
         Whether to return the response as JSON.
     binary: bool
         Whether to treat the response as binary content (e.g., MP3 files).
+    validators: HttpValidatorCache | None
+        Makes GET requests conditional on the committed validators of this
+        URL. The validators of a successful response are staged, call
+        :meth:`HttpValidatorCache.commit` after processing it.
 
     Returns
     -------
-    :class:`httpx.Response` | dict | list | None
+    :class:`httpx.Response` | dict | list | NotModified | None
         The response object (or parsed JSON) from the request, or None if the request failed.
+        :data:`NOT_MODIFIED` if ``validators`` is given and the server
+        answered ``304 Not Modified``.
     """
+    # Only GET requests are made conditional
+    if data:
+        validators = None
+    if validators is not None:
+        headers = {**(headers or {}), **validators.request_headers(url)}
+    host = urlparse(url).hostname or "unknown"
+
     for attempt in range(retries):
         try:
-            if data:
-                response = await session.post(
-                    url, data=data, headers=headers, timeout=timeout
-                )
-            else:
-                response = await session.get(url, headers=headers, timeout=timeout)
+            with HTTP_REQUEST_DURATION.time(host):
+                if data:
+                    response = await session.post(
+                        url, data=data, headers=headers, timeout=timeout
+                    )
+                else:
+                    response = await session.get(url, headers=headers, timeout=timeout)
+
+            if (
+                validators is not None
+                and response.status_code == httpx.codes.NOT_MODIFIED
+            ):
+                return NOT_MODIFIED
 
             # Don't raise for status for MP3 files or binary content
             if not (url.endswith(".mp3") or binary):
                 response.raise_for_status()
 
-            if get_json:
-                return cast(dict[str, Any], response.json())
-            return response
+            result = cast(dict[str, Any], response.json()) if get_json else response
+            if validators is not None:
+                validators.stage(url, response)
+            return result
         except (
             httpx.ReadTimeout,
             httpx.TimeoutException,
@@ -303,6 +408,71 @@ async def make_http_request(
     return None
 
 
+class BodyHashCache:
+    """Detects unchanged response bodies by their hash, per source.
+
+    For sources that don't support conditional requests, so callers can
+    skip parsing a body identical to the last one they processed.
+    """
+
+    def __init__(self) -> None:
+        self._digests: dict[str, bytes] = {}
+
+    def unchanged(self, source: str, body: str | bytes) -> bool:
+        """Check whether a body is the same as the last one seen for a source.
+
+        The body is remembered as the last one seen for ``source``.
+
+        Parameters
+        ----------
+        source: str
+            Name of the source, e.g. ``"online_fix"``.
+        body: str | bytes
+            The response body.
+
+        Returns
+        -------
+        bool
+            True if the body matches the previous body of ``source``.
+        """
+        if isinstance(body, str):
+            body = body.encode()
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if self._digests.get(source) == digest:
+            return True
+        self._digests[source] = digest
+        return False
+
+    def invalidate(self, source: str) -> None:
+        """Forget the last body of a source, so the next one is processed."""
+        self._digests.pop(source, None)
+
+
+class HostLimiter:
+    """Limits the number of concurrent requests made to each host.
+
+    Parameters
+    ----------
+    limit: int
+        Maximum number of requests in flight per host.
+    """
+
+    def __init__(self, limit: int = HOST_CONCURRENCY) -> None:
+        self._limit = limit
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def __call__(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore guarding requests to the host of ``url``.
+
+        Usage: ``async with host_limiter(url): ...``
+        """
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._limit)
+        return semaphore
+
+
 class EmbedPaginator(discord.ui.View):
     """A paginator for displaying embeds that are too long for Discord.
 
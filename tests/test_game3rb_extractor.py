@@ -0,0 +1,171 @@
+"""Correctness tests of the Game3rb extractor, on saved pages."""
+
+import re
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.classes.game3rb_extractor import (
+    WatchedGames,
+    apply_build_token,
+    parse_game_page,
+    parse_listing,
+    split_title,
+)
+from app.config.scraping import GAME3RB_TO_REMOVE
+from app.utils import strip_text
+
+FIXTURES = Path(__file__).parent / "fixtures"
+LISTING = (FIXTURES / "game3rb_listing.html").read_text(encoding="utf-8")
+GAME_PAGE = (FIXTURES / "game3rb_game_page.html").read_text(encoding="utf-8")
+
+WATCHED = WatchedGames(
+    ["ELDEN RING", "cyberpunk  2077", "Hollow Knight", "Sticky Game", "Elden Ring 2"]
+)
+
+
+def test_skips_sticky_articles() -> None:
+    titles = [game.title for game in parse_listing(LISTING, WATCHED)]
+    assert "Sticky Game" not in titles
+
+
+def test_extracts_watched_games_in_order() -> None:
+    games = parse_listing(LISTING, WATCHED)
+    assert [game.title for game in games] == [
+        "ELDEN RING",
+        "Cyberpunk 2077",
+        "Hollow Knight",
+    ]
+
+    elden_ring = games[0]
+    assert elden_ring.url == "https://game3rb.com/elden-ring/"
+    assert elden_ring.image == "https://game3rb.com/img/elden-ring.jpg"
+    assert elden_ring.timestamp == "2026-10-18T12:30:00+00:00"
+    assert elden_ring.carts == {"Action", "RPG"}
+    assert elden_ring.cache_key == (
+        "https://game3rb.com/elden-ring/| got updated to v1.12.3"
+    )
+    assert games[2].cache_key == "https://game3rb.com/hollow-knight/"
+
+
+def test_limit_counts_non_sticky_articles() -> None:
+    games = parse_listing(LISTING, WATCHED, limit=1)
+    assert [game.title for game in games] == ["ELDEN RING"]
+
+
+def test_version_extraction() -> None:
+    assert split_title("Download ELDEN RING v1.12.3 + OnLine") == (
+        "ELDEN RING",
+        " got updated to v1.12.3",
+    )
+    assert split_title("Download Hollow Knight-P2P") == ("Hollow Knight", "")
+
+
+def test_build_extraction() -> None:
+    assert split_title("Download Cyberpunk 2077 Build 17012345 + Update") == (
+        "Cyberpunk 2077",
+        " got updated to build 17012345",
+    )
+    title, version, ok = apply_build_token(
+        "Satisfactory Build 1.0.2", ["Satisfactory", "1.0.2"]
+    )
+    assert (title, version, ok) == (
+        ["Satisfactory"],
+        " got updated to build 1.0.2",
+        True,
+    )
+
+
+def test_watch_list_match_is_exact_and_casefolded() -> None:
+    watched = WatchedGames(["Elden Ring", "Grand Theft Auto V"])
+    assert "ELDEN RING" in watched
+    assert "elden  ring" in watched
+    # Substrings of watched titles used to match
+    assert "Ring" not in watched
+    assert "Elden" not in watched
+    assert "Grand Theft Auto" not in watched
+    assert "Elden Ring Nightreign" not in watched
+
+    titles = [game.title for game in parse_listing(LISTING, watched)]
+    assert titles == ["ELDEN RING"]
+
+
+def test_parse_game_page_links() -> None:
+    page = parse_game_page(GAME_PAGE)
+    assert page.links == [
+        "[Torrent link](https://game3rb.com/dl/elden-ring.torrent)",
+        "[Direct link](https://game3rb.com/dl/elden-ring-direct)",
+        "[Crack link](https://game3rb.com/dl/elden-ring-online-fix)",
+    ]
+    assert page.updates == [
+        ("v1.12.2 to v1.12.3", "https://game3rb.com/dl/elden-ring-update-1.12.3"),
+        ("Cafe Hotfix", "https://game3rb.com/dl/elden-ring-hotfix"),
+    ]
+
+
+def test_parse_game_page_with_fix_included() -> None:
+    html = GAME_PAGE.replace("<h1", "<p>Fix already included</p><h1", 1)
+    page = parse_game_page(html)
+    assert page.links[-1] == "_Fix already included_"
+    assert not any(link.startswith("[Crack link]") for link in page.links)
+
+
+def _parse_listing_bs4(html: str, game_list: list[str]) -> list[dict]:
+    """The BeautifulSoup listing parser the extractor replaced."""
+    watched = "\n".join(game_list)
+    soup = BeautifulSoup(html, "html.parser")
+    for sticky in soup.select("article.sticky.hentry"):
+        sticky.decompose()
+    article = soup.find("article")
+
+    games = []
+    for _ in range(16):
+        if not article:
+            break
+        line = article.find("a", {"title": True})
+        if not line:
+            break
+
+        full_title = line.get("title")
+        game_title = strip_text(full_title, GAME3RB_TO_REMOVE).split()
+        regex = re.compile(r"v\d+(\.\d+)*")
+        if regex.match(game_title[-1]):
+            version = f" got updated to {game_title.pop()}"
+        else:
+            game_title, version, ok = apply_build_token(full_title, game_title)
+            if not ok:
+                article = article.find_next("article")
+                continue
+
+        title = " ".join(game_title)
+        if title.lower() not in watched.lower():
+            article = article.find_next("article")
+            continue
+
+        games.append(
+            {
+                "title": title,
+                "version": version,
+                "url": line.get("href"),
+                "image": article.find("img", {"class": "entry-image"})["src"],
+                "timestamp": article.find("time")["datetime"],
+                "carts": {cart.text for cart in article.find_all(id="cart")},
+            }
+        )
+        article = article.find_next("article")
+    return games
+
+
+def test_parse_listing_matches_beautifulsoup() -> None:
+    # A full listing page has 16 articles and a lot of surrounding markup
+    articles = re.findall(r"<article.*?</article>", LISTING, re.DOTALL)
+    padding = "<div class='widget'><p>" + "sidebar text " * 50 + "</p></div>\n"
+    body = "\n".join((articles * 3)[:17]) + padding * 40
+    html = f"<html><body><main>{body}</main></body></html>"
+    game_list = ["ELDEN RING", "cyberpunk 2077", "Hollow Knight"]
+
+    titles = [game.title for game in parse_listing(html, WatchedGames(game_list))]
+    old_titles = [game["title"] for game in _parse_listing_bs4(html, game_list)]
+    # The old parser also matched "Ring" as a substring of "ELDEN RING"
+    assert titles == [title for title in old_titles if title != "Ring"]
+    assert "Ring" in old_titles